@@ -0,0 +1,352 @@
+"""Command-line interface for running tasks without starting the GUI.
+
+Only Qt-free modules may be imported here, so the CLI starts quickly and
+works without a display.
+"""
+
+import argparse
+import logging
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, TextIO
+
+from app.models.task import Task
+from app.settings.settings import settings_service
+from app.utils.config import ConfigManager
+from app.utils.io_engine import IOEngine
+from app.utils.launcher import configured_launcher
+from app.utils.log_file import LogFile
+from app.utils.run_log import configured_writer, list_runs
+from app.utils.scheduler import GroupScheduler, ReadinessWatcher, ReadyCondition
+from app.utils.stopper import stop_processes
+
+COLORS = [36, 33, 35, 32, 34, 31]  # ANSI colors cycled through for task prefixes
+DRAIN_TIMEOUT = 1.0  # Seconds to collect the last output of stopped tasks
+
+
+def exit_status(returncode: int) -> int:
+    """Map a process return code to a shell exit status"""
+    if returncode < 0:
+        return 128 - returncode  # Killed by a signal, as shells report it
+    return returncode if returncode < 256 else 1
+
+
+def use_color(stream: TextIO) -> bool:
+    return stream.isatty() and "NO_COLOR" not in os.environ
+
+
+def resolve(config: ConfigManager, names: List[str]) -> List[Task]:
+    """Map task ids, task titles and group names to tasks, keeping their order"""
+    by_title: Dict[str, Task] = {}
+    for task in config.task_index.values():
+        by_title.setdefault(task.title, task)
+
+    tasks: Dict[str, Task] = {}
+    for name in names:
+        if name in config.groups:
+            matched = config.groups[name]
+        elif name in config.task_index:
+            matched = [config.task_index[name]]
+        elif name in by_title:
+            matched = [by_title[name]]
+        else:
+            raise KeyError(name)
+        tasks.update((task.id, task) for task in matched)
+    return list(tasks.values())
+
+
+class TaskRunner:
+    """Runs tasks in dependency order and streams their output with a prefix.
+
+    I/O callbacks only write output and queue events; the scheduler is
+    driven from the thread that calls ``run``.
+    """
+
+    def __init__(
+        self, tasks: List[Task], max_parallel: int = 0, out: TextIO = sys.stdout
+    ):
+        self.tasks = {task.id: task for task in tasks}
+        self.out = out
+        self.prefixes = self._prefixes(tasks, use_color(out))
+        self.returncodes: Dict[str, int] = {}
+        self.handles = {}
+        self.stopping = False
+        self.scheduler = GroupScheduler(tasks, self.launch, max_parallel)
+        self.launcher = configured_launcher()
+        self.events = queue.Queue()
+        self.readiness = ReadinessWatcher(lambda task_id: self.events.put((task_id,)))
+        self._open: Dict[str, int] = {}  # Task ID -> pipe close and exit to await
+        self._lock = threading.Lock()
+        settings = settings_service().current
+        self.run_logs = configured_writer() if settings.run_logs else None
+        self.io_engine = IOEngine(
+            self._on_output,
+            lambda task_id, pid: self.events.put((task_id, "closed")),
+            lambda task_id, pid, code: self.events.put((task_id, "exit", code)),
+            parse_ansi=False,
+        )
+
+    def run(self) -> int:
+        """Run every task to completion and return the aggregated exit code"""
+        try:
+            self.scheduler.start()
+            self._process_events()
+        except KeyboardInterrupt:
+            self.stop()
+        finally:
+            self.io_engine.shutdown()
+            if self.run_logs is not None:
+                self.run_logs.shutdown()
+        return self.exit_code()
+
+    def launch(self, task: Task, ready: ReadyCondition) -> bool:
+        if self.stopping:
+            return False
+        self.readiness.watch(task.id, ready)
+        if self.run_logs is not None:
+            self.run_logs.open(task.id)
+        try:
+            args, options = self.launcher.spec(task.cmd, task.path or None)
+            self.handles[task.id] = self.io_engine.start(
+                task.id, args, cwd=task.path or None, **options
+            )
+        except Exception as e:
+            self.readiness.cancel(task.id)
+            if self.run_logs is not None:
+                self.run_logs.close(task.id)
+            self._write(task.id, [f"failed to start: {str(e)}"])
+            self.returncodes[task.id] = 127
+            return False
+        self._open[task.id] = 2
+        return True
+
+    def stop(self) -> None:
+        """Stop every task's process tree, killing what outlives the grace period"""
+        self.stopping = True
+        running = [h for h in self.handles.values() if h.returncode is None]
+        stop_processes(running, settings_service().current.stop_grace_ms / 1000)
+        self._process_events(DRAIN_TIMEOUT)
+
+    def exit_code(self) -> int:
+        """Return 0 if every task succeeded, else the first failing code"""
+        for task_id in self.tasks:
+            code = self.returncodes.get(task_id, 1)
+            if code != 0:
+                return exit_status(code)
+        return 0
+
+    def summary(self) -> List[str]:
+        lines = []
+        for task_id, task in self.tasks.items():
+            code = self.returncodes.get(task_id)
+            if code is None:
+                lines.append(f"{task.title}: {self.scheduler.state[task_id].value}")
+            else:
+                lines.append(f"{task.title}: exit {code}")
+        return lines
+
+    def _process_events(self, timeout: Optional[float] = None) -> bool:
+        """Handle events until every task is done, False if the timeout passed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not (self.scheduler.finished and not self._open):
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            try:
+                # Short waits keep Ctrl+C responsive on Windows
+                event = self.events.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            task_id = event[0]
+            if len(event) == 1:
+                self.scheduler.task_ready(task_id)
+                continue
+            if event[1] == "exit":
+                self.returncodes[task_id] = event[2]
+                self.readiness.cancel(task_id)
+                self.scheduler.task_exited(task_id, event[2])
+            self._open[task_id] -= 1
+            if not self._open[task_id]:
+                del self._open[task_id]
+                if self.run_logs is not None:
+                    self.run_logs.close(task_id)
+        return True
+
+    def _prefixes(self, tasks: List[Task], color: bool) -> Dict[str, str]:
+        width = max((len(task.title) for task in tasks), default=0)
+        prefixes = {}
+        for index, task in enumerate(tasks):
+            label = task.title.ljust(width)
+            if color:
+                label = f"\x1b[{COLORS[index % len(COLORS)]}m{label}\x1b[0m"
+            prefixes[task.id] = f"{label} | "
+        return prefixes
+
+    def _write(self, task_id: str, lines: List[str]) -> None:
+        if lines:
+            prefix = self.prefixes[task_id]
+            with self._lock:
+                self.out.write("".join(f"{prefix}{line}\n" for line in lines))
+                self.out.flush()
+
+    def _on_output(
+        self, task_id: str, pid: int, lines: List[str], partial: str
+    ) -> None:
+        self.readiness.feed(task_id, lines)
+        if self.run_logs is not None:
+            self.run_logs.write(task_id, lines)
+        self._write(task_id, lines)
+
+
+def cmd_run(config: ConfigManager, args: argparse.Namespace) -> int:
+    try:
+        tasks = resolve(config, args.names)
+    except KeyError as e:
+        print(f"tasker: no task or group named {e.args[0]!r}", file=sys.stderr)
+        return 2
+
+    max_parallel = args.jobs
+    if max_parallel is None:
+        max_parallel = settings_service().current.max_parallel_tasks
+    try:
+        runner = TaskRunner(tasks, max_parallel)
+    except ValueError as e:
+        print(f"tasker: {str(e)}", file=sys.stderr)
+        return 2
+    code = runner.run()
+    if len(tasks) > 1 and not args.quiet:
+        print("\n".join(runner.summary()), file=sys.stderr)
+    return code
+
+
+def cmd_list(config: ConfigManager, args: argparse.Namespace) -> int:
+    if args.groups:
+        for name, tasks in config.groups.items():
+            print(f"{name}\t{len(tasks)} tasks")
+        return 0
+
+    for task in config.task_index.values():
+        print(f"{task.id}\t{task.title}\t{task.cmd}")
+    return 0
+
+
+def cmd_logs(config: ConfigManager, args: argparse.Namespace) -> int:
+    # The daemon client is only needed here, keep it off the startup path
+    from app.daemon.client import DaemonClient, DaemonError
+
+    task_id = args.task
+    try:
+        task_id = resolve(config, [args.task])[0].id
+    except KeyError:
+        pass  # The daemon may still know a task that was removed here
+
+    try:
+        client = DaemonClient()
+    except OSError:
+        if args.follow:
+            print("tasker: the daemon is not running", file=sys.stderr)
+            return 1
+        return print_run_log(task_id, args.lines)
+
+    try:
+        if not args.follow:
+            if task_id not in client.status():
+                return print_run_log(task_id, args.lines)
+            lines = client.tail(task_id, args.lines)
+            sys.stdout.write("".join(f"{line}\n" for line in lines))
+            return 0
+        # Follow the current run until its pipes close, which comes after its
+        # exit when children keep writing or the last output is flushed
+        pid = client.status().get(task_id, {}).get("pid")
+        returncode = closed = None
+        for event in client.subscribe(task_id, backlog=args.lines):
+            if pid is None:
+                pid = event[2]
+            if event[2] != pid:
+                continue
+            if event[0] == "output":
+                sys.stdout.write("".join(f"{line.text}\n" for line in event[3]))
+                sys.stdout.flush()
+            elif event[0] == "closed":
+                closed = True
+            elif event[0] == "exit":
+                returncode = event[3]
+            if closed and returncode is not None:
+                return exit_status(returncode)
+        return 0 if returncode is None else exit_status(returncode)
+    except DaemonError as e:
+        print(f"tasker: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        client.close()
+
+
+def print_run_log(task_id: str, count: int) -> int:
+    """Print the end of the latest logged run of a task"""
+    runs = list_runs(task_id)
+    if not runs:
+        print(f"tasker: no output of {task_id} was kept", file=sys.stderr)
+        return 1
+    segments = next(iter(runs.values()))
+    with LogFile(segments[-1]) as log:
+        lines = log.lines(max(0, len(log) - count), count)
+    sys.stdout.write("".join(f"{line}\n" for line in lines))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="tasker", description="Run Tasker tasks and groups from the terminal"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser(
+        "run", help="run tasks or groups in parallel, honouring dependencies"
+    )
+    run.add_argument("names", nargs="+", help="task id, task title or group name")
+    run.add_argument(
+        "-j", "--jobs", type=int, help="max tasks running at once (0 = no limit)"
+    )
+    run.add_argument(
+        "-q", "--quiet", action="store_true", help="skip the exit code summary"
+    )
+    run.set_defaults(handler=cmd_run)
+
+    list_ = commands.add_parser("list", help="list tasks, or groups with -g")
+    list_.add_argument("-g", "--groups", action="store_true", help="list groups")
+    list_.set_defaults(handler=cmd_list)
+
+    logs = commands.add_parser(
+        "logs", help="print output kept by the daemon or in logs"
+    )
+    logs.add_argument("task", help="task id or title")
+    logs.add_argument(
+        "-n", "--lines", type=int, default=200, help="recent lines to show"
+    )
+    logs.add_argument(
+        "-f", "--follow", action="store_true", help="keep printing new output"
+    )
+    logs.set_defaults(handler=cmd_logs)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="tasker: %(message)s")
+    if hasattr(signal, "SIGPIPE"):
+        signal.signal(signal.SIGPIPE, signal.SIG_DFL)  # Quietly stop under `| head`
+
+    config = ConfigManager()
+    config.load_config()
+    try:
+        return args.handler(config, args)
+    finally:
+        config.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+from app.daemon.server import main
+
+main()
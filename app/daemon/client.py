@@ -0,0 +1,323 @@
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from app.daemon import protocol
+
+PROJECT_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+START_TIMEOUT = 5.0
+RECONNECT_TIMEOUT = 5.0  # Seconds to keep trying to resubscribe to the daemon
+LOST_RETURNCODE = -1  # Reported for tasks whose fate is unknown once it is gone
+
+
+class DaemonError(Exception):
+    """Raised when the daemon rejects a request"""
+
+
+class DaemonClient:
+    """Request/reply connection to the task daemon"""
+
+    def __init__(self):
+        self.conn = protocol.connect()
+        self._lock = threading.Lock()
+
+    def request(self, op: str, **fields) -> dict:
+        with self._lock:
+            self.conn.send({"op": op, **fields})
+            reply = self.conn.recv()
+        if not reply.pop("ok"):
+            raise DaemonError(reply["error"])
+        return reply
+
+    def start(
+        self,
+        task_id: str,
+        args: list,
+        cwd: str,
+        title: str = "",
+        log: bool = False,
+        **options,
+    ):
+        """Start a task in the daemon and return its pid, logging its run if asked"""
+        reply = self.request(
+            "start",
+            task_id=task_id,
+            args=args,
+            cwd=cwd,
+            title=title,
+            log=log,
+            options=options,
+        )
+        return reply["pid"]
+
+    def stop(self, task_id: str, force: bool = False) -> None:
+        self.request("stop", task_id=task_id, force=force)
+
+    def status(self) -> Dict[str, dict]:
+        """Return task id -> {title, pid, returncode} for every known task"""
+        return self.request("status")["tasks"]
+
+    def tail(self, task_id: str, lines: int) -> List[str]:
+        """Return up to ``lines`` recent output lines of a task"""
+        return self.request("tail", task_id=task_id, lines=lines)["lines"]
+
+    def forget(self, task_id: str) -> None:
+        self.request("forget", task_id=task_id)
+
+    def shutdown(self) -> None:
+        self.request("shutdown")
+
+    def subscribe(
+        self,
+        task_id: Optional[str] = None,
+        backlog: int = 0,
+        seen: Optional[Dict[tuple, int]] = None,
+    ) -> Iterator:
+        """Yield events for one task, or all tasks, until the daemon goes away.
+
+        ``seen`` maps (task id, pid) to the lines already received of a run,
+        so a resubscription only replays the lines missed in between.
+        """
+        with protocol.connect() as conn:
+            conn.send(
+                {
+                    "op": "subscribe",
+                    "task_id": task_id,
+                    "backlog": backlog,
+                    "seen": seen or {},
+                }
+            )
+            conn.recv()
+            try:
+                while True:
+                    yield from protocol.decode_events(conn.recv())
+            except (EOFError, OSError):
+                return
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def ensure_daemon(timeout: float = START_TIMEOUT) -> DaemonClient:
+    """Connect to the daemon, starting it in the background if needed"""
+    try:
+        return DaemonClient()
+    except OSError:
+        pass
+
+    logging.info("Starting the tasker daemon")
+    options = {}
+    if sys.platform == "win32":
+        options["creationflags"] = (
+            subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        )
+    else:
+        options["start_new_session"] = True
+    subprocess.Popen(
+        [sys.executable, "-m", "app.daemon"],
+        cwd=PROJECT_DIR,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        **options,
+    )
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return DaemonClient()
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+class RemoteProcessHandle:
+    """ProcessHandle look-alike for a process owned by the daemon"""
+
+    def __init__(self, client: DaemonClient, task_id: str, pid: Optional[int]):
+        self._client = client
+        self._exited = threading.Event()
+        self.task_id = task_id
+        self.pid = pid
+        self.returncode: Optional[int] = None
+
+    def poll(self) -> Optional[int]:
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        if not self._exited.wait(timeout):
+            raise subprocess.TimeoutExpired(str(self.pid), timeout)
+        return self.returncode
+
+    def terminate(self) -> None:
+        self._client.stop(self.task_id)
+
+    def kill(self) -> None:
+        self._client.stop(self.task_id, force=True)
+
+    def _set_exited(self, returncode: int) -> None:
+        self.returncode = returncode
+        self._exited.set()
+
+
+class DaemonEngine:
+    """IOEngine replacement that runs tasks in the daemon instead of in-process.
+
+    Output and exit events arrive on a reader thread once ``listen`` is
+    called, and are delivered through the same callbacks IOEngine uses. If
+    the event stream breaks, for instance because the daemon dropped us for
+    reading too slowly, it is resubscribed and only the missed lines are
+    replayed. If the daemon is gone, running tasks are reported as exited
+    with LOST_RETURNCODE and ``on_lost`` is called with a message.
+    """
+
+    def __init__(
+        self,
+        on_output: Callable[[str, int, list, object], None],
+        on_closed: Callable[[str, int], None],
+        on_exit: Callable[[str, int, int], None],
+        on_lost: Optional[Callable[[str], None]] = None,
+    ):
+        self.on_output = on_output
+        self.on_closed = on_closed
+        self.on_exit = on_exit
+        self.on_lost = on_lost
+        self.client = ensure_daemon()
+        self.handles: Dict[str, RemoteProcessHandle] = {}
+        # (task id, pid) -> lines received of a run, only used by the reader
+        self.received: Dict[tuple, int] = {}
+        # Pid -> exit code of runs that exited before their start was answered
+        self._early_exits: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+
+    def start(self, task_id: str, args: list, cwd: str, **kwargs):
+        # Registered first, so an exit reported before the reply is not lost
+        handle = self.attach(task_id, None)
+        try:
+            pid = self.client.start(task_id, args, cwd, **kwargs)
+        except Exception:
+            with self._lock:
+                if self.handles.get(task_id) is handle:
+                    del self.handles[task_id]
+            raise
+        with self._lock:
+            handle.pid = pid
+            returncode = self._early_exits.pop(pid, None)
+        if returncode is not None:
+            handle._set_exited(returncode)
+        return handle
+
+    def attach(self, task_id: str, pid: Optional[int]) -> RemoteProcessHandle:
+        """Return a handle to a task the daemon is already running"""
+        handle = RemoteProcessHandle(self.client, task_id, pid)
+        with self._lock:
+            self.handles[task_id] = handle
+        return handle
+
+    def status(self) -> Dict[str, dict]:
+        return self.client.status()
+
+    def tail(self, task_id: str, lines: int) -> List[str]:
+        """Return up to ``lines`` recent output lines of a task"""
+        return self.client.tail(task_id, lines)
+
+    def forget(self, task_id: str) -> None:
+        self.client.forget(task_id)
+        with self._lock:
+            for run in [run for run in self.received if run[0] == task_id]:
+                del self.received[run]
+
+    def listen(self, backlog: int = 0) -> None:
+        """Start delivering events, replaying up to ``backlog`` lines per task"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._read_events, args=(backlog,), daemon=True
+            )
+            self._thread.start()
+
+    def shutdown(self) -> None:
+        """Disconnect, leaving the daemon and its tasks running"""
+        self._closing = True
+        self.client.close()
+
+    def _read_events(self, backlog: int) -> None:
+        while True:
+            try:
+                with self._lock:
+                    seen = dict(self.received)
+                for event in self.client.subscribe(backlog=backlog, seen=seen):
+                    self._deliver(event)
+            except OSError as e:
+                logging.error(f"Error subscribing to the tasker daemon: {str(e)}")
+            if self._closing:
+                return
+            # Whatever was missed meanwhile is replayed, as far as it is kept
+            backlog = protocol.BACKLOG_LINES
+            logging.warning("Lost connection to the tasker daemon, reconnecting")
+            if not self._wait_for_daemon():
+                self._give_up()
+                return
+
+    def _deliver(self, event: tuple) -> None:
+        kind, task_id, pid = event[0], event[1], event[2]
+        if kind in ("output", "skipped"):
+            count = len(event[3]) if kind == "output" else event[3]
+            with self._lock:
+                run = (task_id, pid)
+                self.received[run] = self.received.get(run, 0) + count
+        if kind == "output":
+            self.on_output(task_id, pid, event[3], event[4])
+        elif kind == "closed":
+            self.on_closed(task_id, pid)
+        elif kind == "exit":
+            with self._lock:
+                handle = self.handles.get(task_id)
+                if handle is not None and handle.pid is None:
+                    self._early_exits[pid] = event[3]
+            if handle is not None and handle.pid == pid:
+                handle._set_exited(event[3])
+            self.on_exit(task_id, pid, event[3])
+
+    def _wait_for_daemon(self) -> bool:
+        """Wait until the daemon accepts connections again, False if it does not"""
+        deadline = time.monotonic() + RECONNECT_TIMEOUT
+        while not self._closing:
+            try:
+                protocol.connect().close()
+                return True
+            except OSError:
+                if time.monotonic() > deadline:
+                    return False
+                time.sleep(0.2)
+        return False
+
+    def _give_up(self) -> None:
+        """Stop showing tasks as running once the daemon cannot be reached"""
+        with self._lock:
+            lost = [
+                handle
+                for handle in self.handles.values()
+                if handle.returncode is None and handle.pid is not None
+            ]
+        for handle in lost:
+            handle._set_exited(LOST_RETURNCODE)
+            self.on_closed(handle.task_id, handle.pid)
+            self.on_exit(handle.task_id, handle.pid, LOST_RETURNCODE)
+        message = "Lost connection to the tasker daemon"
+        if lost:
+            message += (
+                f"; {len(lost)} running task(s) are shown as stopped"
+                " but may still be running"
+            )
+        logging.error(message)
+        if self.on_lost is not None:
+            self.on_lost(message)
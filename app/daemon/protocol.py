@@ -0,0 +1,77 @@
+import getpass
+import os
+import sys
+from multiprocessing.connection import Client, Connection
+from typing import List
+
+from app.utils.ansi import StyledLine
+
+DAEMON_DIR = os.path.join(os.path.expanduser("~"), ".tasker")
+KEY_PATH = os.path.join(DAEMON_DIR, "daemon.key")
+LOG_PATH = os.path.join(DAEMON_DIR, "daemon.log")
+BACKLOG_LINES = 2000  # Recent lines kept per task for late subscribers
+
+# Requests are dicts with an "op" key; replies are dicts with "ok" and either
+# the result fields or "error". A "subscribe" request turns the connection
+# into a stream of event lists, where each event is one of:
+#   ("output", task_id, pid, lines, partial)
+#   ("closed", task_id, pid)
+#   ("exit", task_id, pid, returncode)
+#   ("skipped", task_id, pid, count), the lines of a run a replay leaves out
+# On the wire the lines of an output event travel as separate text and span
+# lists, which pickle several times faster than StyledLine tuples.
+
+
+def address() -> str:
+    """Return the per-user address of the daemon"""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\tasker-{getpass.getuser()}"
+    return os.path.join(DAEMON_DIR, "daemon.sock")
+
+
+def family() -> str:
+    return "AF_PIPE" if sys.platform == "win32" else "AF_UNIX"
+
+
+def authkey() -> bytes:
+    """Return the shared secret that clients must prove they know"""
+    os.makedirs(DAEMON_DIR, mode=0o700, exist_ok=True)
+    try:
+        fd = os.open(KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(KEY_PATH, "rb") as f:
+            return f.read()
+    with os.fdopen(fd, "wb") as f:
+        key = os.urandom(32)
+        f.write(key)
+    return key
+
+
+def connect() -> Connection:
+    """Open an authenticated connection, raising OSError if none is listening"""
+    return Client(address(), family(), authkey=authkey())
+
+
+def encode_events(events: list) -> list:
+    """Prepare a batch of events for sending"""
+    encoded = []
+    for event in events:
+        if event[0] == "output":
+            lines = event[3]
+            texts = [line.text for line in lines]
+            spans = [line.spans for line in lines]
+            event = ("output", event[1], event[2], texts, spans, tuple(event[4]))
+        encoded.append(event)
+    return encoded
+
+
+def decode_events(events: list) -> List[tuple]:
+    """Rebuild a batch of events received from the daemon"""
+    decoded = []
+    for event in events:
+        if event[0] == "output":
+            _, task_id, pid, texts, spans, partial = event
+            lines = list(map(StyledLine, texts, spans))
+            event = ("output", task_id, pid, lines, StyledLine(*partial))
+        decoded.append(event)
+    return decoded
@@ -0,0 +1,343 @@
+import logging
+import os
+import queue
+import sys
+import threading
+from collections import deque
+from contextlib import suppress
+from multiprocessing.connection import Connection, Listener
+from typing import Dict, List, Optional
+
+from app.daemon import protocol
+from app.utils.ansi import EMPTY_LINE, StyledLine
+from app.utils.io_engine import IOEngine, ProcessHandle
+from app.utils.run_log import configured_writer
+
+SUBSCRIBER_QUEUE_SIZE = 10000  # Pending events before a slow subscriber is dropped
+MAX_EVENTS_PER_SEND = 500
+IDLE_CHECK_INTERVAL = 1.0  # Seconds between checks for a vanished idle subscriber
+
+
+class TaskRun:
+    """A task started by the daemon, with the recent output kept for tailing"""
+
+    def __init__(self, task_id: str, title: str):
+        self.task_id = task_id
+        self.title = title
+        self.handle: Optional[ProcessHandle] = None  # Set once spawned
+        self.backlog = deque(maxlen=protocol.BACKLOG_LINES)
+        self.lines = 0  # Lines output so far, to replay only what a client missed
+        self.partial = EMPTY_LINE
+        self.closed = False
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self.handle.returncode if self.handle else None
+
+    def status(self) -> dict:
+        return {
+            "title": self.title,
+            "pid": self.handle.pid if self.handle else None,
+            "returncode": self.returncode,
+        }
+
+
+class Subscriber:
+    """A connection streaming events for one task, or for all of them"""
+
+    def __init__(self, task_id: Optional[str]):
+        self.task_id = task_id
+        self.events = queue.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = False
+
+    def wants(self, task_id: str) -> bool:
+        return self.task_id is None or self.task_id == task_id
+
+    def put(self, event: tuple) -> None:
+        if self.dropped:
+            return
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            # Never let one slow reader hold up the pipes of every task
+            self.dropped = True
+            self.events = queue.Queue()
+            self.events.put(None)
+
+
+class TaskDaemon:
+    """Runs tasks outside the GUI and serves them over a local connection.
+
+    Every task's pipes are read once by the IOEngine; each chunk is kept in the
+    task's backlog and fanned out to all subscribers of that task.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.runs: Dict[str, TaskRun] = {}
+        # Pid -> run whose pipes are still open, which may be an earlier run
+        # of a task started again while its children kept writing
+        self.open_runs: Dict[int, TaskRun] = {}
+        self.subscribers: List[Subscriber] = []
+        self.io_engine = IOEngine(self._on_output, self._on_closed, self._on_exit)
+        self.run_logs = configured_writer()
+        self.listener: Optional[Listener] = None
+        self.stopping = False
+
+    def serve(self) -> None:
+        """Accept connections until a shutdown request arrives"""
+        self.listener = Listener(
+            protocol.address(), protocol.family(), authkey=protocol.authkey()
+        )
+        logging.info(f"Daemon listening on {protocol.address()}")
+        try:
+            while not self.stopping:
+                try:
+                    conn = self.listener.accept()
+                except OSError as e:
+                    if not self.stopping:
+                        logging.warning(f"Rejected connection: {str(e)}")
+                    continue
+                threading.Thread(
+                    target=self.handle_connection, args=(conn,), daemon=True
+                ).start()
+        finally:
+            self.listener.close()
+            self.io_engine.shutdown()
+            self.run_logs.shutdown()
+
+    def handle_connection(self, conn: Connection) -> None:
+        with conn:
+            try:
+                while True:
+                    request = conn.recv()
+                    if request.get("op") == "subscribe":
+                        self.stream(conn, request)
+                        return
+                    conn.send(self.dispatch(request))
+                    if self.stopping:
+                        # Replied to the shutdown, now wake the accept loop
+                        with suppress(OSError):
+                            protocol.connect().close()
+                        return
+            except (EOFError, OSError):
+                pass
+
+    def dispatch(self, request: dict) -> dict:
+        handler = getattr(self, f"op_{request.get('op')}", None)
+        if handler is None:
+            return {"ok": False, "error": f"Unknown request {request.get('op')!r}"}
+        try:
+            return {"ok": True, **handler(request)}
+        except Exception as e:
+            logging.error(f"Request {request.get('op')} failed: {str(e)}")
+            return {"ok": False, "error": str(e)}
+
+    def op_start(self, request: dict) -> dict:
+        task_id = request["task_id"]
+        with self.lock:
+            run = self.runs.get(task_id)
+            if run is not None and (run.handle is None or run.returncode is None):
+                raise ValueError(f"Task {task_id} is already running")
+            # Registered before spawning so the very first output is kept
+            run = self.runs[task_id] = TaskRun(task_id, request.get("title", ""))
+        if request.get("log"):
+            self.run_logs.open(task_id, run)
+
+        try:
+            handle = self.io_engine.start(
+                task_id, request["args"], request["cwd"], **request.get("options", {})
+            )
+        except Exception:
+            with self.lock:
+                self.runs.pop(task_id, None)
+            self.run_logs.close(run)
+            raise
+        with self.lock:
+            if not run.closed:
+                self.open_runs[handle.pid] = run
+            run.handle = handle
+        logging.info(f"Started task {task_id} (pid {run.handle.pid})")
+        return {"pid": run.handle.pid}
+
+    def op_stop(self, request: dict) -> dict:
+        run = self._run(request["task_id"])
+        if run.handle is None:
+            raise ValueError(f"Task {run.task_id} is still starting")
+        if request.get("force"):
+            run.handle.kill()
+        else:
+            run.handle.terminate()
+        return {}
+
+    def op_status(self, request: dict) -> dict:
+        with self.lock:
+            return {
+                "tasks": {task_id: run.status() for task_id, run in self.runs.items()}
+            }
+
+    def op_tail(self, request: dict) -> dict:
+        """Return the most recent output lines of a task as plain text"""
+        run = self._run(request["task_id"])
+        count = request.get("lines", protocol.BACKLOG_LINES)
+        with self.lock:
+            lines = list(run.backlog)[-count:] if count > 0 else []
+            if run.partial.text:
+                lines.append(run.partial)
+        return {"lines": [line.text for line in lines]}
+
+    def op_forget(self, request: dict) -> dict:
+        """Drop a finished task and its backlog"""
+        with self.lock:
+            run = self.runs.get(request["task_id"])
+            if run is not None and run.returncode is not None:
+                del self.runs[request["task_id"]]
+        return {}
+
+    def op_shutdown(self, request: dict) -> dict:
+        self.stopping = True
+        with self.lock:
+            runs = list(self.runs.values())
+        for run in runs:
+            if run.handle is not None:
+                run.handle.kill()
+        return {}
+
+    def stream(self, conn: Connection, request: dict) -> None:
+        """Send the backlog, then live events, until the client goes away"""
+        subscriber = Subscriber(request.get("task_id"))
+        backlog_lines = request.get("backlog", 0)
+        seen = request.get("seen") or {}
+        with self.lock:
+            backlog = []
+            for run in self.runs.values():
+                if not subscriber.wants(run.task_id):
+                    continue
+                pid = run.handle.pid if run.handle else None
+                lines = list(run.backlog)[-backlog_lines:] if backlog_lines else []
+                missed = run.lines - seen.get((run.task_id, pid), 0)
+                lines = lines[-missed:] if missed > 0 else []
+                if missed > len(lines):
+                    backlog.append(("skipped", run.task_id, pid, missed - len(lines)))
+                if lines or (backlog_lines and run.partial.text):
+                    backlog.append(("output", run.task_id, pid, lines, run.partial))
+                if run.closed:
+                    backlog.append(("closed", run.task_id, pid))
+                if run.returncode is not None:
+                    backlog.append(
+                        ("exit", run.task_id, run.handle.pid, run.returncode)
+                    )
+            self.subscribers.append(subscriber)
+
+        try:
+            conn.send({"ok": True})
+            if backlog:
+                conn.send(protocol.encode_events(backlog))
+            while True:
+                events = self._next_events(subscriber)
+                if events is None:
+                    return
+                if events:
+                    conn.send(protocol.encode_events(events))
+                elif conn.poll():
+                    conn.recv()  # Clients send nothing more, this detects EOF
+        finally:
+            with self.lock:
+                self.subscribers.remove(subscriber)
+
+    def _next_events(self, subscriber: Subscriber) -> Optional[list]:
+        """Wait for the next event and batch whatever else is queued"""
+        try:
+            events = [subscriber.events.get(timeout=IDLE_CHECK_INTERVAL)]
+        except queue.Empty:
+            return []
+        with suppress(queue.Empty):
+            while len(events) < MAX_EVENTS_PER_SEND:
+                events.append(subscriber.events.get_nowait())
+        if None in events:
+            return None
+
+        # Merge consecutive output of the same run into one event
+        merged = []
+        for event in events:
+            previous = merged[-1] if merged else None
+            if event[0] == "output" and previous and previous[:3] == event[:3]:
+                previous[3].extend(event[3])
+                previous[4] = event[4]
+            elif event[0] == "output":
+                merged.append(["output", event[1], event[2], list(event[3]), event[4]])
+            else:
+                merged.append(event)
+        return merged
+
+    def _run(self, task_id: str) -> TaskRun:
+        with self.lock:
+            run = self.runs.get(task_id)
+        if run is None:
+            raise ValueError(f"Task {task_id} is not known to the daemon")
+        return run
+
+    def _publish(self, task_id: str, event: tuple) -> None:
+        for subscriber in self.subscribers:
+            if subscriber.wants(task_id):
+                subscriber.put(event)
+
+    def _open_run(self, task_id: str, pid: int) -> Optional[TaskRun]:
+        """Return the run a pid belongs to, called with the lock held"""
+        run = self.open_runs.get(pid)
+        if run is None:
+            # Output can arrive before op_start has registered the new pid
+            run = self.runs.get(task_id)
+            if run is None or run.handle is not None:
+                return None
+        return run
+
+    def _on_output(
+        self, task_id: str, pid: int, lines: List[StyledLine], partial: StyledLine
+    ) -> None:
+        with self.lock:
+            run = self._open_run(task_id, pid)
+            if run is not None:
+                run.backlog.extend(lines)
+                run.lines += len(lines)
+                run.partial = partial
+            self._publish(task_id, ("output", task_id, pid, lines, partial))
+        if run is not None:
+            self.run_logs.write(run, (line.text for line in lines))
+
+    def _on_closed(self, task_id: str, pid: int) -> None:
+        with self.lock:
+            run = self._open_run(task_id, pid)
+            self.open_runs.pop(pid, None)
+            if run is not None:
+                run.closed = True
+            self._publish(task_id, ("closed", task_id, pid))
+        # Children may keep writing after the task exits, so the log ends here
+        if run is not None:
+            self.run_logs.close(run)
+
+    def _on_exit(self, task_id: str, pid: int, returncode: int) -> None:
+        logging.info(f"Task {task_id} (pid {pid}) exited with code {returncode}")
+        with self.lock:
+            self._publish(task_id, ("exit", task_id, pid, returncode))
+
+
+def main() -> None:
+    os.makedirs(protocol.DAEMON_DIR, mode=0o700, exist_ok=True)
+    logging.basicConfig(
+        filename=protocol.LOG_PATH,
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    # A socket left behind by a daemon that died can be reused
+    try:
+        protocol.connect().close()
+        print("Tasker daemon is already running", file=sys.stderr)
+        sys.exit(1)
+    except OSError:
+        if protocol.family() == "AF_UNIX":
+            with suppress(FileNotFoundError):
+                os.unlink(protocol.address())
+
+    TaskDaemon().serve()
@@ -1,22 +1,37 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
 import uuid
 
+
 @dataclass
 class Task:
     """Represents a command task that can be run"""
+
     id: str
     title: str
     path: str
     cmd: str
     process: Optional[object] = None
+    max_lines: Optional[int] = None  # Overrides the global scrollback limit
+    depends_on: List[str] = field(default_factory=list)  # Task IDs started first
+    ready_when: Optional[str] = None  # Readiness condition, see ReadyCondition
+    # Stages run on each output line before it is shown, see LinePipeline
+    output_stages: List[dict] = field(default_factory=list)
 
     @classmethod
-    def create(cls, path: str, cmd: str, title: str = None) -> 'Task':
+    def create(cls, path: str, cmd: str, title: str = None) -> "Task":
         """Create a new task with a unique ID"""
-        return cls(
-            id=str(uuid.uuid4()),
-            title=title or cmd,
-            path=path,
-            cmd=cmd
-        )
+        return cls(id=str(uuid.uuid4()), title=title or cmd, path=path, cmd=cmd)
+
+    def to_dict(self) -> dict:
+        """Return the persisted fields of the task"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "path": self.path,
+            "cmd": self.cmd,
+            "max_lines": self.max_lines,
+            "depends_on": self.depends_on,
+            "ready_when": self.ready_when,
+            "output_stages": self.output_stages,
+        }
@@ -0,0 +1,124 @@
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, fields, replace
+from functools import lru_cache
+from typing import Optional
+
+import yaml
+
+from app.utils.persistence import DebouncedWriter
+from app.utils.scrollback import DEFAULT_MAX_BYTES, DEFAULT_MAX_LINES
+
+SETTINGS_FILE = "config.yaml"
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Application settings with their defaults"""
+
+    default_path: str = ""
+    max_output_lines: int = DEFAULT_MAX_LINES
+    max_output_bytes: int = DEFAULT_MAX_BYTES
+    spill_output: bool = False
+    storage: str = "json"
+    use_daemon: bool = False
+    max_parallel_tasks: int = 0  # Processes a group run may start at once, 0 = all
+    shell: str = ""  # Shell that runs commands on POSIX, empty for /bin/sh
+    direct_exec: bool = False  # Run commands without shell syntax directly
+    stop_grace_ms: int = 2000  # Time a stopped task gets to exit before it is killed
+    run_logs: bool = True  # Write the output of every run to a log file
+    log_rotate_mb: int = 64  # Size at which a run's log moves on to a new file
+    log_keep_runs: int = 20  # Runs of each task whose logs are kept, 0 = all
+    search_index_mb: int = 256  # Output of all tabs kept searchable, 0 = no search
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "Settings":
+        """Build settings from YAML values, keeping defaults for bad entries"""
+        settings = {}
+        for field in fields(cls):
+            if field.name not in values:
+                continue
+            value = values[field.name]
+            # bool is an int subclass, so compare the exact type
+            if type(value) is not type(field.default):
+                logging.warning(f"Ignoring invalid setting {field.name}: {value!r}")
+                continue
+            settings[field.name] = value
+        return cls(**settings)
+
+
+def dump_yaml(data, f) -> None:
+    yaml.dump(data, f)
+
+
+class SettingsService:
+    """Cached view of config.yaml shared by the whole application.
+
+    The file is parsed once and only read again when its modification time
+    changes. Updates apply to the cache immediately and are written back on a
+    background thread.
+    """
+
+    def __init__(self, path: str = SETTINGS_FILE):
+        self.path = path
+        self.writer = DebouncedWriter(path, dump=dump_yaml)
+        self._lock = threading.Lock()
+        self._raw: dict = {}
+        self._settings = Settings()
+        self._mtime: Optional[int] = None
+        self._load()
+
+    @property
+    def current(self) -> Settings:
+        """Return the settings, reloading them if the file changed on disk"""
+        with self._lock:
+            # Our own pending write wins over whatever is on disk right now
+            if not self.writer.pending and self._file_mtime() != self._mtime:
+                self._load()
+            return self._settings
+
+    def update(self, **changes) -> Settings:
+        """Change some settings and save them in the background"""
+        with self._lock:
+            self._settings = replace(self._settings, **changes)
+            self._raw = dict(self._raw)
+            self._raw["settings"] = {
+                **(self._raw.get("settings") or {}),
+                **asdict(self._settings),
+            }
+            self.writer.submit(self._raw)
+            return self._settings
+
+    def close(self) -> None:
+        """Write any pending change right away"""
+        self.writer.close()
+
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self) -> None:
+        self._mtime = self._file_mtime()
+        if self._mtime is None:
+            self._raw, self._settings = {}, Settings()
+            return
+
+        try:
+            with open(self.path, "r") as file:
+                raw = yaml.safe_load(file) or {}
+            if not isinstance(raw, dict):
+                raise ValueError("expected a mapping at the top level")
+        except Exception as e:
+            logging.error(f"Error loading {self.path}, using defaults: {str(e)}")
+            raw = {}
+        self._raw = raw
+        self._settings = Settings.from_dict(raw.get("settings") or {})
+
+
+@lru_cache(maxsize=None)
+def settings_service() -> SettingsService:
+    """Return the process-wide settings service, loading it on first use"""
+    return SettingsService()
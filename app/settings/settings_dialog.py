@@ -1,5 +1,4 @@
 import os
-import yaml
 
 from PyQt6.QtWidgets import (
     QDialog,
@@ -9,15 +8,20 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QPushButton,
     QFileDialog,
+    QSpinBox,
+    QCheckBox,
+    QComboBox,
 )
 
+from app.settings.settings import settings_service
+
 
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
         super(SettingsDialog, self).__init__(parent)
         self.setWindowTitle("Settings")
         self.setGeometry(100, 100, 500, 100)
-        self.config = self.load_config_yaml()
+        self.settings = settings_service()
 
         layout = QVBoxLayout(self)
         default_tasks_dir_layout = QHBoxLayout()
@@ -33,6 +37,91 @@ class SettingsDialog(QDialog):
         self.browse_button.clicked.connect(self.browse_directory)
         default_tasks_dir_layout.addWidget(self.browse_button)
 
+        # Output scrollback limits
+        scrollback_layout = QHBoxLayout()
+        layout.addLayout(scrollback_layout)
+        scrollback_layout.addWidget(QLabel("Max Output Lines:"))
+        self.max_lines_spin = QSpinBox(self)
+        self.max_lines_spin.setRange(0, 10_000_000)
+        self.max_lines_spin.setSpecialValueText("Unlimited")
+        scrollback_layout.addWidget(self.max_lines_spin)
+
+        scrollback_layout.addWidget(QLabel("Max Output Size (KB):"))
+        self.max_kb_spin = QSpinBox(self)
+        self.max_kb_spin.setRange(0, 10_000_000)
+        self.max_kb_spin.setSpecialValueText("Unlimited")
+        scrollback_layout.addWidget(self.max_kb_spin)
+
+        self.spill_checkbox = QCheckBox("Save evicted output to disk", self)
+        layout.addWidget(self.spill_checkbox)
+
+        search_layout = QHBoxLayout()
+        layout.addLayout(search_layout)
+        search_layout.addWidget(QLabel("Searchable Output (MB, applies on restart):"))
+        self.search_index_spin = QSpinBox(self)
+        self.search_index_spin.setRange(0, 1_000_000)
+        self.search_index_spin.setSpecialValueText("Off")
+        search_layout.addWidget(self.search_index_spin)
+        search_layout.addStretch()
+
+        # Per-run log files
+        logs_layout = QHBoxLayout()
+        layout.addLayout(logs_layout)
+        self.run_logs_checkbox = QCheckBox("Write each run's output to a log", self)
+        logs_layout.addWidget(self.run_logs_checkbox)
+        logs_layout.addWidget(QLabel("Rotate at (MB):"))
+        self.log_rotate_spin = QSpinBox(self)
+        self.log_rotate_spin.setRange(0, 100_000)
+        self.log_rotate_spin.setSpecialValueText("Never")
+        logs_layout.addWidget(self.log_rotate_spin)
+        logs_layout.addWidget(QLabel("Runs Kept:"))
+        self.log_keep_spin = QSpinBox(self)
+        self.log_keep_spin.setRange(0, 10_000)
+        self.log_keep_spin.setSpecialValueText("All")
+        logs_layout.addWidget(self.log_keep_spin)
+
+        # Group runs
+        parallel_layout = QHBoxLayout()
+        layout.addLayout(parallel_layout)
+        parallel_layout.addWidget(QLabel("Max Tasks Running per Group:"))
+        self.max_parallel_spin = QSpinBox(self)
+        self.max_parallel_spin.setRange(0, 1000)
+        self.max_parallel_spin.setSpecialValueText("Unlimited")
+        parallel_layout.addWidget(self.max_parallel_spin)
+
+        parallel_layout.addWidget(QLabel("Stop Grace Period (ms):"))
+        self.stop_grace_spin = QSpinBox(self)
+        self.stop_grace_spin.setRange(0, 600_000)
+        self.stop_grace_spin.setSingleStep(500)
+        parallel_layout.addWidget(self.stop_grace_spin)
+
+        # How commands are started on Linux and macOS
+        shell_layout = QHBoxLayout()
+        layout.addLayout(shell_layout)
+        shell_layout.addWidget(QLabel("Shell (Linux/macOS):"))
+        self.shell_edit = QLineEdit(self)
+        self.shell_edit.setPlaceholderText("/bin/sh")
+        shell_layout.addWidget(self.shell_edit)
+        self.direct_exec_checkbox = QCheckBox(
+            "Start commands without shell syntax directly", self
+        )
+        shell_layout.addWidget(self.direct_exec_checkbox)
+
+        self.daemon_checkbox = QCheckBox(
+            "Keep tasks running in the background after closing (applies on restart)",
+            self,
+        )
+        layout.addWidget(self.daemon_checkbox)
+
+        # Task storage backend, picked up on the next start
+        storage_layout = QHBoxLayout()
+        layout.addLayout(storage_layout)
+        storage_layout.addWidget(QLabel("Task Storage (applies on restart):"))
+        self.storage_combo = QComboBox(self)
+        self.storage_combo.addItem("JSON file", "json")
+        self.storage_combo.addItem("SQLite database", "sqlite")
+        storage_layout.addWidget(self.storage_combo)
+
         self.save_button = QPushButton("Save", self)
         self.save_button.clicked.connect(self.save_settings)
         default_tasks_dir_layout.addWidget(self.save_button)
@@ -42,27 +131,44 @@ class SettingsDialog(QDialog):
         directory = QFileDialog.getExistingDirectory(self, "Select Directory")
         if directory:
             self.directory_edit.setText(directory)
-            self.config["settings"]["default_path"] = directory
-            self.save_config_yaml()
+            self.settings.update(default_path=directory)
 
     def save_settings(self):
+        self.settings.update(
+            default_path=self.directory_edit.text(),
+            max_output_lines=self.max_lines_spin.value(),
+            max_output_bytes=self.max_kb_spin.value() * 1024,
+            spill_output=self.spill_checkbox.isChecked(),
+            storage=self.storage_combo.currentData(),
+            use_daemon=self.daemon_checkbox.isChecked(),
+            max_parallel_tasks=self.max_parallel_spin.value(),
+            shell=self.shell_edit.text().strip(),
+            direct_exec=self.direct_exec_checkbox.isChecked(),
+            stop_grace_ms=self.stop_grace_spin.value(),
+            run_logs=self.run_logs_checkbox.isChecked(),
+            log_rotate_mb=self.log_rotate_spin.value(),
+            log_keep_runs=self.log_keep_spin.value(),
+            search_index_mb=self.search_index_spin.value(),
+        )
         self.accept()
 
-    def load_config_yaml(self):
-        with open("config.yaml", "r") as file:
-            return yaml.safe_load(file)
-
-    def save_config_yaml(self):
-        with open("config.yaml", "w") as file:
-            yaml.dump(self.config, file)
-
     def init_settings(self):
-        if self.config["settings"]["default_path"] == "":
-            self.config["settings"]["default_path"] = os.path.join(
-                os.path.expanduser("~"), "Documents"
-            )
-        else:
-            self.config["settings"]["default_path"] = self.config["settings"][
-                "default_path"
-            ]
-        self.directory_edit.setText(self.config["settings"]["default_path"])
+        settings = self.settings.current
+        self.directory_edit.setText(
+            settings.default_path or os.path.join(os.path.expanduser("~"), "Documents")
+        )
+        self.max_lines_spin.setValue(settings.max_output_lines)
+        self.max_kb_spin.setValue(settings.max_output_bytes // 1024)
+        self.spill_checkbox.setChecked(settings.spill_output)
+        self.daemon_checkbox.setChecked(settings.use_daemon)
+        self.max_parallel_spin.setValue(settings.max_parallel_tasks)
+        self.shell_edit.setText(settings.shell)
+        self.direct_exec_checkbox.setChecked(settings.direct_exec)
+        self.stop_grace_spin.setValue(settings.stop_grace_ms)
+        self.run_logs_checkbox.setChecked(settings.run_logs)
+        self.log_rotate_spin.setValue(settings.log_rotate_mb)
+        self.log_keep_spin.setValue(settings.log_keep_runs)
+        self.search_index_spin.setValue(settings.search_index_mb)
+        self.storage_combo.setCurrentIndex(
+            max(0, self.storage_combo.findData(settings.storage))
+        )
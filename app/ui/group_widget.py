@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
 from PyQt6.QtCore import pyqtSignal
 from app.models.task import Task
@@ -43,6 +43,7 @@ class GroupWidget(QWidget):
 
         # Add header to main layout
         layout.addLayout(header_layout)
+        self.task_layout = layout
 
         # Add task widgets
         for task in self.tasks:
@@ -50,9 +51,45 @@ class GroupWidget(QWidget):
             self.task_widgets.append(task_widget)
             layout.addWidget(task_widget)
 
-    def update_task_status(self, task_id: str, is_running: bool):
+    def sync_tasks(
+        self, tasks: List[Task]
+    ) -> Tuple[List[TaskWidget], List[TaskWidget]]:
+        """Match the task rows to a new task list, returning (added, removed)"""
+        self.tasks = tasks
+        current = {widget.task.id: widget for widget in self.task_widgets}
+        wanted = {task.id for task in tasks}
+
+        removed = [
+            widget for widget in self.task_widgets if widget.task.id not in wanted
+        ]
+        for widget in removed:
+            self.task_layout.removeWidget(widget)
+            widget.deleteLater()
+
+        added = []
+        self.task_widgets = []
+        for position, task in enumerate(tasks):
+            widget = current.get(task.id)
+            if widget is None or widget.task is not task:
+                if widget is not None:
+                    removed.append(widget)
+                    self.task_layout.removeWidget(widget)
+                    widget.deleteLater()
+                widget = TaskWidget(task, self.name)
+                added.append(widget)
+            else:
+                widget.refresh()
+            # Row 0 of the layout is the header
+            if self.task_layout.indexOf(widget) != position + 1:
+                self.task_layout.removeWidget(widget)
+                self.task_layout.insertWidget(position + 1, widget)
+            self.task_widgets.append(widget)
+
+        return added, removed
+
+    def update_task_status(self, task_id: str, is_running: bool, exit_code=None):
         """Update the status of a specific task"""
         for task_widget in self.task_widgets:
             if task_widget.task.id == task_id:
-                task_widget.update_status(is_running)
+                task_widget.update_status(is_running, exit_code)
                 break
@@ -0,0 +1,176 @@
+import logging
+import os
+from typing import List, Optional
+
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QComboBox,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QSpinBox,
+    QTableView,
+    QVBoxLayout,
+)
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt6.QtGui import QFontDatabase
+
+from app.models.task import Task
+from app.utils.log_file import LogFile
+from app.utils.run_log import list_runs
+from app.utils.telemetry import format_bytes
+
+
+class LogModel(QAbstractListModel):
+    """Lines of a log file, read from the mapped file only when displayed"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log: Optional[LogFile] = None
+
+    def set_log(self, log: Optional[LogFile]) -> None:
+        self.beginResetModel()
+        if self.log is not None:
+            self.log.close()
+        self.log = log
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid() or self.log is None:
+            return 0
+        return len(self.log)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self.log.line(index.row())
+        return None
+
+
+def run_label(run: str) -> str:
+    """Turn a run name like 20240131-235959 into a readable start time"""
+    day, _, rest = run.partition("-")
+    clock = rest[:6]
+    label = f"{day[:4]}-{day[4:6]}-{day[6:]} {clock[:2]}:{clock[2:4]}:{clock[4:]}"
+    return f"{label} ({rest[7:]})" if len(rest) > 6 else label
+
+
+class LogViewer(QDialog):
+    """Browses the logged runs of tasks, opening logs of any size at once"""
+
+    def __init__(self, tasks: List[Task], task_id: Optional[str] = None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Output Logs")
+        self.resize(900, 600)
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        layout.addLayout(controls)
+
+        self.task_combo = QComboBox(self)
+        for task in tasks:
+            self.task_combo.addItem(task.title, task.id)
+        controls.addWidget(self.task_combo)
+        self.run_combo = QComboBox(self)
+        controls.addWidget(self.run_combo, 1)
+        reload_btn = QPushButton("Reload", self)
+        controls.addWidget(reload_btn)
+
+        controls.addWidget(QLabel("Line:"))
+        self.line_spin = QSpinBox(self)
+        self.line_spin.setRange(1, 1)
+        controls.addWidget(self.line_spin)
+        go_btn = QPushButton("Go", self)
+        controls.addWidget(go_btn)
+
+        # Set up like the output console: fixed-height rows for any line count
+        self.model = LogModel(self)
+        self.view = QTableView(self)
+        self.view.setModel(self.model)
+        self.view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.view.setShowGrid(False)
+        self.view.setWordWrap(False)
+        self.view.horizontalHeader().hide()
+        self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.verticalHeader().hide()
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(
+            self.view.fontMetrics().height()
+        )
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerItem)
+        layout.addWidget(self.view)
+
+        self.status_label = QLabel(self)
+        layout.addWidget(self.status_label)
+
+        self.task_combo.currentIndexChanged.connect(self.load_runs)
+        self.run_combo.currentIndexChanged.connect(self.open_selected)
+        reload_btn.clicked.connect(self.open_selected)
+        go_btn.clicked.connect(lambda: self.go_to_line(self.line_spin.value()))
+        self.line_spin.editingFinished.connect(
+            lambda: self.go_to_line(self.line_spin.value())
+        )
+
+        index = self.task_combo.findData(task_id) if task_id else 0
+        self.task_combo.setCurrentIndex(max(0, index))
+        self.load_runs()
+
+    def load_runs(self):
+        """List the log files of the selected task, newest run first"""
+        self.run_combo.blockSignals(True)
+        self.run_combo.clear()
+        task_id = self.task_combo.currentData()
+        runs = list_runs(task_id) if task_id else {}
+        for run, segments in runs.items():
+            for number, path in enumerate(segments, 1):
+                label = run_label(run)
+                if len(segments) > 1:
+                    label += f"  part {number} of {len(segments)}"
+                self.run_combo.addItem(label, path)
+        # Start with the end of the latest run
+        if runs:
+            self.run_combo.setCurrentIndex(len(next(iter(runs.values()))) - 1)
+        self.run_combo.blockSignals(False)
+        self.open_selected()
+
+    def open_selected(self):
+        path = self.run_combo.currentData()
+        if not path:
+            self.model.set_log(None)
+            self.status_label.setText("No output was logged for this task")
+            return
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            log = LogFile(path)
+        except (OSError, EOFError, ValueError) as e:
+            logging.error(f"Error opening log {path}: {str(e)}")
+            self.model.set_log(None)
+            self.status_label.setText(f"Could not open {path}: {str(e)}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.model.set_log(log)
+        self.line_spin.setRange(1, max(1, len(log)))
+        self.status_label.setText(
+            f"{len(log):,} lines, {format_bytes(log.size)}  {os.path.basename(path)}"
+        )
+        self.view.scrollToBottom()
+
+    def go_to_line(self, number: int):
+        """Scroll to a one-based line number and select it"""
+        row = min(number, self.model.rowCount()) - 1
+        if row < 0:
+            return
+        index = self.model.index(row)
+        self.view.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+        self.view.selectRow(row)
+
+    def done(self, result):
+        self.model.set_log(None)
+        super().done(result)
@@ -1,12 +1,14 @@
 import logging
 import os
+import time
+from typing import Dict, List, Optional
 
 from PyQt6.QtWidgets import (
     QMainWindow,
-    QTextEdit,
     QWidget,
     QVBoxLayout,
     QPushButton,
+    QListView,
     QListWidget,
     QListWidgetItem,
     QLabel,
@@ -17,41 +19,87 @@ from PyQt6.QtWidgets import (
     QDialog,
     QHBoxLayout,
 )
-from PyQt6.QtCore import QTimer
-from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QKeySequence, QShortcut
 from app.models.task import Task
 from app.utils.config import ConfigManager
 from app.utils.process import ProcessManager
 from app.ui.task_widget import TaskWidget
+from app.ui.task_list import TaskListModel, TaskDelegate, TASK_ROLE
 from app.ui.group_widget import GroupWidget
+from app.ui.output_console import OutputConsole
+from app.ui.telemetry_bar import TelemetryBar
+from app.ui.log_viewer import LogViewer
+from app.ui.search_dialog import SearchDialog
+from app.ui.resources import icon, preload, stylesheet
 from app.ui.task_dialog import TaskEditDialog
 from app.settings.settings_dialog import SettingsDialog
+from app.utils.scrollback import ScrollbackBuffer, SPILL_DIR
+from app.settings.settings import settings_service
+from app.utils.history import command_history
+from app.utils.scheduler import GroupScheduler, ReadyCondition
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
+        self.started_at = time.perf_counter()
+        self.first_paint_logged = False
         self.setWindowTitle("Tasker")
         self.setGeometry(100, 100, 800, 600)
 
         # Initialize managers
         self.config_manager = ConfigManager()
-        self.process_manager = ProcessManager()  # Removed QTextEdit instance
-
-        # Create timer for checking process status
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.check_running_tasks)
-        self.status_timer.start(1000)  # Check every second
+        self.process_manager = ProcessManager(
+            use_daemon=settings_service().current.use_daemon
+        )
 
+        # Process exits are pushed by the process manager, no polling needed
+        self.process_manager.task_finished.connect(self.on_task_finished)
+        self.process_manager.task_ready.connect(self.on_task_ready)
+        self.process_manager.telemetry_updated.connect(self.on_telemetry_updated)
+        self.process_manager.daemon_lost.connect(self.show_error)
+        # Group name -> scheduler of a group run still starting its tasks
+        self.schedulers: Dict[str, GroupScheduler] = {}
+
+        # Style before building widgets so each one is only polished once
+        preload()
+        self.setStyleSheet(stylesheet())
         self.init_ui()
         self.config_manager.load_config()
         self.update_displays()
-        self.setStyleSheet(open("app/ui/styles.qss").read())
+        # Commands of existing tasks are offered even before they are re-entered
+        command_history().seed(
+            task.cmd for task in self.config_manager.task_index.values()
+        )
+        self.restore_tasks()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_logged:
+            self.first_paint_logged = True
+            elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+            logging.info(
+                f"First paint after {elapsed_ms:.0f} ms "
+                f"with {len(self.config_manager.tasks)} ungrouped tasks"
+            )
+
+    def closeEvent(self, event):
+        if not self.process_manager.daemon and self.process_manager.running_tasks:
+            # Tasks run in sessions of their own and would outlive the window
+            self.hide()
+            self.process_manager.stop_all().result()
+        # Make sure the last changes reach the disk before exiting
+        self.process_manager.close()
+        self.config_manager.close()
+        settings_service().close()
+        super().closeEvent(event)
 
     def init_ui(self):
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
         layout = QVBoxLayout(main_widget)
+        self.main_layout = layout
 
         # Main controls layout
         main_controls = QHBoxLayout()
@@ -59,21 +107,44 @@ class MainWindow(QMainWindow):
 
         # Add Task button
         add_btn = QPushButton("Create Task")
-        add_btn.setIcon(QIcon("app/icons/task.svg"))
+        add_btn.setIcon(icon("task"))
         add_btn.clicked.connect(self.add_task)
         main_controls.addWidget(add_btn)
 
         # Create Group button
         group_btn = QPushButton("Create Group")
-        group_btn.setIcon(QIcon("app/icons/group.svg"))
+        group_btn.setIcon(icon("group"))
         main_controls.addWidget(group_btn)
 
+        # Stop All button
+        stop_all_btn = QPushButton("Stop All")
+        stop_all_btn.clicked.connect(self.stop_all_tasks)
+        main_controls.addWidget(stop_all_btn)
+
+        # Search across the output of every tab
+        search_btn = QPushButton("Search")
+        search_btn.setToolTip("Search the output of all tabs (Ctrl+Shift+F)")
+        search_btn.clicked.connect(self.open_search)
+        main_controls.addWidget(search_btn)
+        QShortcut(QKeySequence("Ctrl+Shift+F"), self, self.open_search)
+        self.search_dialog = None
+
+        # Logged output of earlier runs
+        logs_btn = QPushButton("Logs")
+        logs_btn.clicked.connect(self.open_logs)
+        main_controls.addWidget(logs_btn)
+
         # Settings
         settings_btn = QPushButton("Settings")
-        settings_btn.setIcon(QIcon("app/icons/settings.svg"))
+        settings_btn.setIcon(icon("settings"))
         settings_btn.clicked.connect(self.open_settings)
         main_controls.addWidget(settings_btn)
 
+        # Task ID -> every widget currently showing that task
+        self.task_widgets: Dict[str, List[TaskWidget]] = {}
+        # Task ID -> last known (is_running, exit_code), reapplied to new rows
+        self.task_status: Dict[str, tuple] = {}
+
         # Tabs for Tasks and Groups
         self.tabs = QTabWidget()
         layout.addWidget(self.tabs)
@@ -81,8 +152,22 @@ class MainWindow(QMainWindow):
         # Tasks Tab
         self.task_tab = QWidget()
         task_layout = QVBoxLayout(self.task_tab)
-        self.task_list = QListWidget()
-        self.task_list.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
+        self.task_model = TaskListModel(
+            self.config_manager.tasks,
+            self.task_status,
+            self.process_manager.telemetry,
+        )
+        self.task_delegate = TaskDelegate(self)
+        self.task_delegate.run_clicked.connect(self.run_task)
+        self.task_delegate.edit_clicked.connect(self.edit_task)
+        self.task_delegate.delete_clicked.connect(self.delete_task)
+        self.task_delegate.add_to_group_clicked.connect(self.add_to_existing_group)
+        self.task_list = QListView()
+        self.task_list.setModel(self.task_model)
+        self.task_list.setItemDelegate(self.task_delegate)
+        self.task_list.setUniformItemSizes(True)
+        self.task_list.setMouseTracking(True)
+        self.task_list.setSelectionMode(QListView.SelectionMode.MultiSelection)
         task_layout.addWidget(self.task_list)
 
         # Add group button
@@ -92,26 +177,45 @@ class MainWindow(QMainWindow):
 
         self.tabs.addTab(self.task_tab, "Tasks")
 
-        # Groups Tab
+        # Groups Tab, its rows are only built once the tab is first opened
         self.group_tab = QWidget()
-        group_layout = QVBoxLayout(self.group_tab)
-        self.group_list = QListWidget()
-        group_layout.addWidget(self.group_list)
+        self.group_list = None
         self.tabs.addTab(self.group_tab, "Groups")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
 
-        # Output
+        # Output, created when the first task runs
         self.outputs = {}
-        self.output_tab = QTabWidget()
-        self.output_tab.setTabsClosable(True)
-        self.output_tab.tabCloseRequested.connect(self.close_output_tab)
-        layout.addWidget(self.output_tab)
+        self.output_tab = None
 
         # Status bar
         self.status_label = QLabel("Ready")
         layout.addWidget(self.status_label)
 
+    def on_tab_changed(self, index: int):
+        """Build the Groups tab the first time it is opened"""
+        if self.tabs.widget(index) is self.group_tab and self.group_list is None:
+            group_layout = QVBoxLayout(self.group_tab)
+            self.group_list = QListWidget()
+            group_layout.addWidget(self.group_list)
+            self.update_group_display()
+
+    def output_tabs(self) -> QTabWidget:
+        """Return the output tab widget, creating it on first use"""
+        if self.output_tab is None:
+            self.output_tab = QTabWidget()
+            self.output_tab.setTabsClosable(True)
+            self.output_tab.tabCloseRequested.connect(self.close_output_tab)
+            self.telemetry_bar = TelemetryBar()
+            self.output_tab.setCornerWidget(self.telemetry_bar)
+            self.output_tab.currentChanged.connect(self.update_telemetry_bar)
+            # Keep the status label last
+            self.main_layout.insertWidget(
+                self.main_layout.indexOf(self.status_label), self.output_tab
+            )
+        return self.output_tab
+
     def add_task(self):
-        dialog = TaskEditDialog(parent=self)
+        dialog = TaskEditDialog(parent=self, candidates=self.config_manager.tasks)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             path, cmd, title = dialog.get_values()
 
@@ -124,62 +228,182 @@ class MainWindow(QMainWindow):
                 return
 
             task = Task.create(path=path, cmd=cmd, title=title or cmd)
-            self.config_manager.tasks.append(task)
+            task.max_lines = dialog.get_max_lines()
+            task.depends_on = dialog.get_dependencies()
+            task.ready_when = dialog.get_ready_when()
+            task.output_stages = dialog.get_output_stages()
+            self.config_manager.add_task(task)
             self.update_displays()
-            self.config_manager.save_config()
             logging.info(f"Added task: {task.title} (ID: {task.id})")
 
-    def run_task(self, task: Task):
+    def run_task(self, task: Task, ready: Optional[ReadyCondition] = None) -> bool:
         """Run a specific task"""
         logging.info(f"Running task {task.title}")
 
-        # Create a new QTextEdit for the task output
-        task_output_text = QTextEdit()
-        task_output_text.setReadOnly(True)  # Make it read-only
+        # Start the task and connect its output to a new console
+        if self.process_manager.start_task(task, self.open_output(task), ready):
+            self.update_task_status(task.id, True)
+            self.status_label.setText(f"Started: {task.title}")
+            return True
+        return False
+
+    def open_output(self, task: Task) -> OutputConsole:
+        """Create a console for a task's output in a new tab"""
+        task_output_text = OutputConsole(self.create_scrollback(task))
         self.outputs[task.id] = task_output_text
+        if self.search_dialog is not None and self.search_dialog.isVisible():
+            task_output_text.set_search(self.search_dialog.pattern)
 
         # Create a new tab for the task with consistent format "Title | ID"
         tab_title = f"{task.title} | {task.id}"
-        self.output_tab.addTab(task_output_text, tab_title)
+        self.output_tabs().addTab(task_output_text, tab_title)
         logging.info(f"Created tab with title: {tab_title}")
+        return task_output_text
+
+    def restore_tasks(self):
+        """Reopen the output of tasks the daemon ran while the window was closed"""
+        for task_id, status in self.process_manager.remote_tasks().items():
+            task = self.config_manager.find_task(task_id)
+            if task is None:
+                continue
+            self.process_manager.attach_task(task, self.open_output(task), status)
+            self.update_task_status(
+                task_id, status["returncode"] is None, status["returncode"]
+            )
+        self.process_manager.listen()
 
-        # Start the task and connect its output to the QTextEdit
-        if self.process_manager.start_task(task, self.outputs[task.id]):
-            self.update_task_status(task.id, True)
-            self.status_label.setText(f"Started: {task.title}")
+    def create_scrollback(self, task: Task) -> ScrollbackBuffer:
+        """Build the output scrollback for a task from global and task limits"""
+        settings = settings_service().current
+
+        spill_path = None
+        if settings.spill_output:
+            spill_path = os.path.join(SPILL_DIR, f"{task.id}.log")
+
+        return ScrollbackBuffer(
+            max_lines=task.max_lines or settings.max_output_lines,
+            max_bytes=settings.max_output_bytes,
+            spill_path=spill_path,
+        )
 
     def run_group(self, group_name: str):
-        """Run all tasks in a group"""
+        """Run a group's tasks, each as soon as its dependencies are ready"""
         if group_name not in self.config_manager.groups:
             return
 
-        for task in self.config_manager.groups[group_name]:
-            self.run_task(task)
+        scheduler = self.schedulers.get(group_name)
+        if scheduler is not None and not scheduler.finished:
+            self.status_label.setText(f"Group {group_name} is still starting")
+            return
 
-    def check_running_tasks(self):
-        """Check status of running tasks"""
-        for task_id in list(self.process_manager.running_tasks.keys()):
-            if self.process_manager.check_task_status(task_id) is not None:
-                # Process has finished or was terminated
-                self.update_task_status(task_id, False)
-                self.process_manager.cleanup_task(task_id)
-                logging.info(f"Task {task_id} is no longer running")
+        tasks = self.config_manager.groups[group_name]
+        try:
+            scheduler = GroupScheduler(
+                tasks,
+                self.run_task,
+                max_parallel=settings_service().current.max_parallel_tasks,
+                running=[
+                    task.id
+                    for task in tasks
+                    if task.id in self.process_manager.running_tasks
+                ],
+            )
+        except ValueError as e:
+            self.show_error(f"Cannot run group {group_name}: {str(e)}")
+            return
+
+        self.schedulers[group_name] = scheduler
+        scheduler.start()
+        self.forget_finished_schedulers()
+
+    def stop_all_tasks(self):
+        """Stop every running task at once, and any group still starting"""
+        self.schedulers.clear()
+        count = len(self.process_manager.running_tasks)
+        if count:
+            self.process_manager.stop_all()
+            self.status_label.setText(f"Stopping {count} tasks")
+
+    def on_task_ready(self, task_id: str):
+        """Start whatever was waiting for a task to become ready"""
+        task = self.config_manager.find_task(task_id)
+        self.status_label.setText(f"Ready: {task.title if task else task_id}")
+        for scheduler in list(self.schedulers.values()):
+            scheduler.task_ready(task_id)
+        self.forget_finished_schedulers()
+
+    def forget_finished_schedulers(self):
+        for group_name, scheduler in list(self.schedulers.items()):
+            if scheduler.finished:
+                del self.schedulers[group_name]
+
+    def on_telemetry_updated(self, task_ids: list):
+        """Show fresh resource samples in task rows and the output tabs"""
+        telemetry = self.process_manager.telemetry
+        for task_id in task_ids:
+            self.task_model.task_changed(task_id)
+            for widget in self.task_widgets.get(task_id, []):
+                widget.update_telemetry(telemetry.get(task_id))
+        self.update_telemetry_bar()
+
+    def current_output_task(self) -> Optional[str]:
+        """Return the id of the task whose output tab is shown"""
+        if self.output_tab is None:
+            return None
+        console = self.output_tab.currentWidget()
+        return next(
+            (task_id for task_id, output in self.outputs.items() if output is console),
+            None,
+        )
 
-    def update_task_status(self, task_id: str, is_running: bool):
+    def update_telemetry_bar(self, *args):
+        """Show the resource usage of the task in the current output tab"""
+        if self.output_tab is None:
+            return
+        task_id = self.current_output_task()
+        ring = None
+        if task_id in self.process_manager.running_tasks:
+            ring = self.process_manager.telemetry.get(task_id)
+        self.telemetry_bar.show_ring(ring)
+
+    def on_task_finished(self, task_id: str, exit_code: int):
+        """Reflect a task's exit in the UI as soon as it happens"""
+        for scheduler in list(self.schedulers.values()):
+            scheduler.task_exited(task_id, exit_code)
+        self.forget_finished_schedulers()
+        self.update_task_status(task_id, False, exit_code)
+        self.update_telemetry_bar()
+        task = self.config_manager.find_task(task_id)
+        title = task.title if task else task_id
+        self.status_label.setText(f"Finished: {title} (exit code {exit_code})")
+        logging.info(f"Task {task_id} is no longer running")
+
+    def update_task_status(self, task_id: str, is_running: bool, exit_code=None):
         """Update the status of a task in both task list and group list"""
-        # Update in task list
-        for i in range(self.task_list.count()):
-            item = self.task_list.item(i)
-            widget = self.task_list.itemWidget(item)
-            if isinstance(widget, TaskWidget) and widget.task.id == task_id:
-                widget.update_status(is_running)
-
-        # Update in group list
-        for i in range(self.group_list.count()):
-            item = self.group_list.item(i)
-            widget = self.group_list.itemWidget(item)
-            if isinstance(widget, GroupWidget):
-                widget.update_task_status(task_id, is_running)
+        self.task_status[task_id] = (is_running, exit_code)
+        self.task_model.task_changed(task_id)
+        for widget in self.task_widgets.get(task_id, []):
+            widget.update_status(is_running, exit_code)
+
+    def register_task_widget(self, task_widget: TaskWidget):
+        """Track a task widget so status updates can reach it directly"""
+        self.task_widgets.setdefault(task_widget.task.id, []).append(task_widget)
+        if task_widget.task.id in self.task_status:
+            task_widget.update_status(*self.task_status[task_widget.task.id])
+
+        # Connect signals
+        task_widget.run_clicked.connect(self.run_task)
+        task_widget.edit_clicked.connect(self.edit_task)
+        task_widget.delete_clicked.connect(self.delete_task)
+        task_widget.add_to_group_clicked.connect(self.add_to_existing_group)
+
+    def unregister_task_widget(self, task_widget: TaskWidget):
+        """Stop tracking a task widget that is being removed"""
+        widgets = self.task_widgets.get(task_widget.task.id, [])
+        if task_widget in widgets:
+            widgets.remove(task_widget)
+        if not widgets:
+            self.task_widgets.pop(task_widget.task.id, None)
 
     def update_displays(self):
         """Update both task and group displays"""
@@ -187,35 +411,81 @@ class MainWindow(QMainWindow):
         self.update_group_display()
 
     def update_task_display(self):
-        """Update the task list display"""
-        self.task_list.clear()
-        for task in self.config_manager.tasks:
-            task_widget = TaskWidget(task)
-            item = QListWidgetItem(self.task_list)
-            item.setSizeHint(task_widget.sizeHint())
-            self.task_list.addItem(item)
-            self.task_list.setItemWidget(item, task_widget)
-
-            # Connect signals
-            task_widget.run_clicked.connect(self.run_task)
-            task_widget.edit_clicked.connect(self.edit_task)
-            task_widget.delete_clicked.connect(self.delete_task)
-            task_widget.add_to_group_clicked.connect(self.add_to_existing_group)
+        """Update the task list display, touching only rows that changed"""
+        self.task_model.sync(self.config_manager.tasks)
 
     def update_group_display(self):
-        """Update the group list display"""
-        self.group_list.clear()
-        for group_name, tasks in self.config_manager.groups.items():
-            group_widget = GroupWidget(group_name, tasks)
-            item = QListWidgetItem(self.group_list)
-            item.setSizeHint(group_widget.sizeHint())
-            self.group_list.addItem(item)
-            self.group_list.setItemWidget(item, group_widget)
+        """Update the group list display, touching only groups that changed"""
+        if self.group_list is None:
+            return
+        self.reconcile_list(
+            self.group_list,
+            list(self.config_manager.groups.items()),
+            self.create_group_row,
+            self.update_group_row,
+        )
 
-            # Connect signals
-            group_widget.run_group_clicked.connect(self.run_group)
-            group_widget.edit_group_clicked.connect(self.edit_group)
-            group_widget.delete_group_clicked.connect(self.delete_group)
+    def reconcile_list(self, list_widget, entries, create_row, update_row):
+        """Bring a list widget in line with ordered (key, value) entries"""
+        list_widget.setUpdatesEnabled(False)
+        try:
+            wanted = {key for key, _ in entries}
+            items = {}
+            for row in reversed(range(list_widget.count())):
+                item = list_widget.item(row)
+                key = item.data(Qt.ItemDataRole.UserRole)
+                if key in wanted and key not in items:
+                    items[key] = item
+                else:
+                    self.discard_row(list_widget.itemWidget(item))
+                    list_widget.takeItem(row)
+
+            for row, (key, value) in enumerate(entries):
+                item = items.get(key)
+                if item is not None and list_widget.row(item) == row:
+                    update_row(item, list_widget.itemWidget(item), value)
+                    continue
+
+                # Rows that moved are recreated, item widgets cannot be moved
+                if item is not None:
+                    self.discard_row(list_widget.itemWidget(item))
+                    list_widget.takeItem(list_widget.row(item))
+                widget = create_row(key, value)
+                item = QListWidgetItem()
+                item.setData(Qt.ItemDataRole.UserRole, key)
+                item.setSizeHint(widget.sizeHint())
+                list_widget.insertItem(row, item)
+                list_widget.setItemWidget(item, widget)
+        finally:
+            list_widget.setUpdatesEnabled(True)
+
+    def discard_row(self, widget):
+        """Unregister the task widgets of a row that is going away"""
+        if isinstance(widget, TaskWidget):
+            self.unregister_task_widget(widget)
+        elif isinstance(widget, GroupWidget):
+            for task_widget in widget.task_widgets:
+                self.unregister_task_widget(task_widget)
+
+    def create_group_row(self, group_name: str, tasks: List[Task]) -> GroupWidget:
+        group_widget = GroupWidget(group_name, tasks)
+
+        # Connect signals
+        group_widget.run_group_clicked.connect(self.run_group)
+        group_widget.edit_group_clicked.connect(self.edit_group)
+        group_widget.delete_group_clicked.connect(self.delete_group)
+        for task_widget in group_widget.task_widgets:
+            self.register_task_widget(task_widget)
+        return group_widget
+
+    def update_group_row(self, item, group_widget: GroupWidget, tasks: List[Task]):
+        added, removed = group_widget.sync_tasks(tasks)
+        for task_widget in removed:
+            self.unregister_task_widget(task_widget)
+        for task_widget in added:
+            self.register_task_widget(task_widget)
+        if added or removed:
+            item.setSizeHint(group_widget.sizeHint())
 
     def show_error(self, message: str):
         """Show error message"""
@@ -224,8 +494,8 @@ class MainWindow(QMainWindow):
 
     def group_tasks(self):
         """Create a new group from selected tasks"""
-        selected_items = self.task_list.selectedItems()
-        if len(selected_items) < 2:
+        selected_rows = self.task_list.selectionModel().selectedRows()
+        if len(selected_rows) < 2:
             self.show_error("Select at least two tasks to group.")
             return
 
@@ -237,23 +507,22 @@ class MainWindow(QMainWindow):
             self.show_error(f"Group {group_name} already exists.")
             return
 
-        # Create a new group with selected tasks
-        group_tasks = []
-        for item in selected_items:
-            task = self.task_list.itemWidget(item).task
-            if task in self.config_manager.tasks:
-                # Remove task from main list and add to group
-                self.config_manager.tasks.remove(task)
-                group_tasks.append(task)
-
-        self.config_manager.groups[group_name] = group_tasks
+        # Create a new group with selected tasks, moved out of the main list
+        group_tasks = [
+            index.data(TASK_ROLE)
+            for index in sorted(selected_rows, key=lambda index: index.row())
+        ]
+        self.config_manager.create_group(group_name, group_tasks)
         self.update_displays()
-        self.config_manager.save_config()
         logging.info(f"Created group: {group_name} with {len(group_tasks)} tasks")
 
     def edit_task(self, task: Task, group_name: str = None):
         """Edit an existing task"""
-        dialog = TaskEditDialog(task, parent=self)
+        # A task can depend on the tasks it runs together with
+        candidates = self.config_manager.groups.get(
+            group_name, self.config_manager.tasks
+        )
+        dialog = TaskEditDialog(task, parent=self, candidates=candidates)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             path, cmd, title = dialog.get_values()
 
@@ -269,22 +538,19 @@ class MainWindow(QMainWindow):
             task.path = path
             task.cmd = cmd
             task.title = title or cmd
+            task.max_lines = dialog.get_max_lines()
+            task.depends_on = dialog.get_dependencies()
+            task.ready_when = dialog.get_ready_when()
+            task.output_stages = dialog.get_output_stages()
 
+            self.config_manager.update_task(task)
             self.update_displays()
-            self.config_manager.save_config()
             logging.info(f"Updated task: {task.title} (ID: {task.id})")
 
     def delete_task(self, task: Task, group_name: str = None):
         """Delete a task from either ungrouped tasks or a group"""
-        if task in self.config_manager.tasks:
-            self.config_manager.tasks.remove(task)
-        elif group_name and task in self.config_manager.groups.get(group_name, []):
-            self.config_manager.groups[group_name].remove(task)
-            if not self.config_manager.groups[group_name]:
-                del self.config_manager.groups[group_name]
-
+        self.config_manager.delete_task(task, group_name)
         self.update_displays()
-        self.config_manager.save_config()
         logging.info(f"Deleted task: {task.title} (ID: {task.id})")
 
     def edit_group(self, group_name: str):
@@ -296,11 +562,8 @@ class MainWindow(QMainWindow):
             if new_name in self.config_manager.groups:
                 self.show_error(f"Group '{new_name}' already exists.")
                 return
-            self.config_manager.groups[new_name] = self.config_manager.groups.pop(
-                group_name
-            )
+            self.config_manager.rename_group(group_name, new_name)
             self.update_displays()
-            self.config_manager.save_config()
             logging.info(f"Renamed group from {group_name} to {new_name}")
 
     def delete_group(self, group_name: str):
@@ -313,10 +576,8 @@ class MainWindow(QMainWindow):
         )
         if reply == QMessageBox.StandardButton.Yes:
             # Move tasks back to ungrouped tasks
-            self.config_manager.tasks.extend(self.config_manager.groups[group_name])
-            del self.config_manager.groups[group_name]
+            self.config_manager.delete_group(group_name)
             self.update_displays()
-            self.config_manager.save_config()
             logging.info(f"Deleted group: {group_name}")
 
     def add_to_existing_group(self, task: Task):
@@ -330,11 +591,8 @@ class MainWindow(QMainWindow):
             self, "Add to Group", "Select group:", group_names, 0, False
         )
         if ok and group_name:
-            if task in self.config_manager.tasks:
-                self.config_manager.tasks.remove(task)
-            self.config_manager.groups[group_name].append(task)
+            self.config_manager.add_to_group(group_name, task)
             self.update_displays()
-            self.config_manager.save_config()
             logging.info(f"Added task {task.title} to group {group_name}")
 
     def browse_directory(self):
@@ -348,6 +606,50 @@ class MainWindow(QMainWindow):
         if directory:
             self.path_input.setText(directory)
 
+    def open_logs(self):
+        """Browse run logs, starting with the task of the current output tab"""
+        tasks = list(self.config_manager.task_index.values())
+        LogViewer(tasks, self.current_output_task(), self).exec()
+
+    def open_search(self):
+        """Show the search over all output, keeping earlier results"""
+        if not settings_service().current.search_index_mb:
+            self.status_label.setText("Output search is turned off in the settings")
+            return
+        if self.search_dialog is None:
+            self.search_dialog = SearchDialog(
+                self.process_manager.search_index, self.output_title, self
+            )
+            self.search_dialog.search_changed.connect(self.highlight_matches)
+            self.search_dialog.match_activated.connect(self.show_match)
+        self.search_dialog.show()
+        self.search_dialog.raise_()
+        self.search_dialog.activateWindow()
+
+    def output_title(self, console: OutputConsole) -> Optional[str]:
+        """Return the tab title of a console, None once its tab is closed"""
+        index = self.output_tab.indexOf(console) if self.output_tab else -1
+        return self.output_tab.tabText(index) if index >= 0 else None
+
+    def highlight_matches(self, pattern):
+        """Mark the matches of a search in every output tab"""
+        if self.output_tab is None:
+            return
+        for index in range(self.output_tab.count()):
+            self.output_tab.widget(index).set_search(pattern)
+
+    def show_match(self, match):
+        """Bring up the tab of a search match and scroll to it"""
+        if self.output_title(match.stream) is None:
+            self.status_label.setText("The tab of this match was closed")
+            return
+        self.output_tab.setCurrentWidget(match.stream)
+        if not match.stream.show_match(match.line, match.start, match.end):
+            self.status_label.setText(
+                f"Line {match.line + 1} is no longer held in its tab, "
+                "open Logs to see the whole run"
+            )
+
     def open_settings(self):
         settings_dialog = SettingsDialog(self)
         settings_dialog.exec()
@@ -356,6 +658,7 @@ class MainWindow(QMainWindow):
         # Get the task ID from the tab text
         tab_text = self.output_tab.tabText(index)
         logging.info(f"Closing tab with text: {tab_text}")
+        self.process_manager.search_index.forget(self.output_tab.widget(index))
 
         # Extract the task ID - handle both formats "Title | ID" and other formats
         parts = tab_text.split(" | ")
@@ -388,14 +691,15 @@ class MainWindow(QMainWindow):
             # Stop the task if it's running
             if task_id in self.process_manager.running_tasks:
                 self.process_manager.stop_task(task_id)
-                logging.info(f"Successfully stopped task {task_id}")
+                logging.info(f"Stopping task {task_id}")
 
             # Remove the tab and update status
             self.output_tab.removeTab(index)
             self.update_task_status(task_id, False)
             # Clean up the output widget
             if task_id in self.outputs:
-                self.outputs.pop(task_id)
+                self.process_manager.release_output(task_id)
+                self.outputs.pop(task_id).scrollback.close()
                 logging.info(f"Removed task with ID: {task_id} from outputs.")
         except Exception as e:
             logging.error(f"Unable to close output tab gracefully: {e}")
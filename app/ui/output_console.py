@@ -0,0 +1,303 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QHeaderView,
+    QStyle,
+    QStyledItemDelegate,
+    QTableView,
+)
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QPointF, Qt
+from PyQt6.QtGui import (
+    QColor,
+    QFont,
+    QFontDatabase,
+    QKeySequence,
+    QTextCharFormat,
+    QTextLayout,
+)
+
+from app.utils.ansi import (
+    EMPTY_LINE,
+    BOLD,
+    DIM,
+    INVERSE,
+    ITALIC,
+    STRIKE,
+    UNDERLINE,
+    Style,
+    StyledLine,
+    color_rgb,
+)
+from app.utils.scrollback import ScrollbackBuffer
+from app.utils.search_index import line_matches
+
+STYLED_LINE_ROLE = Qt.ItemDataRole.UserRole
+LINE_KEY_ROLE = Qt.ItemDataRole.UserRole + 1
+RENDER_CACHE_SIZE = 512
+MATCH_COLOR = QColor(255, 235, 59, 140)
+CURRENT_MATCH_COLOR = QColor(255, 152, 0, 200)
+
+
+class OutputModel(QAbstractListModel):
+    """List model over a task's scrollback plus its live partial line"""
+
+    def __init__(self, scrollback: ScrollbackBuffer, parent=None):
+        super().__init__(parent)
+        self.scrollback = scrollback
+        self.partial = EMPTY_LINE
+        self.widest_line = 0
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.scrollback) + (1 if self.partial.text else 0)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        row = index.row()
+        if not index.isValid() or row >= self.rowCount():
+            return None
+
+        line = self.scrollback[row] if row < len(self.scrollback) else self.partial
+        if role == STYLED_LINE_ROLE:
+            return line
+        if role == LINE_KEY_ROLE:
+            # Absolute line numbers stay valid as old lines are evicted
+            if row < len(self.scrollback):
+                return self.scrollback.first_index + row
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return line.text
+        return None
+
+    def append_lines(self, lines: List[StyledLine], partial: StyledLine) -> int:
+        """Append lines and replace the partial line, returning evicted rows"""
+        if self.partial.text:
+            row = len(self.scrollback)
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.partial = EMPTY_LINE
+            self.endRemoveRows()
+
+        if lines:
+            first = len(self.scrollback)
+            self.beginInsertRows(QModelIndex(), first, first + len(lines) - 1)
+            self.scrollback.extend(lines)
+            self.endInsertRows()
+            widest_line = max(len(line.text) for line in lines)
+            self.widest_line = max(self.widest_line, widest_line)
+
+        evicted = self.scrollback.excess()
+        if evicted:
+            self.beginRemoveRows(QModelIndex(), 0, evicted - 1)
+            self.scrollback.evict(evicted)
+            self.endRemoveRows()
+
+        if partial.text:
+            row = len(self.scrollback)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.partial = partial
+            self.endInsertRows()
+
+        return evicted
+
+
+class OutputDelegate(QStyledItemDelegate):
+    """Lays out styled lines on demand, caching only recently shown ones"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cache: "OrderedDict[int, QTextLayout]" = OrderedDict()
+        self.formats: Dict[Style, QTextCharFormat] = {}
+        # Search matches are found when a line is painted, never stored
+        self.search: Optional[Pattern] = None
+        self.current_match: Optional[Tuple[int, int, int]] = None  # Line, start, end
+
+    def paint(self, painter, option, index):
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            painter.setPen(option.palette.text().color())
+
+        layout = self.layout(index, option.font)
+        painter.save()
+        painter.setClipRect(option.rect)
+        layout.draw(painter, QPointF(option.rect.topLeft()), self.highlights(index))
+        painter.restore()
+
+    def highlights(self, index: QModelIndex) -> list:
+        """Return the search matches of a line as selections to draw"""
+        if self.search is None:
+            return []
+        text = index.data(Qt.ItemDataRole.DisplayRole)
+        key = index.data(LINE_KEY_ROLE)
+        selections = []
+        for start, end in line_matches(self.search, f"{text}\n"):
+            current = self.current_match == (key, start, end)
+            selection = QTextLayout.FormatRange()
+            selection.start = start
+            selection.length = end - start
+            selection.format.setBackground(
+                CURRENT_MATCH_COLOR if current else MATCH_COLOR
+            )
+            selections.append(selection)
+        return selections
+
+    def layout(self, index: QModelIndex, font: QFont) -> QTextLayout:
+        """Return the text layout for a line, building it if needed"""
+        key = index.data(LINE_KEY_ROLE)
+        layout = self.cache.get(key) if key is not None else None
+        if layout is not None:
+            self.cache.move_to_end(key)
+            return layout
+
+        line: StyledLine = index.data(STYLED_LINE_ROLE)
+        layout = QTextLayout(line.text, font)
+        layout.setFormats(
+            [
+                self._format_range(start, length, style)
+                for start, length, style in line.spans
+            ]
+        )
+        layout.beginLayout()
+        layout.createLine()
+        layout.endLayout()
+
+        if key is not None:
+            self.cache[key] = layout
+            if len(self.cache) > RENDER_CACHE_SIZE:
+                self.cache.popitem(last=False)
+        return layout
+
+    def _format_range(self, start: int, length: int, style: Style):
+        format_range = QTextLayout.FormatRange()
+        format_range.start = start
+        format_range.length = length
+        format_range.format = self.formats.get(style) or self._char_format(style)
+        return format_range
+
+    def _char_format(self, style: Style) -> QTextCharFormat:
+        """Build and cache the character format for a parsed style"""
+        foreground, background, flags = style
+        if flags & INVERSE:
+            foreground, background = background, foreground
+
+        char_format = QTextCharFormat()
+        foreground_rgb = color_rgb(foreground)
+        if foreground_rgb is not None:
+            color = QColor(*foreground_rgb)
+            if flags & DIM:
+                color.setAlpha(160)
+            char_format.setForeground(color)
+        background_rgb = color_rgb(background)
+        if background_rgb is not None:
+            char_format.setBackground(QColor(*background_rgb))
+        if flags & BOLD:
+            char_format.setFontWeight(QFont.Weight.Bold)
+        char_format.setFontItalic(bool(flags & ITALIC))
+        char_format.setFontUnderline(bool(flags & UNDERLINE))
+        char_format.setFontStrikeOut(bool(flags & STRIKE))
+
+        self.formats[style] = char_format
+        return char_format
+
+
+class OutputConsole(QTableView):
+    """Read-only output view that only renders the lines currently on screen"""
+
+    def __init__(self, scrollback: Optional[ScrollbackBuffer] = None, parent=None):
+        super().__init__(parent)
+        self.scrollback = scrollback if scrollback is not None else ScrollbackBuffer()
+        self.output_model = OutputModel(self.scrollback, self)
+        self.setModel(self.output_model)
+        self.setItemDelegate(OutputDelegate(self))
+
+        # Fixed-height rows let the view map scroll offsets to rows directly
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.horizontalHeader().hide()
+        self.verticalHeader().hide()
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height())
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerItem)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+
+        # Follow the tail while the user is looking at it
+        self.follow_tail = True
+        scrollbar = self.verticalScrollBar()
+        scrollbar.valueChanged.connect(self._on_scrolled)
+        scrollbar.rangeChanged.connect(self._on_range_changed)
+
+    def append_lines(
+        self, lines: List[StyledLine], partial: StyledLine = EMPTY_LINE
+    ) -> None:
+        """Append complete lines and redraw the partial line in place"""
+        if not lines and partial == self.output_model.partial:
+            return
+
+        scrollbar = self.verticalScrollBar()
+        follow_tail = self.follow_tail
+        top_row = scrollbar.value()
+        widest_line = self.output_model.widest_line
+
+        evicted = self.output_model.append_lines(lines, partial)
+
+        # Stick to the tail, or keep the lines being read in place on eviction
+        if follow_tail:
+            scrollbar.setValue(scrollbar.maximum())
+        else:
+            scrollbar.setValue(max(0, top_row - evicted))
+        self.follow_tail = follow_tail
+
+        if self.output_model.widest_line != widest_line:
+            char_width = self.fontMetrics().horizontalAdvance("M")
+            self.setColumnWidth(0, char_width * (self.output_model.widest_line + 1))
+
+    def set_search(self, search: Optional[Pattern]) -> None:
+        """Highlight the matches of a compiled pattern, or none"""
+        delegate = self.itemDelegate()
+        delegate.search = search
+        delegate.current_match = None
+        self.viewport().update()
+
+    def show_match(self, line: int, start: int, end: int) -> bool:
+        """Scroll to a match by absolute line number, if the line is still held"""
+        row = line - self.scrollback.first_index
+        if not 0 <= row < len(self.scrollback):
+            return False
+        self.itemDelegate().current_match = (line, start, end)
+        index = self.output_model.index(row)
+        self.setCurrentIndex(index)
+        self.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+        # Rows are wider than the view for long lines, bring the match into sight
+        horizontal = self.horizontalScrollBar()
+        x = start * self.fontMetrics().horizontalAdvance("M")
+        if not horizontal.value() <= x < horizontal.value() + self.viewport().width():
+            horizontal.setValue(max(0, x - self.viewport().width() // 4))
+        self.viewport().update()
+        return True
+
+    def _on_scrolled(self, value: int) -> None:
+        self.follow_tail = value >= self.verticalScrollBar().maximum()
+
+    def _on_range_changed(self, minimum: int, maximum: int) -> None:
+        if self.follow_tail:
+            self.verticalScrollBar().setValue(maximum)
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.Copy):
+            self.copy_selection()
+        else:
+            super().keyPressEvent(event)
+
+    def copy_selection(self) -> None:
+        """Copy the selected lines as plain text"""
+        rows = sorted(index.row() for index in self.selectionModel().selectedRows())
+        text = "\n".join(self.output_model.index(row).data() for row in rows)
+        QApplication.clipboard().setText(text)
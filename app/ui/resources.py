@@ -0,0 +1,35 @@
+import logging
+import os
+from functools import lru_cache
+
+from PyQt6.QtGui import QIcon
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ICON_DIR = os.path.join(APP_DIR, "icons")
+STYLESHEET_PATH = os.path.join(APP_DIR, "ui", "styles.qss")
+
+
+@lru_cache(maxsize=None)
+def icon(name: str) -> QIcon:
+    """Return the shared icon for an SVG in app/icons, loading it only once"""
+    return QIcon(os.path.join(ICON_DIR, f"{name}.svg"))
+
+
+@lru_cache(maxsize=None)
+def stylesheet() -> str:
+    """Return the application stylesheet, read from disk only once"""
+    try:
+        with open(STYLESHEET_PATH, "r") as f:
+            return f.read()
+    except OSError as e:
+        logging.error(f"Error loading stylesheet: {str(e)}")
+        return ""
+
+
+def preload() -> None:
+    """Load the stylesheet and every bundled icon up front"""
+    stylesheet()
+    for file_name in os.listdir(ICON_DIR):
+        name, extension = os.path.splitext(file_name)
+        if extension == ".svg":
+            icon(name)
@@ -0,0 +1,124 @@
+import logging
+import re
+import time
+from typing import Callable, Hashable, Optional
+
+from PyQt6.QtWidgets import (
+    QApplication,
+    QCheckBox,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QPushButton,
+    QVBoxLayout,
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from app.utils.search_index import MAX_MATCHES, OutputIndex
+from app.utils.telemetry import format_bytes
+
+MATCH_ROLE = Qt.ItemDataRole.UserRole
+
+
+class SearchDialog(QDialog):
+    """Finds text in the output of every tab and lists the matching lines"""
+
+    # Emitted with the compiled pattern of a search, or None once closed
+    search_changed = pyqtSignal(object)
+    # Emitted with the SearchMatch the user picked
+    match_activated = pyqtSignal(object)
+
+    def __init__(
+        self,
+        index: OutputIndex,
+        label: Callable[[Hashable], Optional[str]],
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.setWindowTitle("Search Output")
+        self.resize(700, 400)
+        self.index = index
+        self.label = label  # Tab title of a stream, None once its tab is closed
+        self.pattern = None  # Compiled pattern of the last search
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        layout.addLayout(controls)
+        self.query_edit = QLineEdit(self)
+        self.query_edit.setPlaceholderText("Text or regular expression")
+        controls.addWidget(self.query_edit, 1)
+        self.regex_checkbox = QCheckBox("Regex", self)
+        controls.addWidget(self.regex_checkbox)
+        self.case_checkbox = QCheckBox("Match case", self)
+        controls.addWidget(self.case_checkbox)
+        search_btn = QPushButton("Search", self)
+        controls.addWidget(search_btn)
+
+        self.results = QListWidget(self)
+        self.results.setUniformItemSizes(True)
+        layout.addWidget(self.results)
+        self.status_label = QLabel(self)
+        layout.addWidget(self.status_label)
+
+        self.query_edit.returnPressed.connect(self.search)
+        search_btn.clicked.connect(self.search)
+        self.results.itemActivated.connect(self.activate)
+        self.results.currentItemChanged.connect(self.activate)
+
+    def search(self):
+        query = self.query_edit.text()
+        self.results.clear()
+        if not query:
+            self.set_pattern(None)
+            self.status_label.clear()
+            return
+
+        regex = self.regex_checkbox.isChecked()
+        ignore_case = not self.case_checkbox.isChecked()
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        started = time.perf_counter()
+        try:
+            matches = self.index.search(query, regex, ignore_case)
+        except re.error as e:
+            self.status_label.setText(f"Invalid regular expression: {str(e)}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        shown = 0
+        self.results.setUpdatesEnabled(False)
+        for match in matches:
+            title = self.label(match.stream)
+            if title is None:
+                continue
+            item = QListWidgetItem(f"{title}  {match.line + 1}: {match.text.strip()}")
+            item.setData(MATCH_ROLE, match)
+            self.results.addItem(item)
+            shown += 1
+        self.results.setUpdatesEnabled(True)
+
+        more = "+" if len(matches) >= MAX_MATCHES else ""
+        self.status_label.setText(
+            f"{shown}{more} matches in {elapsed_ms:.0f} ms, "
+            f"{format_bytes(self.index.chars)} of output indexed"
+        )
+        logging.info(f"Searched output for {query!r} in {elapsed_ms:.0f} ms")
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        self.set_pattern(re.compile(query if regex else re.escape(query), flags))
+
+    def set_pattern(self, pattern):
+        self.pattern = pattern
+        self.search_changed.emit(pattern)
+
+    def activate(self, item: Optional[QListWidgetItem], *args):
+        """Jump to the match of a result as it is selected or activated"""
+        if item is not None:
+            self.match_activated.emit(item.data(MATCH_ROLE))
+
+    def done(self, result):
+        self.set_pattern(None)
+        super().done(result)
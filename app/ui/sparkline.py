@@ -0,0 +1,56 @@
+from typing import List, Optional, Sequence
+
+from PyQt6.QtCore import QPointF, QRect, QSize
+from PyQt6.QtGui import QColor, QPainter, QPolygonF
+from PyQt6.QtWidgets import QWidget
+
+CPU_COLOR = QColor("#4CAF50")
+MEMORY_COLOR = QColor("#2196F3")
+
+
+def paint_sparkline(
+    painter: QPainter,
+    rect: QRect,
+    values: Sequence[float],
+    color: QColor,
+    maximum: Optional[float] = None,
+) -> None:
+    """Draw values as a line scaled to fit rect, the newest at the right edge"""
+    if len(values) < 2 or rect.width() < 2:
+        return
+    values = values[-rect.width() :]
+    top = max(values) if maximum is None else max(maximum, max(values))
+    if top <= 0:
+        top = 1
+    step = (rect.width() - 1) / (len(values) - 1)
+    height = rect.height() - 1
+    points = QPolygonF(
+        [
+            QPointF(rect.left() + i * step, rect.bottom() - value / top * height)
+            for i, value in enumerate(values)
+        ]
+    )
+    painter.save()
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(color)
+    painter.drawPolyline(points)
+    painter.restore()
+
+
+class Sparkline(QWidget):
+    """Small line chart of the recent history of one measurement"""
+
+    def __init__(self, color: QColor, maximum: Optional[float] = None, parent=None):
+        super().__init__(parent)
+        self.color = color
+        self.maximum = maximum
+        self.values: List[float] = []
+        self.setFixedSize(QSize(60, 16))
+
+    def set_values(self, values: List[float]) -> None:
+        self.values = values
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        paint_sparkline(painter, self.rect(), self.values, self.color, self.maximum)
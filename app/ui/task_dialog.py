@@ -1,7 +1,3 @@
-import os
-import json
-import uuid
-
 from PyQt6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -11,25 +7,54 @@ from PyQt6.QtWidgets import (
     QLabel,
     QFileDialog,
     QComboBox,
+    QCheckBox,
     QWidget,
+    QSpinBox,
+    QCompleter,
+    QListWidget,
+    QListWidgetItem,
+    QMessageBox,
 )
-from app.utils.utils import load_config_yaml
+from PyQt6.QtCore import QStringListModel, Qt
+from typing import List, Optional
+from app.settings.settings import settings_service
+from app.utils.history import command_history
+from app.utils.line_pipeline import LinePipeline
+from app.utils.scheduler import ReadyCondition
 from app.models.task import Task
 
-COMMANDS_JSON_PATH = os.path.join(os.getcwd(), "commands.json")
+DROPDOWN_COMMANDS = 50  # Top ranked commands listed in the dropdown
+READY_KINDS = [
+    ("When started", "started", ""),
+    ("When exited successfully", "exit", ""),
+    ("When output matches", "output", "Regular expression, e.g. Listening on"),
+    ("When port is open", "port", "[host:]port, e.g. 8080"),
+]
+# Output stages without options, with their checkbox labels
+STAGE_OPTIONS = [
+    ("dedup", "Collapse repeated lines"),
+    ("levels", "Color errors and warnings"),
+    ("timestamps", "Prefix lines with the time"),
+]
 
 
 class TaskEditDialog(QDialog):
-    def __init__(self, task: Task = None, parent=None):
+    def __init__(self, task: Task = None, parent=None, candidates: List[Task] = ()):
         super().__init__(parent)
         self.task = task
+        # Tasks this one may depend on
+        self.candidates = [c for c in candidates if task is None or c.id != task.id]
         self.setWindowTitle("Edit Task" if task else "New Task")
-        self.commands_list = self.load_commands()
+        self.history = command_history()
         self.init_ui()
         if task:
             self.path_input.setText(task.path)
             self.cmd_input.setCurrentText(task.cmd)
             self.title_input.setText(task.title)
+            self.max_lines_input.setValue(task.max_lines or 0)
+            self.set_ready_when(task.ready_when)
+            self.set_output_stages(task.output_stages)
+        self.set_dependencies(task.depends_on if task else [])
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -53,13 +78,56 @@ class TaskEditDialog(QDialog):
         cmd_label = QLabel("Command:", self)
         self.cmd_input = QComboBox(self)
         self.cmd_input.setEditable(True)
-        self.cmd_input.addItems(self.commands_list)
+        commands = self.history.ranked()
+        self.cmd_input.addItems(commands[:DROPDOWN_COMMANDS])
+        # The completer searches the whole history, best ranked matches first
+        completer = QCompleter(QStringListModel(commands, self), self)
+        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        completer.setFilterMode(Qt.MatchFlag.MatchContains)
+        self.cmd_input.setCompleter(completer)
 
         # Title input
         title_label = QLabel("Title:", self)
         self.title_input = QLineEdit(self)
         self.title_input.setPlaceholderText("Enter title (defaults to command)")
 
+        # Scrollback limit
+        max_lines_label = QLabel("Max output lines:", self)
+        self.max_lines_input = QSpinBox(self)
+        self.max_lines_input.setRange(0, 10_000_000)
+        self.max_lines_input.setSpecialValueText("Use global setting")
+
+        # Dependencies, honoured when the task runs as part of a group
+        depends_label = QLabel("Start after:", self)
+        self.depends_list = QListWidget(self)
+        self.depends_list.setMaximumHeight(120)
+
+        ready_label = QLabel("Ready for dependent tasks:", self)
+        ready_layout = QHBoxLayout()
+        self.ready_kind = QComboBox(self)
+        for label, kind, _ in READY_KINDS:
+            self.ready_kind.addItem(label, kind)
+        self.ready_value = QLineEdit(self)
+        self.ready_kind.currentIndexChanged.connect(self.update_ready_value)
+        ready_layout.addWidget(self.ready_kind)
+        ready_layout.addWidget(self.ready_value)
+        self.update_ready_value()
+
+        # Line stages applied to the output before it is shown
+        output_label = QLabel("Output:", self)
+        filter_layout = QHBoxLayout()
+        self.include_input = QLineEdit(self)
+        self.include_input.setPlaceholderText("Only lines matching (regex)")
+        self.exclude_input = QLineEdit(self)
+        self.exclude_input.setPlaceholderText("Hide lines matching (regex)")
+        filter_layout.addWidget(self.include_input)
+        filter_layout.addWidget(self.exclude_input)
+        stage_layout = QHBoxLayout()
+        self.stage_checkboxes = {}
+        for stage, label in STAGE_OPTIONS:
+            self.stage_checkboxes[stage] = QCheckBox(label, self)
+            stage_layout.addWidget(self.stage_checkboxes[stage])
+
         # Buttons
         button_layout = QHBoxLayout()
         save_btn = QPushButton("Save", self)
@@ -77,15 +145,55 @@ class TaskEditDialog(QDialog):
         layout.addWidget(self.cmd_input)
         layout.addWidget(title_label)
         layout.addWidget(self.title_input)
+        layout.addWidget(max_lines_label)
+        layout.addWidget(self.max_lines_input)
+        if self.candidates:
+            layout.addWidget(depends_label)
+            layout.addWidget(self.depends_list)
+        layout.addWidget(ready_label)
+        layout.addLayout(ready_layout)
+        layout.addWidget(output_label)
+        layout.addLayout(filter_layout)
+        layout.addLayout(stage_layout)
         layout.addLayout(button_layout)
 
+    def update_ready_value(self):
+        placeholder = READY_KINDS[self.ready_kind.currentIndex()][2]
+        self.ready_value.setEnabled(bool(placeholder))
+        self.ready_value.setPlaceholderText(placeholder)
+
+    def set_ready_when(self, spec: Optional[str]):
+        kind, _, value = (spec or "started").partition(":")
+        self.ready_kind.setCurrentIndex(max(0, self.ready_kind.findData(kind)))
+        self.ready_value.setText(value)
+
+    def set_output_stages(self, stages: List[dict]):
+        for entry in stages:
+            stage = entry.get("stage")
+            if stage == "include":
+                self.include_input.setText(entry.get("pattern", ""))
+            elif stage == "exclude":
+                self.exclude_input.setText(entry.get("pattern", ""))
+            elif stage in self.stage_checkboxes:
+                self.stage_checkboxes[stage].setChecked(True)
+
+    def set_dependencies(self, depends_on: List[str]):
+        selected = set(depends_on)
+        for candidate in self.candidates:
+            item = QListWidgetItem(candidate.title, self.depends_list)
+            item.setData(Qt.ItemDataRole.UserRole, candidate.id)
+            item.setCheckState(
+                Qt.CheckState.Checked
+                if candidate.id in selected
+                else Qt.CheckState.Unchecked
+            )
+
     def browse_directory(self):
         """Open file dialog to select a directory"""
-        config = load_config_yaml()
         directory = QFileDialog.getExistingDirectory(
             self,
             "Select Directory",
-            config["settings"]["default_path"],
+            settings_service().current.default_path,
             QFileDialog.Option.ShowDirsOnly,
         )
         if directory:
@@ -99,37 +207,54 @@ class TaskEditDialog(QDialog):
             self.title_input.text().strip(),
         )
 
-    def accept(self):
-        command = self.cmd_input.currentText()
-        self.add_command(command)
-        super().accept()
+    def get_max_lines(self):
+        """Return the per-task scrollback limit, or None to use the global one"""
+        return self.max_lines_input.value() or None
+
+    def get_ready_when(self) -> Optional[str]:
+        """Return the readiness condition, or None for ready once started"""
+        kind = self.ready_kind.currentData()
+        if kind == "started":
+            return None
+        if kind == "exit":
+            return kind
+        return f"{kind}:{self.ready_value.text().strip()}"
+
+    def get_output_stages(self) -> List[dict]:
+        """Return the output stages in the order they run: filters first"""
+        stages = []
+        for stage, pattern_input in (
+            ("include", self.include_input),
+            ("exclude", self.exclude_input),
+        ):
+            if pattern_input.text().strip():
+                stages.append({"stage": stage, "pattern": pattern_input.text().strip()})
+        stages.extend(
+            {"stage": stage}
+            for stage, _ in STAGE_OPTIONS
+            if self.stage_checkboxes[stage].isChecked()
+        )
+        return stages
 
-    def add_command(self, command):
-        if command and command not in self.commands_list:
-            self.commands_list.append(command)
-            self.save_commands()
-            current_text = self.cmd_input.currentText()  # Save current text
-            self.cmd_input.clear()
-            self.cmd_input.addItems(self.commands_list)
-            self.cmd_input.setCurrentText(current_text)  # Restore current text
+    def get_dependencies(self) -> List[str]:
+        """Return the IDs of the checked tasks"""
+        items = (self.depends_list.item(i) for i in range(self.depends_list.count()))
+        return [
+            item.data(Qt.ItemDataRole.UserRole)
+            for item in items
+            if item.checkState() == Qt.CheckState.Checked
+        ]
 
-    def load_commands(self):
+    def accept(self):
         try:
-            with open(COMMANDS_JSON_PATH, "r") as f:
-                data = json.load(f)
-                cmds = set([task["cmd"] for task in data["tasks"]])
-                return list(cmds)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-
-    def save_commands(self):
-        tasks = []
-        for cmd in self.commands_list:
-            if cmd not in [
-                task["cmd"] for task in tasks
-            ]:  # Check if command already exists
-                tasks.append(
-                    {"id": str(uuid.uuid4()), "cmd": cmd}
-                )  # Append the dictionary
-        with open(COMMANDS_JSON_PATH, "w") as f:
-            json.dump({"tasks": tasks}, f, indent=4)
+            ReadyCondition.parse(self.get_ready_when())
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid readiness condition", str(e))
+            return
+        try:
+            LinePipeline.build(self.get_output_stages())
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid output filter", str(e))
+            return
+        self.history.record(self.cmd_input.currentText())
+        super().accept()
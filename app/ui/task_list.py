@@ -0,0 +1,263 @@
+from typing import Dict, List, Optional
+
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate, QToolTip
+from PyQt6.QtCore import (
+    QAbstractListModel,
+    QEvent,
+    QModelIndex,
+    QRect,
+    QSize,
+    Qt,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QColor, QCursor
+
+from app.models.task import Task
+from app.ui.resources import icon
+from app.ui.sparkline import CPU_COLOR, paint_sparkline
+from app.utils.telemetry import TelemetryRing, format_bytes
+
+TASK_ROLE = Qt.ItemDataRole.UserRole
+STATUS_ROLE = Qt.ItemDataRole.UserRole + 1
+TELEMETRY_ROLE = Qt.ItemDataRole.UserRole + 2
+
+ROW_HEIGHT = 36
+BUTTON_SIZE = 28
+ICON_SIZE = 16
+SPARKLINE_WIDTH = 48
+# (action, tooltip) of the row buttons, each drawn with the icon of that name
+BUTTONS = [
+    ("run", "Run Task"),
+    ("edit", "Edit task"),
+    ("delete", "Delete task"),
+    ("add_to_group", "Add to Group"),
+]
+
+
+class TaskListModel(QAbstractListModel):
+    """List model over the ungrouped tasks held by ConfigManager"""
+
+    def __init__(
+        self,
+        tasks: List[Task],
+        status: Dict[str, tuple],
+        telemetry: Optional[Dict[str, TelemetryRing]] = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.tasks = tasks
+        self.status = status
+        self.telemetry = telemetry if telemetry is not None else {}
+        self._ids = [task.id for task in tasks]
+        self._rows: Optional[Dict[str, int]] = None
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._ids)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.tasks):
+            return None
+
+        task = self.tasks[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return task.title
+        if role == TASK_ROLE:
+            return task
+        if role == STATUS_ROLE:
+            return self.status.get(task.id, (False, None))
+        if role == TELEMETRY_ROLE:
+            return self.telemetry.get(task.id)
+        return None
+
+    def sync(self, tasks: Optional[List[Task]] = None) -> None:
+        """Catch up with changes made to the task list since the last sync"""
+        if tasks is not None and tasks is not self.tasks:
+            self.beginResetModel()
+            self.tasks = tasks
+            self._ids = [task.id for task in tasks]
+            self._rows = None
+            self.endResetModel()
+            return
+
+        new_ids = [task.id for task in self.tasks]
+        old_ids = self._ids
+
+        # Only the changed middle section is removed and reinserted
+        prefix = 0
+        limit = min(len(old_ids), len(new_ids))
+        while prefix < limit and old_ids[prefix] == new_ids[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old_ids[-1 - suffix] == new_ids[-1 - suffix]:
+            suffix += 1
+
+        old_end = len(old_ids) - suffix
+        new_end = len(new_ids) - suffix
+        if old_end > prefix:
+            self.beginRemoveRows(QModelIndex(), prefix, old_end - 1)
+            self._ids = old_ids[:prefix] + old_ids[old_end:]
+            self._rows = None
+            self.endRemoveRows()
+        if new_end > prefix:
+            self.beginInsertRows(QModelIndex(), prefix, new_end - 1)
+            self._ids = new_ids
+            self._rows = None
+            self.endInsertRows()
+
+        # Titles may have been edited in place
+        if self._ids:
+            self.dataChanged.emit(self.index(0), self.index(len(self._ids) - 1))
+
+    def task_changed(self, task_id: str) -> None:
+        """Repaint the row of a single task"""
+        row = self.row_of(task_id)
+        if row is not None:
+            self.dataChanged.emit(self.index(row), self.index(row))
+
+    def row_of(self, task_id: str) -> Optional[int]:
+        if self._rows is None:
+            self._rows = {task_id: row for row, task_id in enumerate(self._ids)}
+        return self._rows.get(task_id)
+
+
+class TaskDelegate(QStyledItemDelegate):
+    """Paints task rows and turns clicks on the painted buttons into signals"""
+
+    run_clicked = pyqtSignal(Task)
+    edit_clicked = pyqtSignal(Task, str)
+    delete_clicked = pyqtSignal(Task, str)
+    add_to_group_clicked = pyqtSignal(Task)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.icons = {action: icon(action) for action, _ in BUTTONS}
+        self.pressed = None  # (row, action) of the button under the mouse press
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, QColor("#4CAF50"))
+
+        rect = option.rect
+        is_running, exit_code = index.data(STATUS_ROLE)
+        if is_running:
+            dot_color = QColor("green")
+        elif exit_code:
+            dot_color = QColor("red")
+        else:
+            dot_color = QColor("gray")
+        painter.setPen(dot_color)
+        dot_rect = QRect(rect.left() + 8, rect.top(), 16, rect.height())
+        painter.drawText(dot_rect, Qt.AlignmentFlag.AlignCenter, "●")
+
+        buttons = self.button_rects(rect)
+        title_right = min(button.left() for button in buttons.values()) - 8
+        ring = index.data(TELEMETRY_ROLE) if is_running else None
+        if ring is not None and len(ring):
+            title_right = self.paint_telemetry(painter, option, ring, title_right)
+        title_rect = QRect(
+            dot_rect.right() + 8,
+            rect.top(),
+            title_right - dot_rect.right() - 8,
+            rect.height(),
+        )
+        painter.setPen(option.palette.text().color())
+        title = option.fontMetrics.elidedText(
+            index.data(), Qt.TextElideMode.ElideRight, title_rect.width()
+        )
+        painter.drawText(title_rect, Qt.AlignmentFlag.AlignVCenter, title)
+
+        hovered = None
+        if option.state & QStyle.StateFlag.State_MouseOver and option.widget:
+            cursor = option.widget.mapFromGlobal(QCursor.pos())
+            hovered = self.button_at(rect, cursor)
+        for action, button_rect in buttons.items():
+            if action == hovered:
+                painter.fillRect(button_rect, QColor("#45a049"))
+            icon_rect = QRect(0, 0, ICON_SIZE, ICON_SIZE)
+            icon_rect.moveCenter(button_rect.center())
+            self.icons[action].paint(painter, icon_rect)
+        painter.restore()
+
+    def paint_telemetry(self, painter, option, ring, right: int) -> int:
+        """Draw CPU history and usage left of x = right; return the space left"""
+        rect = option.rect
+        sample = ring.latest()
+        text = f"{sample.cpu_percent:.0f}%  {format_bytes(sample.rss)}"
+        width = option.fontMetrics.horizontalAdvance(text)
+        text_rect = QRect(right - width, rect.top(), width, rect.height())
+        painter.setPen(option.palette.placeholderText().color())
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter, text)
+        spark_rect = QRect(
+            text_rect.left() - SPARKLINE_WIDTH - 4,
+            rect.top() + rect.height() // 4,
+            SPARKLINE_WIDTH,
+            rect.height() // 2,
+        )
+        paint_sparkline(
+            painter, spark_rect, ring.series("cpu_percent"), CPU_COLOR, maximum=100
+        )
+        return spark_rect.left() - 8
+
+    def button_rects(self, rect: QRect) -> Dict[str, QRect]:
+        """Right-aligned hit areas of the row buttons"""
+        rects = {}
+        left = rect.right() - BUTTON_SIZE * len(BUTTONS) - 4
+        top = rect.top() + (rect.height() - BUTTON_SIZE) // 2
+        for action, _ in BUTTONS:
+            rects[action] = QRect(left, top, BUTTON_SIZE, BUTTON_SIZE)
+            left += BUTTON_SIZE
+        return rects
+
+    def button_at(self, rect: QRect, position) -> Optional[str]:
+        for action, button_rect in self.button_rects(rect).items():
+            if button_rect.contains(position):
+                return action
+        return None
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseMove and option.widget:
+            # Repaint the row so the hovered button highlight follows the mouse
+            option.widget.viewport().update(option.rect)
+            return False
+        if event.type() not in (
+            QEvent.Type.MouseButtonPress,
+            QEvent.Type.MouseButtonRelease,
+            QEvent.Type.MouseButtonDblClick,
+        ):
+            return False
+
+        action = self.button_at(option.rect, event.position().toPoint())
+        if event.type() == QEvent.Type.MouseButtonRelease:
+            pressed, self.pressed = self.pressed, None
+            if action is None or pressed != (index.row(), action):
+                return False
+            self.emit_action(action, index.data(TASK_ROLE))
+            return True
+
+        # Swallow presses on buttons so they do not toggle the row selection
+        if action is not None:
+            self.pressed = (index.row(), action)
+            return True
+        return False
+
+    def helpEvent(self, event, view, option, index):
+        action = self.button_at(option.rect, event.pos())
+        if action is None:
+            return super().helpEvent(event, view, option, index)
+        tooltips = dict(BUTTONS)
+        QToolTip.showText(event.globalPos(), tooltips[action], view)
+        return True
+
+    def emit_action(self, action: str, task: Task) -> None:
+        if action == "run":
+            self.run_clicked.emit(task)
+        elif action == "edit":
+            self.edit_clicked.emit(task, None)
+        elif action == "delete":
+            self.delete_clicked.emit(task, None)
+        elif action == "add_to_group":
+            self.add_to_group_clicked.emit(task)
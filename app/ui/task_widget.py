@@ -1,7 +1,11 @@
+from typing import Optional
+
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton
 from PyQt6.QtCore import pyqtSignal
-from PyQt6.QtGui import QIcon
 from app.models.task import Task
+from app.ui.resources import icon
+from app.ui.sparkline import CPU_COLOR, Sparkline
+from app.utils.telemetry import TelemetryRing, describe, format_bytes
 
 
 class TaskWidget(QWidget):
@@ -25,17 +29,23 @@ class TaskWidget(QWidget):
         self.status_label.setProperty("taskId", self.task.id)
 
         # Create title label
-        title_label = QLabel(self.task.title)
+        self.title_label = QLabel(self.task.title)
+
+        # Resource usage, shown while the task runs
+        self.telemetry_label = QLabel(objectName="telemetry")
+        self.cpu_sparkline = Sparkline(CPU_COLOR, maximum=100)
+        self.telemetry_label.hide()
+        self.cpu_sparkline.hide()
 
         # Create buttons
         run_btn = QPushButton()
-        run_btn.setIcon(QIcon("app/icons/run.svg"))
+        run_btn.setIcon(icon("run"))
         run_btn.setToolTip("Run Task")
         edit_btn = QPushButton()
-        edit_btn.setIcon(QIcon("app/icons/edit.svg"))
+        edit_btn.setIcon(icon("edit"))
         edit_btn.setToolTip("Edit task")
         delete_btn = QPushButton()
-        delete_btn.setIcon(QIcon("app/icons/delete.svg"))
+        delete_btn.setIcon(icon("delete"))
         delete_btn.setToolTip("Delete task")
 
         # Connect signals
@@ -49,7 +59,9 @@ class TaskWidget(QWidget):
 
         # Add widgets to layout
         layout.addWidget(self.status_label)
-        layout.addWidget(title_label)
+        layout.addWidget(self.title_label)
+        layout.addWidget(self.cpu_sparkline)
+        layout.addWidget(self.telemetry_label)
         layout.addWidget(run_btn)
         layout.addWidget(edit_btn)
         layout.addWidget(delete_btn)
@@ -57,7 +69,7 @@ class TaskWidget(QWidget):
         # Add "Add to Group" button for ungrouped tasks
         if not self.group_name:
             add_to_group_btn = QPushButton()
-            add_to_group_btn.setIcon(QIcon("app/icons/add_to_group.svg"))
+            add_to_group_btn.setIcon(icon("add_to_group"))
             add_to_group_btn.setToolTip("Add to Group")
             add_to_group_btn.clicked.connect(
                 lambda: self.add_to_group_clicked.emit(self.task)
@@ -66,8 +78,37 @@ class TaskWidget(QWidget):
 
         layout.addStretch()
 
-    def update_status(self, is_running: bool):
-        """Update the status indicator"""
-        self.status_label.setStyleSheet(
-            "color: green;" if is_running else "color: gray;"
+    def refresh(self):
+        """Re-read the task's fields after it was edited"""
+        if self.title_label.text() != self.task.title:
+            self.title_label.setText(self.task.title)
+
+    def update_status(self, is_running: bool, exit_code=None):
+        """Update the status indicator, flagging tasks that exited with an error"""
+        if is_running:
+            color = "green"
+        elif exit_code:
+            color = "red"
+        else:
+            color = "gray"
+        self.status_label.setStyleSheet(f"color: {color};")
+        if not is_running:
+            self.update_telemetry(None)
+        self.status_label.setToolTip(
+            f"Exited with code {exit_code}" if exit_code is not None else ""
+        )
+
+    def update_telemetry(self, ring: Optional[TelemetryRing]):
+        """Show the latest CPU and memory sample, or hide them without one"""
+        sample = ring.latest() if ring is not None else None
+        if sample is None:
+            self.telemetry_label.hide()
+            self.cpu_sparkline.hide()
+            return
+        self.telemetry_label.setText(
+            f"{sample.cpu_percent:.0f}%  {format_bytes(sample.rss)}"
         )
+        self.telemetry_label.setToolTip(describe(ring))
+        self.cpu_sparkline.set_values(ring.series("cpu_percent"))
+        self.telemetry_label.show()
+        self.cpu_sparkline.show()
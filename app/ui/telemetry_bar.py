@@ -0,0 +1,34 @@
+from typing import Optional
+
+from PyQt6.QtWidgets import QHBoxLayout, QLabel, QWidget
+
+from app.ui.sparkline import CPU_COLOR, MEMORY_COLOR, Sparkline
+from app.utils.telemetry import TelemetryRing, describe
+
+
+class TelemetryBar(QWidget):
+    """Resource usage of the task whose output is shown, with CPU and RSS history"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(4, 0, 4, 0)
+        self.cpu_sparkline = Sparkline(CPU_COLOR, maximum=100)
+        self.cpu_sparkline.setToolTip("CPU")
+        self.rss_sparkline = Sparkline(MEMORY_COLOR)
+        self.rss_sparkline.setToolTip("Memory")
+        self.label = QLabel(objectName="telemetry")
+        layout.addWidget(self.cpu_sparkline)
+        layout.addWidget(self.rss_sparkline)
+        layout.addWidget(self.label)
+        self.show_ring(None)
+
+    def show_ring(self, ring: Optional[TelemetryRing]):
+        """Show the history of a running task, or nothing when it is None"""
+        if ring is None or not len(ring):
+            self.setVisible(False)
+            return
+        self.cpu_sparkline.set_values(ring.series("cpu_percent"))
+        self.rss_sparkline.set_values(ring.series("rss"))
+        self.label.setText(describe(ring))
+        self.setVisible(True)
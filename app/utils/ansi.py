@@ -0,0 +1,233 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+# A color is None (terminal default), a 256-color palette index or an RGB tuple
+Color = Union[None, int, Tuple[int, int, int]]
+# A style is (foreground, background, flags); equal styles share one tuple
+Style = Tuple[Color, Color, int]
+# A span is (start, length, style) over the plain text of a line
+Span = Tuple[int, int, Style]
+
+BOLD = 1
+DIM = 2
+ITALIC = 4
+UNDERLINE = 8
+INVERSE = 16
+STRIKE = 32
+
+DEFAULT_STYLE: Style = (None, None, 0)
+MAX_CACHED_TRANSITIONS = 4096
+
+# CSI sequences, OSC strings, escapes with intermediate bytes such as the
+# charset designation ESC ( B, and two-character escapes
+ANSI_ESCAPE_RE = re.compile(
+    r"\x1b(?:\[([0-?]*)[ -/]*([@-~])|\][^\x07\x1b]*(?:\x07|\x1b\\)"
+    r"|[ -/]+[0-~]|[@-Z\\-_])"
+)
+# An escape sequence cut off at the end of a partial line
+_INCOMPLETE_RE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*|\][^\x07\x1b]*\x1b?|[ -/]+)?\Z")
+# The same at the end of a complete line, where an OSC string ends at the
+# latest and the rest of it is shown as text instead of held back for good
+_INCOMPLETE_LINE_RE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*|[ -/]+)?\Z")
+
+_BASE_COLORS = [
+    (0, 0, 0),
+    (205, 49, 49),
+    (13, 188, 121),
+    (229, 229, 16),
+    (36, 114, 200),
+    (188, 63, 188),
+    (17, 168, 205),
+    (229, 229, 229),
+    (102, 102, 102),
+    (241, 76, 76),
+    (35, 209, 139),
+    (245, 245, 67),
+    (59, 142, 234),
+    (214, 112, 214),
+    (41, 184, 219),
+    (255, 255, 255),
+]
+
+_SGR_PARAM_SEPARATOR_RE = re.compile("[;:]")
+_SGR_FLAGS = {
+    1: BOLD,
+    2: DIM,
+    3: ITALIC,
+    4: UNDERLINE,
+    7: INVERSE,
+    9: STRIKE,
+}
+_SGR_RESET_FLAGS = {
+    22: BOLD | DIM,
+    23: ITALIC,
+    24: UNDERLINE,
+    27: INVERSE,
+    29: STRIKE,
+}
+
+
+class StyledLine(NamedTuple):
+    """A line of output as plain text plus the style spans that cover it"""
+
+    text: str
+    spans: Tuple[Span, ...] = ()
+
+
+EMPTY_LINE = StyledLine("")
+
+
+class AnsiParser:
+    """Incremental SGR state machine that turns ANSI text into style spans.
+
+    The current style carries over from one call to the next, as does an
+    escape sequence that was cut off at the end of the previous chunk.
+    """
+
+    def __init__(self):
+        self.style: Style = DEFAULT_STYLE
+        self._pending = ""
+        self._styles: Dict[Style, Style] = {DEFAULT_STYLE: DEFAULT_STYLE}
+        self._transitions: Dict[Tuple[Style, str], Style] = {}
+
+    def parse_line(self, text: str) -> StyledLine:
+        """Parse a complete line and keep the resulting style for the next one"""
+        line, self.style, self._pending = self._parse(
+            self._pending + text, self.style, _INCOMPLETE_LINE_RE
+        )
+        return line
+
+    def peek_line(self, text: str) -> StyledLine:
+        """Parse a partial line without committing any state"""
+        line, _, _ = self._parse(self._pending + text, self.style, _INCOMPLETE_RE)
+        return line
+
+    def _parse(
+        self, text: str, style: Style, incomplete_re: re.Pattern
+    ) -> Tuple[StyledLine, Style, str]:
+        if "\x1b" not in text:
+            spans = (
+                ((0, len(text), style),) if text and style is not DEFAULT_STYLE else ()
+            )
+            return StyledLine(text, spans), style, ""
+
+        pending = ""
+        incomplete = incomplete_re.search(text)
+        if incomplete:
+            pending = text[incomplete.start() :]
+            text = text[: incomplete.start()]
+
+        parts: List[str] = []
+        spans: List[Span] = []
+        length = 0
+        position = 0
+        for match in ANSI_ESCAPE_RE.finditer(text):
+            start = match.start()
+            if start > position:
+                length = self._add_text(
+                    text[position:start], style, parts, spans, length
+                )
+            if match.group(2) == "m":
+                params = match.group(1)
+                transition = self._transitions.get((style, params))
+                if transition is None:
+                    if len(self._transitions) > MAX_CACHED_TRANSITIONS:
+                        self._transitions.clear()
+                    transition = self._transitions[style, params] = self._apply_sgr(
+                        style, params
+                    )
+                style = transition
+            position = match.end()
+        if position < len(text):
+            self._add_text(text[position:], style, parts, spans, length)
+
+        return StyledLine("".join(parts), tuple(spans)), style, pending
+
+    def _add_text(self, chunk: str, style: Style, parts, spans, length: int) -> int:
+        if "\x1b" in chunk:
+            chunk = chunk.replace("\x1b", "")  # Drop stray escape characters
+            if not chunk:
+                return length
+        parts.append(chunk)
+        end = length + len(chunk)
+        if style is not DEFAULT_STYLE:
+            if (
+                spans
+                and spans[-1][2] is style
+                and spans[-1][0] + spans[-1][1] == length
+            ):
+                spans[-1] = (spans[-1][0], end - spans[-1][0], style)
+            else:
+                spans.append((length, end - length, style))
+        return end
+
+    def _apply_sgr(self, style: Style, params: str) -> Style:
+        """Apply one SGR parameter list to a style"""
+        foreground, background, flags = style
+        codes = [
+            int(code) if code.isdigit() else 0
+            for code in _SGR_PARAM_SEPARATOR_RE.split(params)
+        ]
+        index = 0
+        while index < len(codes):
+            code = codes[index]
+            if code == 0:
+                foreground, background, flags = DEFAULT_STYLE
+            elif code in _SGR_FLAGS:
+                flags |= _SGR_FLAGS[code]
+            elif code in _SGR_RESET_FLAGS:
+                flags &= ~_SGR_RESET_FLAGS[code]
+            elif 30 <= code <= 37:
+                foreground = code - 30
+            elif 90 <= code <= 97:
+                foreground = code - 90 + 8
+            elif 40 <= code <= 47:
+                background = code - 40
+            elif 100 <= code <= 107:
+                background = code - 100 + 8
+            elif code == 39:
+                foreground = None
+            elif code == 49:
+                background = None
+            elif code in (38, 48):
+                color, index = _extended_color(codes, index)
+                if code == 38:
+                    foreground = color
+                else:
+                    background = color
+            index += 1
+
+        new_style = (foreground, background, flags)
+        return self._styles.setdefault(new_style, new_style)
+
+
+def _extended_color(codes: List[int], index: int) -> Tuple[Color, int]:
+    """Read a 38/48 color argument, returning the color and the last index used"""
+    mode = codes[index + 1] if index + 1 < len(codes) else None
+    if mode == 5 and index + 2 < len(codes):
+        return codes[index + 2] & 0xFF, index + 2
+    if mode == 2 and index + 4 < len(codes):
+        red, green, blue = codes[index + 2 : index + 5]
+        return (red & 0xFF, green & 0xFF, blue & 0xFF), index + 4
+    return None, len(codes)
+
+
+def palette_rgb(color: int) -> Tuple[int, int, int]:
+    """Return the RGB value of a 256-color palette index"""
+    if color < 16:
+        return _BASE_COLORS[color]
+    if color < 232:
+        color -= 16
+        levels = (0, 95, 135, 175, 215, 255)
+        return levels[color // 36], levels[color // 6 % 6], levels[color % 6]
+    gray = 8 + (color - 232) * 10
+    return gray, gray, gray
+
+
+def color_rgb(color: Color) -> Optional[Tuple[int, int, int]]:
+    """Return the RGB value of any parsed color, or None for the default"""
+    if color is None:
+        return None
+    if isinstance(color, tuple):
+        return color
+    return palette_rgb(color)
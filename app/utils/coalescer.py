@@ -0,0 +1,81 @@
+import threading
+from typing import Callable, Dict, List
+
+from app.utils.ansi import StyledLine, EMPTY_LINE
+
+DEFAULT_MAX_LINES = 1000
+DEFAULT_MAX_BYTES = 64 * 1024
+DEFAULT_LATENCY_MS = 50
+
+
+class _Batch:
+    __slots__ = ("lines", "partial", "size")
+
+    def __init__(self):
+        self.lines: List[StyledLine] = []
+        self.partial = EMPTY_LINE
+        self.size = 0
+
+
+class OutputCoalescer:
+    """Groups output lines per sink and releases them in bounded batches.
+
+    A batch is flushed by the producing thread as soon as it reaches the line
+    or byte threshold. Everything else is flushed by ``flush_all``, which the
+    owner calls from a single timer every ``latency_ms`` so no line waits
+    longer than that deadline. Each batch also carries the sink's latest
+    partial line, which replaces the previous one instead of accumulating.
+
+    Batches are handed to ``flush_callback`` while the lock is held, so they
+    leave in order whichever thread flushes them. The callback must only
+    hand the batch on, e.g. by emitting a queued signal, and must not call
+    back into the coalescer.
+    """
+
+    def __init__(
+        self,
+        flush_callback: Callable[[List[StyledLine], StyledLine, object], None],
+        max_lines: int = DEFAULT_MAX_LINES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        latency_ms: int = DEFAULT_LATENCY_MS,
+    ):
+        self.flush_callback = flush_callback
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.latency_ms = latency_ms
+        self._pending: Dict[object, _Batch] = {}
+        self._lock = threading.Lock()
+
+    def push(self, lines: List[StyledLine], partial: StyledLine, sink: object) -> None:
+        """Queue lines for a sink, flushing right away if the batch is full"""
+        with self._lock:
+            batch = self._pending.get(sink)
+            if batch is None:
+                batch = self._pending[sink] = _Batch()
+            batch.lines.extend(lines)
+            batch.partial = partial
+            batch.size += sum(len(line.text) + 1 for line in lines)
+
+            if len(batch.lines) < self.max_lines and batch.size < self.max_bytes:
+                return
+            del self._pending[sink]
+            self.flush_callback(batch.lines, batch.partial, sink)
+
+    def flush(self, sink: object) -> None:
+        """Flush whatever is pending for a single sink"""
+        with self._lock:
+            batch = self._pending.pop(sink, None)
+            if batch:
+                self.flush_callback(batch.lines, batch.partial, sink)
+
+    def flush_all(self) -> None:
+        """Flush every pending batch, called once per latency tick"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            for sink, batch in pending.items():
+                self.flush_callback(batch.lines, batch.partial, sink)
+
+    def discard(self, sink: object) -> None:
+        """Drop pending output for a sink that is going away"""
+        with self._lock:
+            self._pending.pop(sink, None)
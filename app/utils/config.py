@@ -1,64 +1,54 @@
-import json
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 from app.models.task import Task
+from app.utils.storage import JsonTaskStore, SqliteTaskStore
+from app.settings.settings import settings_service
 
 CONFIG_FILE = "commands.json"
 
 
 class ConfigManager:
-    def __init__(self):
+    def __init__(self, storage: Optional[str] = None):
         self.tasks: List[Task] = []
         self.groups: Dict[str, List[Task]] = {}
+        # Task ID -> task, for grouped and ungrouped tasks alike
+        self.task_index: Dict[str, Task] = {}
+        self.store = self.create_store(storage or self.configured_storage())
 
-    def save_config(self) -> None:
-        """Save current configuration to file"""
-        try:
-            config = {
-                "tasks": [
-                    {
-                        "id": task.id,
-                        "title": task.title,
-                        "path": task.path,
-                        "cmd": task.cmd,
-                    }
-                    for task in self.tasks
-                ],
-                "groups": {
-                    name: [
-                        {
-                            "id": task.id,
-                            "title": task.title,
-                            "path": task.path,
-                            "cmd": task.cmd,
-                        }
-                        for task in tasks
-                    ]
-                    for name, tasks in self.groups.items()
-                },
-            }
-
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(config, f, indent=4)
-
-            logging.info("Configuration saved successfully")
+    def configured_storage(self) -> str:
+        """Return the storage backend selected in the settings"""
+        return settings_service().current.storage
 
-        except Exception as e:
-            logging.error(f"Error saving configuration: {str(e)}")
+    def create_store(self, storage: str):
+        if storage == "sqlite":
+            try:
+                return SqliteTaskStore(json_path=CONFIG_FILE)
+            except Exception as e:
+                logging.error(f"Error opening task database: {str(e)}")
+        return JsonTaskStore(self.to_dict, CONFIG_FILE)
 
-    def load_config(self) -> None:
-        """Load configuration from file"""
-        try:
-            with open(CONFIG_FILE, "r") as f:
-                config = json.load(f)
+    def save_config(self) -> None:
+        """Save the whole configuration, replacing what the store holds"""
+        self.store.save_all(self.tasks, self.groups)
 
-            self.tasks = [Task(**task_data) for task_data in config.get("tasks", [])]
+    def close(self) -> None:
+        """Flush pending changes and release the store"""
+        self.store.close()
 
-            self.groups = {
-                name: [Task(**task_data) for task_data in tasks]
-                for name, tasks in config.get("groups", {}).items()
-            }
+    def to_dict(self) -> dict:
+        """Snapshot the configuration in its on-disk format"""
+        return {
+            "tasks": [task.to_dict() for task in self.tasks],
+            "groups": {
+                name: [task.to_dict() for task in tasks]
+                for name, tasks in self.groups.items()
+            },
+        }
 
+    def load_config(self) -> None:
+        """Load configuration from the store"""
+        try:
+            self.tasks, self.groups = self.store.load()
             logging.info("Configuration loaded successfully")
 
         except FileNotFoundError:
@@ -68,3 +58,58 @@ class ConfigManager:
             # Start with empty state on error
             self.tasks = []
             self.groups = {}
+
+        self.task_index = {task.id: task for task in self.tasks}
+        for tasks in self.groups.values():
+            self.task_index.update((task.id, task) for task in tasks)
+
+    def find_task(self, task_id: str) -> Optional[Task]:
+        """Find a task by ID among ungrouped and grouped tasks"""
+        return self.task_index.get(task_id)
+
+    def add_task(self, task: Task) -> None:
+        """Add an ungrouped task"""
+        self.tasks.append(task)
+        self.task_index[task.id] = task
+        self.store.add_task(task)
+
+    def update_task(self, task: Task) -> None:
+        """Persist changes made to a task's fields"""
+        self.store.update_task(task)
+
+    def delete_task(self, task: Task, group_name: str = None) -> None:
+        """Delete a task, dropping its group once the group is empty"""
+        if task in self.tasks:
+            self.tasks.remove(task)
+            group_name = None
+        elif group_name and task in self.groups.get(group_name, []):
+            self.groups[group_name].remove(task)
+            if not self.groups[group_name]:
+                self.delete_group(group_name)
+        else:
+            return
+        self.task_index.pop(task.id, None)
+        self.store.delete_task(task, group_name)
+
+    def create_group(self, name: str, tasks: List[Task]) -> None:
+        """Create a group out of ungrouped tasks"""
+        members = set(map(id, tasks))
+        self.tasks[:] = [task for task in self.tasks if id(task) not in members]
+        self.groups[name] = list(tasks)
+        self.store.create_group(name, tasks)
+
+    def rename_group(self, old_name: str, new_name: str) -> None:
+        self.groups[new_name] = self.groups.pop(old_name)
+        self.store.rename_group(old_name, new_name)
+
+    def delete_group(self, name: str) -> None:
+        """Delete a group, moving its tasks back to the ungrouped tasks"""
+        self.tasks.extend(self.groups.pop(name))
+        self.store.delete_group(name)
+
+    def add_to_group(self, name: str, task: Task) -> None:
+        """Move an ungrouped task to the end of a group"""
+        if task in self.tasks:
+            self.tasks.remove(task)
+        self.groups[name].append(task)
+        self.store.add_to_group(name, task)
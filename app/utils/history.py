@@ -0,0 +1,122 @@
+import json
+import logging
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from app.utils.persistence import write_atomic
+
+HISTORY_FILE = "command_history.jsonl"
+RECENCY_HALF_LIFE = 14 * 24 * 3600  # Seconds for a use to lose half its weight
+COMPACT_RATIO = 4  # Rewrite the file once it holds this many records per command
+
+
+class _Entry:
+    __slots__ = ("count", "last_used")
+
+    def __init__(self, count: int = 0, last_used: float = 0.0):
+        self.count = count
+        self.last_used = last_used
+
+
+class CommandHistory:
+    """Append-only log of entered commands, ranked by frequency and recency.
+
+    Each use appends one JSON line to the history file, so recording never
+    rewrites existing data. The file is read once and folded into per-command
+    counters; it is compacted to one line per command when it grows too
+    repetitive.
+    """
+
+    def __init__(self, path: str = HISTORY_FILE):
+        self.path = path
+        self.entries: Dict[str, _Entry] = {}
+        self.records = 0  # Lines in the history file
+        self.used = 0  # Commands with at least one recorded use
+        self._ranked: Optional[List[str]] = None
+        self.load()
+
+    def load(self) -> None:
+        """Fold the history file into per-command counters"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self._add(record["cmd"], record["count"], record["last"])
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Skip a line torn by a crash mid-append
+                    self.records += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Error loading command history: {str(e)}")
+
+    def seed(self, commands: Iterable[str]) -> None:
+        """Make known commands completable without recording a use"""
+        for command in commands:
+            if command and command not in self.entries:
+                self.entries[command] = _Entry()
+                self._ranked = None
+
+    def record(self, command: str) -> None:
+        """Count one use of a command and append it to the history file"""
+        command = command.strip()
+        if not command:
+            return
+
+        now = time.time()
+        self._add(command, 1, now)
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"cmd": command, "count": 1, "last": now}) + "\n")
+            self.records += 1
+            if self.records > COMPACT_RATIO * self.used + 100:
+                self.compact()
+        except OSError as e:
+            logging.error(f"Error saving command history: {str(e)}")
+
+    def compact(self) -> None:
+        """Rewrite the history file with a single line per command"""
+        used = {
+            command: entry for command, entry in self.entries.items() if entry.count
+        }
+        write_atomic(self.path, used, _dump_records)
+        self.records = len(used)
+
+    def ranked(self) -> List[str]:
+        """Return all commands, most frequently and recently used first"""
+        if self._ranked is None:
+            now = time.time()
+            self._ranked = sorted(
+                self.entries,
+                key=lambda command: self._score(self.entries[command], now),
+                reverse=True,
+            )
+        return self._ranked
+
+    def _score(self, entry: _Entry, now: float) -> tuple:
+        decay = 0.5 ** ((now - entry.last_used) / RECENCY_HALF_LIFE)
+        return entry.count * decay, entry.last_used
+
+    def _add(self, command: str, count: int, last_used: float) -> None:
+        entry = self.entries.get(command)
+        if entry is None:
+            entry = self.entries[command] = _Entry()
+        if not entry.count and count:
+            self.used += 1
+        entry.count += count
+        entry.last_used = max(entry.last_used, last_used)
+        self._ranked = None
+
+
+def _dump_records(used: Dict[str, _Entry], f) -> None:
+    for command, entry in used.items():
+        record = {"cmd": command, "count": entry.count, "last": entry.last_used}
+        f.write(json.dumps(record) + "\n")
+
+
+@lru_cache(maxsize=None)
+def command_history() -> CommandHistory:
+    """Return the process-wide command history, loading it on first use"""
+    return CommandHistory()
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import threading
+from contextlib import suppress
+from typing import Callable, Dict, List, Optional
+
+from app.utils.ansi import AnsiParser, EMPTY_LINE
+from app.utils.line_decoder import LineDecoder
+
+
+class ProcessHandle:
+    """Thread-safe view of a process whose pipes are served by the IOEngine"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, transport):
+        self._loop = loop
+        self._transport = transport
+        self._exited = threading.Event()
+        self.pid: int = transport.get_pid()
+        self.returncode: Optional[int] = None
+
+    def poll(self) -> Optional[int]:
+        """Return the exit code, or None while the process is still running"""
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Block until the process exits, like subprocess.Popen.wait"""
+        if not self._exited.wait(timeout):
+            raise subprocess.TimeoutExpired(str(self.pid), timeout)
+        return self.returncode
+
+    def terminate(self) -> None:
+        self._loop.call_soon_threadsafe(self._signal, "terminate")
+
+    def kill(self) -> None:
+        self._loop.call_soon_threadsafe(self._signal, "kill")
+
+    def _signal(self, method: str) -> None:
+        if self._transport.get_returncode() is None:
+            with suppress(ProcessLookupError):
+                getattr(self._transport, method)()
+
+    def _set_exited(self, returncode: Optional[int]) -> None:
+        self.returncode = returncode
+        self._exited.set()
+
+
+class _TaskProtocol(asyncio.SubprocessProtocol):
+    """Decodes a task's stdout and stderr into lines as chunks arrive"""
+
+    def __init__(self, engine: "IOEngine", task_id: str):
+        self.engine = engine
+        self.task_id = task_id
+        self.handle: Optional[ProcessHandle] = None
+        self.pid: Optional[int] = None  # Known before any output arrives
+        self.decoders: Dict[int, LineDecoder] = {1: LineDecoder(), 2: LineDecoder()}
+        self.partials: Dict[int, str] = {1: "", 2: ""}
+        self.parsers: Optional[Dict[int, AnsiParser]] = None
+        if engine.parse_ansi:
+            self.parsers = {1: AnsiParser(), 2: AnsiParser()}
+        self.exited = False
+
+    def connection_made(self, transport) -> None:
+        self.pid = transport.get_pid()
+
+    def pipe_data_received(self, fd: int, data: bytes) -> None:
+        lines, self.partials[fd] = self.decoders[fd].feed(data)
+        self._emit(fd, lines)
+
+    def pipe_connection_lost(self, fd: int, exc: Optional[Exception]) -> None:
+        decoder = self.decoders.pop(fd, None)
+        if decoder is not None:
+            lines, self.partials[fd] = decoder.feed(b"", final=True)
+            self._emit(fd, lines)
+        if not self.decoders:
+            self.engine.on_closed(self.task_id, self.pid)
+
+    def process_exited(self) -> None:
+        self.exited = True
+        if self.handle is not None:
+            self._notify_exit()
+
+    def _notify_exit(self) -> None:
+        transport = self.handle._transport
+        self.handle._set_exited(transport.get_returncode())
+        self.engine.on_exit(self.task_id, self.handle.pid, transport.get_returncode())
+
+    def _emit(self, fd: int, lines: List[str]) -> None:
+        # Show the partial line of whichever stream wrote last
+        partial_fd = fd if self.partials[fd] else 3 - fd
+        partial = self.partials[partial_fd]
+
+        if self.parsers is not None:
+            parser = self.parsers[fd]
+            lines = [parser.parse_line(line) for line in lines]
+            partial = (
+                self.parsers[partial_fd].peek_line(partial) if partial else EMPTY_LINE
+            )
+        self.engine.on_output(self.task_id, self.pid, lines, partial)
+
+
+class IOEngine:
+    """Runs every task's pipes on one asyncio event loop in a background thread.
+
+    All processes are multiplexed by the same loop, so the number of running
+    tasks no longer depends on the size of a thread pool, and exits are
+    reported through ``on_exit`` the moment the loop sees them. With ``parse_ansi``
+    lines are delivered as StyledLine, otherwise as raw decoded text. Every
+    callback gets the pid of the run, so output of an earlier run of a task
+    that is still being written by its children can be told apart.
+    """
+
+    def __init__(
+        self,
+        on_output: Callable[[str, int, list, object], None],
+        on_closed: Callable[[str, int], None],
+        on_exit: Callable[[str, int, int], None],
+        parse_ansi: bool = True,
+    ):
+        self.on_output = on_output
+        self.on_closed = on_closed
+        self.on_exit = on_exit
+        self.parse_ansi = parse_ansi
+        self.loop = asyncio.new_event_loop()
+        self._install_child_watcher()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="tasker-io", daemon=True
+        )
+        self._thread.start()
+
+    def start(self, task_id: str, args: list, cwd: str, **kwargs) -> ProcessHandle:
+        """Spawn a process on the loop and return a handle to it"""
+        future = asyncio.run_coroutine_threadsafe(
+            self._spawn(task_id, args, cwd, **kwargs), self.loop
+        )
+        return future.result()
+
+    def shutdown(self) -> None:
+        """Stop the event loop thread"""
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=2)
+
+    async def _spawn(self, task_id: str, args: list, cwd: str, **kwargs):
+        transport, protocol = await self.loop.subprocess_exec(
+            lambda: _TaskProtocol(self, task_id),
+            *args,
+            cwd=cwd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            **kwargs,
+        )
+        handle = ProcessHandle(self.loop, transport)
+        protocol.handle = handle
+        if protocol.exited:
+            # The process exited before the handle existed; report it after
+            # the caller has registered the handle
+            self.loop.call_soon(protocol._notify_exit)
+        return handle
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _install_child_watcher(self) -> None:
+        """Use pidfds on Linux so waiting for exits costs no thread per child"""
+        if sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+            return  # 3.12+ picks pidfds itself; Windows uses the proactor
+
+        try:
+            watcher = asyncio.PidfdChildWatcher()
+            asyncio.set_child_watcher(watcher)
+            watcher.attach_loop(self.loop)
+        except Exception as e:
+            logging.warning(f"Falling back to the default child watcher: {str(e)}")
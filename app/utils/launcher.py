@@ -0,0 +1,97 @@
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional
+
+from app.settings.settings import settings_service
+
+DEFAULT_SHELL = "/bin/sh"
+# Anything the shell would interpret keeps a command on the shell path
+SHELL_SYNTAX = re.compile(r"[|&;<>()$`*?\[\]{}~#!\n\\]")
+
+
+class LaunchSpec(NamedTuple):
+    """Arguments and process creation options that start a task"""
+
+    args: List[str]
+    options: Dict[str, object]
+
+
+class Launcher(ABC):
+    """Turns a task's command line into the process that runs it"""
+
+    @abstractmethod
+    def spec(self, cmd: str, cwd: Optional[str] = None) -> LaunchSpec:
+        """Return how to start a command in the directory ``cwd``"""
+
+
+class WindowsLauncher(Launcher):
+    """Runs commands through cmd.exe, each in a new process group"""
+
+    def spec(self, cmd: str, cwd: Optional[str] = None) -> LaunchSpec:
+        return LaunchSpec(
+            ["cmd", "/c", cmd],
+            {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP},
+        )
+
+
+class PosixLauncher(Launcher):
+    """Runs commands through a shell, or executes plain commands directly.
+
+    Every task starts in a session of its own, so its whole process group can
+    be signalled at once and it is detached from our controlling terminal.
+    CPython spawns children with vfork where it can, so a launch costs one
+    exec, plus one more for the shell unless ``direct_exec`` applies.
+    """
+
+    def __init__(self, shell: str = "", direct_exec: bool = False):
+        self.shell = shell or DEFAULT_SHELL
+        self.direct_exec = direct_exec
+
+    def spec(self, cmd: str, cwd: Optional[str] = None) -> LaunchSpec:
+        args = self.argv(cmd, cwd) if self.direct_exec else None
+        if args is None:
+            args = [self.shell, "-c", cmd]
+        return LaunchSpec(args, {"start_new_session": True})
+
+    def argv(self, cmd: str, cwd: Optional[str] = None):
+        """Split a plain command into argv, or return None if it needs a shell"""
+        if SHELL_SYNTAX.search(cmd):
+            return None
+        try:
+            args = shlex.split(cmd)
+        except ValueError:
+            return None
+        # Variable assignments and builtins such as cd only exist in a shell
+        if not args or "=" in args[0] or not self.executable(args[0], cwd):
+            return None
+        return args
+
+    @staticmethod
+    def executable(name: str, cwd: Optional[str] = None) -> bool:
+        """Whether exec would find a program as the task sees it from ``cwd``"""
+        cwd = cwd or os.getcwd()
+        if os.sep in name:
+            path = os.path.join(cwd, name)
+            return os.path.isfile(path) and os.access(path, os.X_OK)
+        # Relative PATH entries, and empty ones, are relative to the task too
+        search = os.environ.get("PATH", os.defpath).split(os.pathsep)
+        path = os.pathsep.join(os.path.join(cwd, entry) for entry in search)
+        return shutil.which(name, path=path) is not None
+
+
+def create_launcher(shell: str = "", direct_exec: bool = False) -> Launcher:
+    """Return the launcher for this platform"""
+    if sys.platform == "win32":
+        return WindowsLauncher()
+    return PosixLauncher(shell, direct_exec)
+
+
+def configured_launcher() -> Launcher:
+    """Return the launcher selected in the settings"""
+    settings = settings_service().current
+    return create_launcher(settings.shell, settings.direct_exec)
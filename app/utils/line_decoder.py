@@ -0,0 +1,52 @@
+import codecs
+from typing import List, Tuple
+
+# A partial line longer than this is emitted as a line of its own, so output
+# without newlines is not re-decoded and re-parsed in full on every chunk
+MAX_PARTIAL_CHARS = 64 * 1024
+
+
+def collapse_carriage_returns(text: str) -> str:
+    """Keep only what a terminal would show after in-place \\r rewrites"""
+    if "\r" not in text:
+        return text
+    for segment in reversed(text.split("\r")):
+        if segment:
+            return segment
+    return ""
+
+
+class LineDecoder:
+    """Turns raw byte chunks into complete lines plus the live partial line.
+
+    Bytes are decoded incrementally, so multi-byte characters split across
+    chunks survive, and carriage-return progress updates collapse in place
+    instead of waiting for a newline. A partial line that grows past
+    ``max_partial`` characters is returned as a complete line.
+    """
+
+    def __init__(self, encoding: str = "utf-8", max_partial: int = MAX_PARTIAL_CHARS):
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._partial = ""
+        self.max_partial = max_partial
+
+    def feed(self, data: bytes, final: bool = False) -> Tuple[List[str], str]:
+        """Decode a chunk and return (complete lines, current partial line)"""
+        text = self._partial + self._decoder.decode(data, final)
+        *lines, partial = text.split("\n")
+        lines = [collapse_carriage_returns(line) for line in lines]
+
+        if final:
+            if partial:
+                lines.append(collapse_carriage_returns(partial))
+            self._partial = ""
+            return lines, ""
+
+        # Keep a trailing \r so the next chunk overwrites instead of appending
+        visible = collapse_carriage_returns(partial)
+        if len(visible) > self.max_partial:
+            lines.append(visible)
+            self._partial = ""
+            return lines, ""
+        self._partial = visible + "\r" if partial.endswith("\r") else visible
+        return lines, visible
@@ -0,0 +1,196 @@
+import re
+import time
+from typing import Dict, List, Optional, Tuple, Type
+
+from app.utils.ansi import BOLD, EMPTY_LINE, Style, StyledLine
+
+ERROR_STYLE: Style = ((205, 49, 49), None, BOLD)
+WARNING_STYLE: Style = ((215, 130, 0), None, 0)
+NOTE_STYLE: Style = (8, None, 0)  # Bright black, a gray in every palette
+
+# Level words in any case, and exception class names such as ValueError
+LEVELS = re.compile(
+    r"\b(?:(ERROR|FATAL|CRITICAL|PANIC|Traceback|(?-i:\w+(?:Error|Exception)))"
+    r"|(WARN|WARNING))\b",
+    re.IGNORECASE,
+)
+
+
+class LineStage:
+    """One step of a task's line pipeline, run on the thread reading output.
+
+    ``process`` gets each batch of complete lines and returns the lines to
+    pass on. ``partial`` does the same for the live partial line, and
+    ``finish`` returns whatever the stage still holds when the pipes close.
+    """
+
+    def process(self, lines: List[StyledLine]) -> List[StyledLine]:
+        return lines
+
+    def partial(self, line: StyledLine) -> StyledLine:
+        return line
+
+    def finish(self) -> List[StyledLine]:
+        return []
+
+
+class IncludeFilter(LineStage):
+    """Keeps only the lines matching a regex"""
+
+    def __init__(self, pattern: str):
+        self.search = compile_pattern(pattern).search
+
+    def process(self, lines):
+        search = self.search
+        return [line for line in lines if search(line.text)]
+
+    def partial(self, line):
+        return line if self.search(line.text) else EMPTY_LINE
+
+
+class ExcludeFilter(IncludeFilter):
+    """Drops the lines matching a regex"""
+
+    def process(self, lines):
+        search = self.search
+        return [line for line in lines if not search(line.text)]
+
+    def partial(self, line):
+        return EMPTY_LINE if self.search(line.text) else line
+
+
+class Deduplicator(LineStage):
+    """Collapses repeats of a line into a count shown after the first one.
+
+    While repeats keep coming the count is shown as the partial line, and
+    it becomes a line of its own once a different line arrives.
+    """
+
+    def __init__(self):
+        self.last: Optional[str] = None
+        self.repeats = 0
+
+    def process(self, lines):
+        kept = []
+        for line in lines:
+            if line.text == self.last:
+                self.repeats += 1
+                continue
+            if self.repeats:
+                kept.append(self._count_line())
+            kept.append(line)
+            self.last = line.text
+            self.repeats = 0
+        return kept
+
+    def partial(self, line):
+        return line if line.text or not self.repeats else self._count_line()
+
+    def finish(self):
+        lines = [self._count_line()] if self.repeats else []
+        self.repeats = 0
+        return lines
+
+    def _count_line(self) -> StyledLine:
+        text = f"  (repeated {self.repeats} more time{'s' * (self.repeats > 1)})"
+        return StyledLine(text, ((0, len(text), NOTE_STYLE),))
+
+
+class LevelHighlighter(LineStage):
+    """Colors lines that report an error or a warning, unless already styled"""
+
+    def process(self, lines):
+        return [self.partial(line) for line in lines]
+
+    def partial(self, line):
+        if line.spans or not line.text:
+            return line
+        match = LEVELS.search(line.text)
+        if match is None:
+            return line
+        style = ERROR_STYLE if match.group(1) else WARNING_STYLE
+        return StyledLine(line.text, ((0, len(line.text), style),))
+
+
+class TimestampPrefixer(LineStage):
+    """Prefixes lines with the time they were read"""
+
+    def process(self, lines):
+        prefix = self._prefix()
+        return [self._stamp(prefix, line) for line in lines]
+
+    def partial(self, line):
+        return self._stamp(self._prefix(), line) if line.text else line
+
+    @staticmethod
+    def _prefix() -> str:
+        now = time.time()
+        milliseconds = int(now * 1000) % 1000
+        return f"{time.strftime('%H:%M:%S', time.localtime(now))}.{milliseconds:03d} "
+
+    @staticmethod
+    def _stamp(prefix: str, line: StyledLine) -> StyledLine:
+        shift = len(prefix)
+        spans = ((0, shift, NOTE_STYLE),) + tuple(
+            (start + shift, length, style) for start, length, style in line.spans
+        )
+        return StyledLine(prefix + line.text, spans)
+
+
+# Stage name -> (class, whether it takes a pattern), in the order offered
+STAGES: Dict[str, Tuple[Type[LineStage], bool]] = {
+    "include": (IncludeFilter, True),
+    "exclude": (ExcludeFilter, True),
+    "dedup": (Deduplicator, False),
+    "levels": (LevelHighlighter, False),
+    "timestamps": (TimestampPrefixer, False),
+}
+
+
+def compile_pattern(pattern: str) -> re.Pattern:
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid pattern {pattern!r}: {str(e)}")
+
+
+class LinePipeline:
+    """A task's chain of line stages, applied in the configured order"""
+
+    def __init__(self, stages: List[LineStage]):
+        self.stages = stages
+
+    @classmethod
+    def build(cls, config: List[dict]) -> Optional["LinePipeline"]:
+        """Build the stages of a task's ``output_stages``, None if there are none.
+
+        Each entry names a stage, like {"stage": "include", "pattern": "GET"}.
+        Raises ValueError for an unknown stage or an invalid pattern.
+        """
+        stages = []
+        for entry in config:
+            name = entry.get("stage")
+            if name not in STAGES:
+                raise ValueError(f"Unknown output stage {name!r}")
+            stage_class, takes_pattern = STAGES[name]
+            if takes_pattern:
+                stages.append(stage_class(entry.get("pattern") or ""))
+            else:
+                stages.append(stage_class())
+        return cls(stages) if stages else None
+
+    def process(
+        self, lines: List[StyledLine], partial: StyledLine
+    ) -> Tuple[List[StyledLine], StyledLine]:
+        for stage in self.stages:
+            if lines:
+                lines = stage.process(lines)
+            partial = stage.partial(partial)
+        return lines, partial
+
+    def finish(self) -> List[StyledLine]:
+        """Return the lines the stages still hold, run through the later stages"""
+        lines = []
+        for stage in self.stages:
+            lines = (stage.process(lines) if lines else []) + stage.finish()
+        return lines
@@ -0,0 +1,123 @@
+import gzip
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+from collections import OrderedDict
+from typing import List, Optional
+
+BLOCK_SIZE = 1 << 16  # Bytes per index checkpoint
+CACHED_BLOCKS = 64  # Blocks whose line offsets are kept after a lookup
+
+
+class LogFile:
+    """Random access to the lines of a log of any size through mmap.
+
+    Opening a file records how many newlines precede each 64 KB block,
+    counted at memory speed, so the index takes 128 bytes per megabyte. The
+    offsets of the lines inside a block are found the first time one of
+    them is read and cached for a few blocks, which makes any line reachable
+    without reading the file into memory. Compressed logs are unpacked to
+    a temporary file first.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._temp: Optional[str] = None
+        if path.endswith(".gz"):
+            fd, self._temp = tempfile.mkstemp(suffix=".log", prefix="tasker-")
+            with os.fdopen(fd, "wb") as dst, gzip.open(path, "rb") as src:
+                shutil.copyfileobj(src, dst, BLOCK_SIZE)
+
+        self.file = open(self._temp or path, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.map = None
+        if self.size:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Newlines before the start of each block, plus the total at the end
+        self.newlines_before = array("q", [0])
+        for start in range(0, self.size, BLOCK_SIZE):
+            count = self.map[start : start + BLOCK_SIZE].count(b"\n")
+            self.newlines_before.append(self.newlines_before[-1] + count)
+        newlines = self.newlines_before[-1]
+        # A last line without a newline still counts
+        unterminated = self.size and self.map[self.size - 1] != ord("\n")
+        self.line_count = newlines + 1 if unterminated else newlines
+        self._blocks: "OrderedDict[int, array]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return self.line_count
+
+    def __enter__(self) -> "LogFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def line(self, number: int) -> str:
+        """Return a line by its zero-based number, without the newline"""
+        return self.lines(number, 1)[0] if 0 <= number < self.line_count else ""
+
+    def lines(self, first: int, count: int) -> List[str]:
+        """Return up to count lines starting at line number first"""
+        last = min(first + count, self.line_count)
+        if first >= last:
+            return []
+        start = self.offset(first)
+        lines = []
+        for _ in range(last - first):
+            end = self.map.find(b"\n", start)
+            if end < 0:
+                end = self.size
+            lines.append(self.map[start:end].decode("utf-8", "replace"))
+            start = end + 1
+        return lines
+
+    def offset(self, number: int) -> int:
+        """Return the byte offset where a line starts"""
+        if number <= 0:
+            return 0
+        # Line n starts right after the n-th newline; find the block holding it
+        low, high = 0, len(self.newlines_before) - 2
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.newlines_before[middle] < number:
+                low = middle
+            else:
+                high = middle - 1
+        ends = self._line_ends(low)
+        return ends[number - self.newlines_before[low] - 1] + 1
+
+    def close(self) -> None:
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+        if self._temp:
+            os.remove(self._temp)
+            self._temp = None
+
+    def _line_ends(self, block: int) -> array:
+        """Return the offsets of the newlines in a block"""
+        ends = self._blocks.get(block)
+        if ends is not None:
+            self._blocks.move_to_end(block)
+            return ends
+
+        ends = array("q")
+        position = block * BLOCK_SIZE
+        stop = min(position + BLOCK_SIZE, self.size)
+        find = self.map.find
+        while True:
+            position = find(b"\n", position, stop)
+            if position < 0:
+                break
+            ends.append(position)
+            position += 1
+
+        self._blocks[block] = ends
+        if len(self._blocks) > CACHED_BLOCKS:
+            self._blocks.popitem(last=False)
+        return ends
@@ -0,0 +1,161 @@
+import atexit
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+from typing import IO, Callable, Optional
+
+DEFAULT_DELAY = 0.5  # Seconds to wait for further changes before writing
+
+Dump = Callable[[object, IO], None]
+
+# Read once at import: os.umask can only be read by setting it, which would
+# race with files other threads create
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+def dump_json(data, f: IO) -> None:
+    json.dump(data, f, indent=4)
+
+
+def write_atomic(path: str, data, dump: Dump = dump_json) -> None:
+    """Write a file through a temp file and rename it over the target.
+
+    Readers either see the old file or the complete new one, never a
+    half-written file, even if the process dies mid-write. The new file
+    keeps the mode of the one it replaces, or gets the umask default.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def _file_mode(path: str) -> int:
+    """Return the permission bits of an existing file, else the umask default"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _fsync_directory(directory: str) -> None:
+    """Make a rename in a directory durable, where directories can be opened"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class DebouncedWriter:
+    """Writes the latest submitted snapshot of a file on a background thread.
+
+    Snapshots submitted within ``delay`` seconds of each other replace one
+    another, so a burst of changes results in a single write. Pending data is
+    flushed on ``flush``/``close`` and when the interpreter exits.
+    """
+
+    def __init__(self, path: str, delay: float = DEFAULT_DELAY, dump: Dump = dump_json):
+        self.path = path
+        self.delay = delay
+        self.dump = dump
+        self._pending = None
+        self._has_pending = False
+        self._deadline = 0.0
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, data) -> None:
+        """Queue a snapshot to be written once changes settle"""
+        with self._condition:
+            self._pending = data
+            self._has_pending = True
+            self._deadline = time.monotonic() + self.delay
+            closed = self._closed
+            if not closed:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="config-writer", daemon=True
+                    )
+                    self._thread.start()
+                    atexit.register(self.close)
+                self._condition.notify()
+
+        # Once closed there is no writer thread, so write right away
+        if closed:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write any pending snapshot right away on the calling thread"""
+        # Taking and writing under one lock keeps an older snapshot from
+        # landing after a newer one
+        with self._write_lock:
+            with self._condition:
+                data, has_pending = self._take()
+            if has_pending:
+                self._write(data)
+
+    @property
+    def pending(self) -> bool:
+        """Whether a submitted snapshot has not been written out yet"""
+        return self._has_pending or self._write_lock.locked()
+
+    def close(self) -> None:
+        """Flush pending data and stop the writer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self.flush()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _take(self):
+        data, has_pending = self._pending, self._has_pending
+        self._pending = None
+        self._has_pending = False
+        return data, has_pending
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._has_pending:
+                        remaining = self._deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                if self._closed:
+                    return
+            self.flush()
+
+    def _write(self, data) -> None:
+        try:
+            write_atomic(self.path, data, self.dump)
+            logging.info(f"Saved {self.path}")
+        except Exception as e:
+            logging.error(f"Error saving {self.path}: {str(e)}")
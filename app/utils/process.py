@@ -1,29 +1,148 @@
-import subprocess
 import logging
-import psutil
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Optional
+from concurrent.futures import Future
+from typing import Dict, List, Optional
 
-from PyQt6.QtWidgets import QTextEdit
-from PyQt6.QtCore import pyqtSignal, QObject
-from ansi2html import Ansi2HTMLConverter
+from PyQt6.QtCore import pyqtSignal, QObject, Qt, QTimer
 
+from app.daemon.client import DaemonEngine
+from app.daemon.protocol import BACKLOG_LINES
 from app.models.task import Task
+from app.settings.settings import settings_service
+from app.ui.output_console import OutputConsole
+from app.utils.ansi import EMPTY_LINE, StyledLine
+from app.utils.coalescer import OutputCoalescer
+from app.utils.io_engine import IOEngine, ProcessHandle
+from app.utils.launcher import configured_launcher
+from app.utils.line_pipeline import LinePipeline
+from app.utils.run_log import configured_writer
+from app.utils.scheduler import ReadinessWatcher, ReadyCondition
+from app.utils.search_index import OutputIndex
+from app.utils.stopper import ProcessStopper
+from app.utils.telemetry import SAMPLE_INTERVAL_MS, TelemetryRing, TelemetrySampler
 
-conv = Ansi2HTMLConverter()
+
+class RunOutput:
+    """Where the output of one run of a task goes, read on the I/O thread"""
+
+    def __init__(
+        self, task_id: str, sink: OutputConsole, pipeline: Optional[LinePipeline]
+    ):
+        self.task_id = task_id
+        self.sink: Optional[OutputConsole] = sink  # None once nobody shows it
+        self.pipeline = pipeline
+        self.pid: Optional[int] = None  # Set once spawned
 
 
 class ProcessManager(QObject):
-    output_received = pyqtSignal(str, QTextEdit)  # Signal for UI updates
+    # Signal for UI updates
+    output_received = pyqtSignal(list, StyledLine, OutputConsole)
+    # Emitted with the task id and exit code as soon as a task's process exits
+    task_finished = pyqtSignal(str, int)
+    # Emitted with the task id when a watched readiness condition is met
+    task_ready = pyqtSignal(str)
+    # Emitted with a message once the daemon cannot be reached any more
+    daemon_lost = pyqtSignal(str)
+    # Emitted with the ids of the tasks that got a new telemetry sample
+    telemetry_updated = pyqtSignal(list)
+    # Carries samples from the telemetry thread to the GUI thread
+    _samples_taken = pyqtSignal(dict)
+    # Carries exit notifications from the I/O thread to the GUI thread
+    _process_exited = pyqtSignal(str, int, int)
 
-    def __init__(self):
+    def __init__(self, use_daemon: bool = False):
         super().__init__()
-        self.running_tasks: Dict[str, subprocess.Popen] = {}
-        self.executor = ThreadPoolExecutor(max_workers=10)  # Limit concurrent tasks
-        self.output_received.connect(self.update_output)  # Connect signal to UI slot
+        self.running_tasks: Dict[str, ProcessHandle] = {}
+        # Task ID -> output of its latest run
+        self.outputs: Dict[str, RunOutput] = {}
+        # Pid -> run whose pipes are still open, only used on the I/O thread.
+        # Children of an earlier run may still write after the task was
+        # started again, and their output must not reach the new run.
+        self.open_runs: Dict[int, RunOutput] = {}
+        # Queued even when emitted on the GUI thread, so batches flushed by the
+        # timer cannot overtake batches the reader threads flushed before
+        self.output_received.connect(
+            self.update_output, Qt.ConnectionType.QueuedConnection
+        )
+
+        # Output is batched per console; one timer enforces the latency deadline
+        self.coalescer = OutputCoalescer(self.output_received.emit)
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(self.coalescer.latency_ms)
+        self.flush_timer.timeout.connect(self.coalescer.flush_all)
+
+        # A single event loop thread serves the pipes of every task, either here
+        # or in the daemon so tasks outlive the window
+        self.io_engine = None
+        if use_daemon:
+            try:
+                self.io_engine = DaemonEngine(
+                    self._on_output,
+                    self._on_closed,
+                    self._on_exit,
+                    self.daemon_lost.emit,
+                )
+            except Exception as e:
+                logging.error(f"Running tasks in-process, no daemon: {str(e)}")
+        if self.io_engine is None:
+            self.io_engine = IOEngine(self._on_output, self._on_closed, self._on_exit)
+        self.daemon = isinstance(self.io_engine, DaemonEngine)
+        self._process_exited.connect(self._handle_exit)
+        # The daemon logs the runs it owns, so logs do not depend on the window
+        self.run_logs = None if self.daemon else configured_writer()
+        # Output of every console is indexed for search on a thread of its own
+        self.search_index = OutputIndex(
+            settings_service().current.search_index_mb << 20
+        )
+
+        # Output and port conditions are checked off the GUI thread
+        self.readiness = ReadinessWatcher(self.task_ready.emit)
+        # Process trees are stopped on worker threads
+        self.stopper = ProcessStopper()
+
+        # Resource usage of running tasks is sampled on a worker thread, one
+        # pass over the process table per tick for all tasks together
+        self.telemetry: Dict[str, TelemetryRing] = {}
+        self.sampler = TelemetrySampler(self._samples_taken.emit)
+        self._samples_taken.connect(self._store_samples)
+        self.telemetry_timer = QTimer(self)
+        self.telemetry_timer.setInterval(SAMPLE_INTERVAL_MS)
+        self.telemetry_timer.timeout.connect(self.sample_telemetry)
+
+    def remote_tasks(self) -> Dict[str, dict]:
+        """Return the tasks the daemon knows about, running or finished"""
+        if not self.daemon:
+            return {}
+        try:
+            return self.io_engine.status()
+        except Exception as e:
+            logging.error(f"Error querying the daemon: {str(e)}")
+            return {}
+
+    def attach_task(
+        self, task: Task, output_widget: OutputConsole, status: dict
+    ) -> None:
+        """Show the output of a task the daemon kept running for us"""
+        run = self.new_run(task, output_widget)
+        run.pid = status["pid"]
+        if status["returncode"] is None:
+            self.running_tasks[task.id] = self.io_engine.attach(task.id, status["pid"])
+            self._start_timers()
+
+    def listen(self) -> None:
+        """Start receiving daemon events, replaying the output kept so far"""
+        if self.daemon:
+            self.io_engine.listen(BACKLOG_LINES)
+
+    def start_task(
+        self,
+        task: Task,
+        output_widget: OutputConsole,
+        ready: Optional[ReadyCondition] = None,
+    ) -> bool:
+        """Start a new task with its output served by the I/O engine.
 
-    def start_task(self, task: Task, output_widget: QTextEdit) -> bool:
-        """Start a new task in a separate thread."""
+        With ``ready``, task_ready is emitted once the task meets the condition.
+        """
         if task.id in self.running_tasks:
             if self.check_task_status(task.id) is not None:
                 self.cleanup_task(task.id)
@@ -34,82 +153,166 @@ class ProcessManager(QObject):
         logging.info(f"Starting task in {task.path} with command: {task.cmd}")
 
         try:
-            process = subprocess.Popen(
-                ["cmd", "/c", task.cmd],
-                cwd=task.path,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
-                shell=False,  # Avoid unnecessary shell overhead
-            )
+            run = self.new_run(task, output_widget)
+            if ready is not None:
+                # Watch before spawning so the very first line can match
+                self.readiness.watch(task.id, ready)
+            args, options = configured_launcher().spec(task.cmd, task.path)
+            log = settings_service().current.run_logs
+            if self.daemon:
+                options.update(title=task.title, log=log)
+            elif log:
+                self.run_logs.open(task.id, run)
+            process = self.io_engine.start(task.id, args, cwd=task.path, **options)
+            run.pid = process.pid
 
             self.running_tasks[task.id] = process
-
-            # Run output streaming in background threads
-            self.executor.submit(self._stream_output, process.stdout, output_widget)
-            self.executor.submit(self._stream_output, process.stderr, output_widget)
+            self.telemetry[task.id] = TelemetryRing()  # Each run gets a fresh history
+            self._start_timers()
 
             return True
 
         except Exception as e:
             logging.error(f"Error running {task.title}: {str(e)}")
+            self.readiness.cancel(task.id)
+            if self.run_logs is not None:
+                self.run_logs.close(run)
             return False
 
-    def _stream_output(self, stream, output_widget):
-        """Reads process output in real-time and updates UI in batches."""
-        batch_size = 5
-        output_buffer = []
+    def new_run(self, task: Task, output_widget: OutputConsole) -> RunOutput:
+        """Route the next run of a task to a console, with fresh line stages"""
+        try:
+            pipeline = LinePipeline.build(task.output_stages)
+        except ValueError as e:
+            logging.error(f"Showing output of {task.title} unprocessed: {str(e)}")
+            pipeline = None
+        previous = self.outputs.get(task.id)
+        if previous is not None:
+            previous.sink = None  # Late output of the last run is only logged
+        run = self.outputs[task.id] = RunOutput(task.id, output_widget, pipeline)
+        return run
 
-        for line in iter(stream.readline, b""):
-            decoded_line = line.decode("utf-8", errors="replace").strip()
-            html_output = conv.convert(decoded_line)
-            output_buffer.append(html_output)
+    def _start_timers(self) -> None:
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+        if not self.telemetry_timer.isActive():
+            self.telemetry_timer.start()
 
-            if len(output_buffer) >= batch_size:
-                self.output_received.emit("".join(output_buffer), output_widget)
-                output_buffer.clear()
+    def sample_telemetry(self) -> None:
+        """Ask the sampler for a new sample of every running task"""
+        self.sampler.request(
+            {task_id: process.pid for task_id, process in self.running_tasks.items()}
+        )
 
-        # Send remaining output
-        if output_buffer:
-            self.output_received.emit("".join(output_buffer), output_widget)
+    def _store_samples(self, samples: dict) -> None:
+        # Samples of tasks that exited while the pass ran are dropped
+        updated = [task_id for task_id in samples if task_id in self.running_tasks]
+        for task_id in updated:
+            self.telemetry.setdefault(task_id, TelemetryRing()).append(samples[task_id])
+        if updated:
+            self.telemetry_updated.emit(updated)
 
-    def stop_task(self, task_id: str) -> None:
-        """Ensure full process termination, including child processes."""
-        if task_id not in self.running_tasks:
-            logging.warning(f"Task {task_id} not found in running tasks")
-            raise ValueError(f"Task {task_id} not found in running tasks")
+    def _run_of(self, task_id: str, pid: int) -> Optional[RunOutput]:
+        """Return the run a pid belongs to, called on the I/O thread"""
+        run = self.open_runs.get(pid)
+        if run is None:
+            # The first event of a run, which can come before start_task
+            # has learned its pid
+            run = self.outputs.get(task_id)
+            if run is None or run.pid not in (None, pid):
+                return None
+            run.pid = pid
+            self.open_runs[pid] = run
+        return run
 
-        process = self.running_tasks[task_id]
-        logging.info(f"Attempting to terminate task {task_id}")
+    def _on_output(
+        self, task_id: str, pid: int, lines: list, partial: StyledLine
+    ) -> None:
+        """Called on the I/O thread for every chunk a task prints."""
+        run = self._run_of(task_id, pid)
+        if run is None:
+            return
+        if run is self.outputs.get(task_id):
+            self.readiness.feed(task_id, (line.text for line in lines))
+        if self.run_logs is not None:
+            self.run_logs.write(run, (line.text for line in lines))
+        output_widget = run.sink
+        if output_widget is not None:
+            pipeline = run.pipeline
+            if pipeline is not None:
+                # Readiness and logs see every line, the console what is left
+                lines, partial = pipeline.process(lines, partial)
+            self.search_index.add(output_widget, (line.text for line in lines))
+            self.coalescer.push(lines, partial, output_widget)
 
-        try:
-            parent = psutil.Process(process.pid)
-            children = parent.children(recursive=True)
+    def _on_closed(self, task_id: str, pid: int) -> None:
+        """Called on the I/O thread once both pipes of a run are closed."""
+        run = self._run_of(task_id, pid)
+        self.open_runs.pop(pid, None)
+        if run is None:
+            return
+        # Children may keep writing after the task exits, so the log ends here
+        if self.run_logs is not None:
+            self.run_logs.close(run)
+        output_widget = run.sink
+        if output_widget is not None:
+            pipeline = run.pipeline
+            lines = pipeline.finish() if pipeline is not None else []
+            if lines:
+                self.search_index.add(output_widget, (line.text for line in lines))
+                self.coalescer.push(lines, EMPTY_LINE, output_widget)
+            self.coalescer.flush(output_widget)
 
-            for child in children:
-                logging.info(f"Terminating child process {child.pid}")
-                child.terminate()
+    def _on_exit(self, task_id: str, pid: int, returncode: int) -> None:
+        """Called on the I/O thread when a task's process exits."""
+        self._process_exited.emit(task_id, pid, returncode)
 
-            process.terminate()
-            process.wait(timeout=2)
+    def _handle_exit(self, task_id: str, pid: int, returncode: int) -> None:
+        """Forget an exited task, unless it was already stopped or restarted."""
+        process = self.running_tasks.get(task_id)
+        if process is None or process.pid != pid:
+            return
 
-            # Ensure all processes are fully stopped
-            for child in children:
-                if child.is_running():
-                    logging.warning(f"Force killing child process {child.pid}")
-                    child.kill()
+        self.cleanup_task(task_id)
+        logging.info(f"Task {task_id} exited with code {returncode}")
+        self.task_finished.emit(task_id, returncode)
 
-            if parent.is_running():
-                logging.warning(f"Force killing parent process {parent.pid}")
-                parent.kill()
+    def release_output(self, task_id: str) -> None:
+        """Stop routing output of a task to its console."""
+        run = self.outputs.get(task_id)
+        if run is not None and run.sink is not None:
+            output_widget, run.sink = run.sink, None
+            self.coalescer.discard(output_widget)
+        if task_id not in self.running_tasks:
+            self.telemetry.pop(task_id, None)
+            self.outputs.pop(task_id, None)
+        if self.daemon and task_id not in self.running_tasks:
+            # Nobody is looking at the finished run any more
+            try:
+                self.io_engine.forget(task_id)
+            except Exception as e:
+                logging.error(f"Error releasing task {task_id} in daemon: {str(e)}")
 
-            logging.info(f"Task {task_id} terminated successfully")
+    def stop_task(self, task_id: str) -> Future:
+        """Stop a task and all of its child processes in the background.
 
-        except Exception as e:
-            logging.error(f"Error terminating process {task_id}: {str(e)}")
+        The task is forgotten once its exit is reported, like any other exit.
+        """
+        if task_id not in self.running_tasks:
+            logging.warning(f"Task {task_id} not found in running tasks")
+            raise ValueError(f"Task {task_id} not found in running tasks")
+        return self.stop_tasks([task_id])
+
+    def stop_all(self) -> Future:
+        """Stop every running task in parallel"""
+        return self.stop_tasks(list(self.running_tasks))
 
-        finally:
-            self.cleanup_task(task_id)
+    def stop_tasks(self, task_ids: List[str]) -> Future:
+        """Stop several tasks together, in about one grace period overall"""
+        handles = [self.running_tasks[task_id] for task_id in task_ids]
+        logging.info(f"Stopping tasks {', '.join(task_ids)}")
+        grace_period = settings_service().current.stop_grace_ms / 1000
+        return self.stopper.stop(handles, grace_period)
 
     def check_task_status(self, task_id: str) -> Optional[int]:
         """Check if a task is still running."""
@@ -122,8 +325,21 @@ class ProcessManager(QObject):
     def cleanup_task(self, task_id: str) -> None:
         """Remove task from tracking."""
         self.running_tasks.pop(task_id, None)
+        self.readiness.cancel(task_id)
+        if not self.running_tasks:
+            # Pipes flush their own tail on close, so the deadline timer can rest
+            self.coalescer.flush_all()
+            self.flush_timer.stop()
+            self.telemetry_timer.stop()
         logging.info(f"Cleaned up task {task_id}")
 
-    def update_output(self, html_output: str, output_widget: QTextEdit):
-        """Update the UI with new output."""
-        output_widget.setHtml(f"{output_widget.toHtml()}<div>{html_output}</div>")
+    def close(self) -> None:
+        """Write out the logs of every run before exiting"""
+        if self.run_logs is not None:
+            self.run_logs.shutdown()
+
+    def update_output(
+        self, lines: list, partial: StyledLine, output_widget: OutputConsole
+    ):
+        """Append new output to the UI without re-rendering existing content."""
+        output_widget.append_lines(lines, partial)
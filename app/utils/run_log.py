@@ -0,0 +1,234 @@
+import gzip
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+from app.settings.settings import settings_service
+
+LOG_DIR = os.path.join(os.path.expanduser("~"), ".tasker", "logs")
+WRITE_BUFFER = 1 << 20
+FLUSH_INTERVAL = 0.5  # Seconds before written output is visible in the file
+
+# <run>.log is the segment being written, <run>.<n>.log[.gz] are rotated out
+SEGMENT_NAME = re.compile(
+    r"^(?P<run>\d{8}-\d{6}(?:-\d+)?)(?:\.(?P<n>\d+))?\.log(?:\.gz)?$"
+)
+
+
+def task_log_dir(task_id: str, log_dir: str = LOG_DIR) -> str:
+    return os.path.join(log_dir, task_id)
+
+
+def compress(path: str) -> None:
+    """Replace a log file by its gzip-compressed copy"""
+    try:
+        with open(path, "rb") as src, gzip.open(path + ".gz", "wb", 6) as dst:
+            shutil.copyfileobj(src, dst, WRITE_BUFFER)
+        os.remove(path)
+    except OSError as e:
+        logging.error(f"Error compressing {path}: {str(e)}")
+
+
+def remove_log(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError as e:
+        logging.error(f"Error removing old log {path}: {str(e)}")
+
+
+def run_order(run: str) -> tuple:
+    """Sort key of run names, which carry a counter if started in the same second"""
+    day, clock, *counter = run.split("-")
+    return day, clock, int(counter[0]) if counter else 1
+
+
+def list_runs(task_id: str, log_dir: str = LOG_DIR) -> Dict[str, List[str]]:
+    """Return the segment files of each logged run of a task, newest run first.
+
+    Segments are listed oldest first; the last one holds the end of the run.
+    """
+    runs: Dict[str, List[tuple]] = {}
+    try:
+        names = os.listdir(task_log_dir(task_id, log_dir))
+    except OSError:
+        return {}
+    for name in names:
+        match = SEGMENT_NAME.match(name)
+        if match:
+            # The live segment has no number and sorts after the rotated ones
+            number = int(match["n"]) if match["n"] else float("inf")
+            runs.setdefault(match["run"], []).append((number, name))
+    directory = task_log_dir(task_id, log_dir)
+    return {
+        run: [os.path.join(directory, name) for _, name in sorted(runs[run])]
+        for run in sorted(runs, key=run_order, reverse=True)
+    }
+
+
+class RunLog:
+    """The log of one run, rotated into numbered segments as it grows"""
+
+    def __init__(self, directory: str, run: str, rotate_bytes: int):
+        self.directory = directory
+        self.run = run
+        self.rotate_bytes = rotate_bytes
+        self.path = os.path.join(directory, f"{run}.log")
+        self.segments = 0
+        self.size = 0
+        self.file = open(self.path, "ab", buffering=WRITE_BUFFER)
+
+    def write(self, data: bytes) -> Optional[str]:
+        """Append data; return the path of a segment that was rotated out"""
+        self.file.write(data)
+        self.size += len(data)
+        if self.rotate_bytes and self.size >= self.rotate_bytes:
+            return self.rotate()
+        return None
+
+    def rotate(self) -> str:
+        self.file.close()
+        self.segments += 1
+        rotated = os.path.join(self.directory, f"{self.run}.{self.segments}.log")
+        os.replace(self.path, rotated)
+        self.file = open(self.path, "ab", buffering=WRITE_BUFFER)
+        self.size = 0
+        return rotated
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class RunLogWriter:
+    """Writes the output of every task run to log files on a background thread.
+
+    Calls only queue work, so the reader threads that feed output never wait
+    for the disk. Each run gets its own file under the task's directory,
+    which is rotated once it reaches ``rotate_bytes``. Rotated segments and
+    the logs of earlier runs are gzip-compressed on a second thread, so a
+    slow compression never holds up writing.
+
+    Logs are addressed by a run key, the task id unless the caller passes
+    its own, so a run whose children still write after the task was started
+    again keeps its own log until its pipes close.
+    """
+
+    def __init__(
+        self,
+        log_dir: str = LOG_DIR,
+        rotate_bytes: int = 64 << 20,
+        keep_runs: int = 20,
+    ):
+        self.log_dir = log_dir
+        self.rotate_bytes = rotate_bytes
+        self.keep_runs = keep_runs
+        self.open_runs = set()  # Run keys with a log, as seen by callers
+        self.queue = queue.SimpleQueue()
+        self.logs: Dict[Hashable, RunLog] = {}  # Only used by the writer thread
+        self.compressor = ThreadPoolExecutor(1, thread_name_prefix="tasker-gzip")
+        self.thread = threading.Thread(
+            target=self._run, name="tasker-logs", daemon=True
+        )
+        self.thread.start()
+
+    def open(self, task_id: str, key: Optional[Hashable] = None) -> None:
+        """Start a new log for a run of the task, under ``key`` if given"""
+        key = task_id if key is None else key
+        self.open_runs.add(key)
+        self.queue.put(("open", key, task_id))
+
+    def write(self, key: Hashable, texts: Iterable[str]) -> None:
+        """Queue complete output lines of a run, if it has a log"""
+        if key in self.open_runs:
+            self.queue.put(("write", key, list(texts)))
+
+    def close(self, key: Hashable) -> None:
+        if key in self.open_runs:
+            self.open_runs.discard(key)
+            self.queue.put(("close", key))
+
+    def shutdown(self) -> None:
+        """Write and close everything queued so far"""
+        self.queue.put(("shutdown",))
+        self.thread.join()
+        self.compressor.shutdown()
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self.queue.get(timeout=FLUSH_INTERVAL)
+            except queue.Empty:
+                item = None
+            if item is not None:
+                if item[0] == "shutdown":
+                    for key in list(self.logs):
+                        self._close(key)
+                    return
+                try:
+                    getattr(self, f"_{item[0]}")(*item[1:])
+                except Exception as e:
+                    logging.error(f"Error writing log of run {item[1]}: {str(e)}")
+            if time.monotonic() - last_flush >= FLUSH_INTERVAL:
+                for log in self.logs.values():
+                    log.flush()
+                last_flush = time.monotonic()
+
+    def _open(self, key: Hashable, task_id: str) -> None:
+        self._close(key)
+        directory = task_log_dir(task_id, self.log_dir)
+        os.makedirs(directory, exist_ok=True)
+        run = time.strftime("%Y%m%d-%H%M%S")
+        existing = set(list_runs(task_id, self.log_dir))
+        suffix = 1
+        while (f"{run}-{suffix}" if suffix > 1 else run) in existing:
+            suffix += 1
+        if suffix > 1:
+            run = f"{run}-{suffix}"
+        self.logs[key] = RunLog(directory, run, self.rotate_bytes)
+        # Earlier runs still being written are left alone until the next run
+        busy = {log.run for log in self.logs.values() if log.directory == directory}
+        self.compressor.submit(self._tidy, task_id, run, busy)
+
+    def _write(self, key: Hashable, texts: List[str]) -> None:
+        log = self.logs.get(key)
+        if log is None:
+            return
+        data = "".join(f"{text}\n" for text in texts).encode("utf-8", "replace")
+        rotated = log.write(data)
+        if rotated is not None:
+            self.compressor.submit(compress, rotated)
+
+    def _close(self, key: Hashable) -> None:
+        log = self.logs.pop(key, None)
+        if log is not None:
+            log.close()
+
+    def _tidy(self, task_id: str, current: str, busy: Set[str]) -> None:
+        """Compress the logs of runs before ``current`` and delete the oldest ones"""
+        runs = list_runs(task_id, self.log_dir)
+        for index, (run, segments) in enumerate(runs.items()):
+            # Runs opened after this one was queued are being written too
+            if run in busy or run_order(run) > run_order(current):
+                continue
+            for path in segments:
+                if self.keep_runs and index >= self.keep_runs:
+                    remove_log(path)
+                elif not path.endswith(".gz"):
+                    compress(path)
+
+
+def configured_writer() -> RunLogWriter:
+    """Return a log writer with the rotation and retention from the settings"""
+    settings = settings_service().current
+    return RunLogWriter(
+        rotate_bytes=settings.log_rotate_mb << 20, keep_runs=settings.log_keep_runs
+    )
@@ -0,0 +1,249 @@
+import logging
+import re
+import socket
+import threading
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Optional, Pattern
+
+from app.models.task import Task
+
+PORT_POLL_INTERVAL = 0.2  # Seconds between attempts to connect to a port
+PORT_CONNECT_TIMEOUT = 0.5
+DEFAULT_HOST = "127.0.0.1"
+
+
+@dataclass(frozen=True)
+class ReadyCondition:
+    """When a started task counts as ready for the tasks that depend on it"""
+
+    kind: str  # "started", "exit", "output" or "port"
+    pattern: Optional[Pattern] = None
+    host: str = DEFAULT_HOST
+    port: int = 0
+
+    @classmethod
+    def parse(cls, spec: Optional[str]) -> "ReadyCondition":
+        """Parse "exit", "output:<regex>" or "port:[host:]<port>".
+
+        An empty spec means the task is ready as soon as it has started.
+        """
+        spec = (spec or "").strip()
+        kind, _, value = spec.partition(":")
+        if not spec or spec == "started":
+            return cls("started")
+        if spec == "exit":
+            return cls("exit")
+        if kind == "output" and value:
+            try:
+                return cls("output", pattern=re.compile(value))
+            except re.error as e:
+                raise ValueError(f"Invalid pattern {value!r}: {str(e)}")
+        if kind == "port":
+            host, _, port = value.rpartition(":")
+            if port.isdigit() and 0 < int(port) < 65536:
+                return cls("port", host=host or DEFAULT_HOST, port=int(port))
+        raise ValueError(f"Invalid readiness condition {spec!r}")
+
+
+class TaskState(Enum):
+    PENDING = "pending"  # Waiting for dependencies or a free slot
+    RUNNING = "running"  # Started, not ready yet
+    READY = "ready"  # Ready, possibly still running
+    DONE = "done"  # Exited after becoming ready
+    FAILED = "failed"  # Failed to start, or exited before becoming ready
+    SKIPPED = "skipped"  # Never started because a dependency failed
+
+
+class GroupScheduler:
+    """Starts the tasks of a group as soon as their dependencies are ready.
+
+    The scheduler only tracks state: the owner launches tasks, watches their
+    readiness and reports back through ``task_ready`` and ``task_exited``,
+    always from the same thread. ``max_parallel`` caps how many of the
+    group's processes run at once, 0 meaning no limit.
+    """
+
+    def __init__(
+        self,
+        tasks: List[Task],
+        launch: Callable[[Task, ReadyCondition], bool],
+        max_parallel: int = 0,
+        running: Iterable[str] = (),
+    ):
+        self.tasks = {task.id: task for task in tasks}
+        self.launch = launch
+        self.max_parallel = max_parallel
+        self.conditions = {
+            task.id: ReadyCondition.parse(task.ready_when) for task in tasks
+        }
+        self.state = {task_id: TaskState.PENDING for task_id in self.tasks}
+        self.active = 0  # Processes of the group that are running
+
+        # Dependencies outside the group can never be met here, so they are ignored
+        self.dependents: Dict[str, List[str]] = {task_id: [] for task_id in self.tasks}
+        self.waiting: Dict[str, int] = {}
+        for task in tasks:
+            depends_on = [
+                dep
+                for dep in dict.fromkeys(task.depends_on)
+                if dep in self.tasks and dep != task.id
+            ]
+            self.waiting[task.id] = len(depends_on)
+            for dep in depends_on:
+                self.dependents[dep].append(task.id)
+        self._check_cycles()
+
+        self.runnable = deque(task_id for task_id, n in self.waiting.items() if not n)
+        for task_id in running:
+            if task_id in self.tasks:
+                self.active += 1
+                self._mark_ready(task_id)
+
+    @property
+    def finished(self) -> bool:
+        """True once no task is left to start or to wait for"""
+        return all(
+            state not in (TaskState.PENDING, TaskState.RUNNING)
+            for state in self.state.values()
+        )
+
+    def start(self) -> None:
+        self._fill()
+
+    def task_ready(self, task_id: str) -> None:
+        """Report that a task met its readiness condition"""
+        if self.state.get(task_id) is TaskState.RUNNING:
+            self._mark_ready(task_id)
+            self._fill()
+
+    def task_exited(self, task_id: str, exit_code: int) -> None:
+        """Report that a task's process exited"""
+        state = self.state.get(task_id)
+        if state not in (TaskState.RUNNING, TaskState.READY):
+            return
+
+        self.active -= 1
+        if state is TaskState.RUNNING:
+            # A clean exit satisfies any condition that was not met yet
+            if exit_code == 0:
+                self._mark_ready(task_id)
+            else:
+                self._fail(task_id)
+        if self.state[task_id] is TaskState.READY:
+            self.state[task_id] = TaskState.DONE
+        self._fill()
+
+    def _fill(self) -> None:
+        """Launch runnable tasks while there are free slots"""
+        while self.runnable and not (
+            self.max_parallel and self.active >= self.max_parallel
+        ):
+            task_id = self.runnable.popleft()
+            if self.state[task_id] is not TaskState.PENDING:
+                continue
+
+            task, condition = self.tasks[task_id], self.conditions[task_id]
+            self.state[task_id] = TaskState.RUNNING
+            self.active += 1
+            if not self.launch(task, condition):
+                self.active -= 1
+                self._fail(task_id)
+            elif condition.kind == "started":
+                self._mark_ready(task_id)
+
+    def _mark_ready(self, task_id: str) -> None:
+        self.state[task_id] = TaskState.READY
+        for dependent in self.dependents[task_id]:
+            self.waiting[dependent] -= 1
+            if not self.waiting[dependent]:
+                self.runnable.append(dependent)
+
+    def _fail(self, task_id: str) -> None:
+        self.state[task_id] = TaskState.FAILED
+        stack = list(self.dependents[task_id])
+        while stack:
+            dependent = stack.pop()
+            if self.state[dependent] is TaskState.PENDING:
+                self.state[dependent] = TaskState.SKIPPED
+                logging.info(
+                    f"Skipping {self.tasks[dependent].title}: "
+                    f"{self.tasks[task_id].title} failed"
+                )
+                stack.extend(self.dependents[dependent])
+
+    def _check_cycles(self) -> None:
+        waiting = dict(self.waiting)
+        queue = [task_id for task_id, n in waiting.items() if not n]
+        for task_id in queue:
+            for dependent in self.dependents[task_id]:
+                waiting[dependent] -= 1
+                if not waiting[dependent]:
+                    queue.append(dependent)
+        if len(queue) < len(self.tasks):
+            titles = ", ".join(
+                task.title for task_id, task in self.tasks.items() if waiting[task_id]
+            )
+            raise ValueError(f"Dependency cycle between {titles}")
+
+
+def wait_for_port(host: str, port: int, cancelled: threading.Event) -> bool:
+    """Block until a TCP port accepts connections, or until cancelled"""
+    while not cancelled.is_set():
+        try:
+            with socket.create_connection((host, port), PORT_CONNECT_TIMEOUT):
+                return True
+        except OSError:
+            cancelled.wait(PORT_POLL_INTERVAL)
+    return False
+
+
+class ReadinessWatcher:
+    """Detects output and port readiness conditions off the caller's thread.
+
+    ``feed`` is meant to be called from the output reader thread; port
+    conditions are polled on a thread of their own. ``on_ready`` may
+    therefore be called from any thread, once per watch.
+    """
+
+    def __init__(self, on_ready: Callable[[str], None]):
+        self.on_ready = on_ready
+        self.patterns: Dict[str, Pattern] = {}
+        self.probes: Dict[str, threading.Event] = {}
+
+    def watch(self, task_id: str, condition: ReadyCondition) -> None:
+        self.cancel(task_id)
+        if condition.kind == "output":
+            self.patterns[task_id] = condition.pattern
+        elif condition.kind == "port":
+            cancelled = self.probes[task_id] = threading.Event()
+            threading.Thread(
+                target=self._probe,
+                args=(task_id, condition, cancelled),
+                name=f"tasker-port-{condition.port}",
+                daemon=True,
+            ).start()
+
+    def feed(self, task_id: str, texts: Iterable[str]) -> None:
+        """Check output lines of a task against the pattern it waits for"""
+        pattern = self.patterns.get(task_id)
+        if pattern is None:
+            return
+        if any(pattern.search(text) for text in texts):
+            if self.patterns.pop(task_id, None) is not None:
+                self.on_ready(task_id)
+
+    def cancel(self, task_id: str) -> None:
+        self.patterns.pop(task_id, None)
+        cancelled = self.probes.pop(task_id, None)
+        if cancelled is not None:
+            cancelled.set()
+
+    def _probe(
+        self, task_id: str, condition: ReadyCondition, cancelled: threading.Event
+    ) -> None:
+        if wait_for_port(condition.host, condition.port, cancelled):
+            if self.probes.get(task_id) is cancelled:
+                del self.probes[task_id]
+                self.on_ready(task_id)
@@ -0,0 +1,108 @@
+import logging
+import os
+from itertools import islice
+from typing import Iterable, List, Optional
+
+from app.utils.ansi import StyledLine
+
+DEFAULT_MAX_LINES = 10000
+DEFAULT_MAX_BYTES = 0  # 0 disables the size limit
+SPILL_DIR = "scrollback"
+
+
+class ScrollbackBuffer:
+    """Bounded line store that evicts the oldest lines once a limit is reached.
+
+    Lines live in a list whose head is dropped lazily by moving ``start``, so
+    the view can index any row in constant time while painting.
+    """
+
+    def __init__(
+        self,
+        max_lines: int = DEFAULT_MAX_LINES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        spill_path: Optional[str] = None,
+    ):
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.spill_path = spill_path
+        self.lines: List[StyledLine] = []
+        self.start = 0  # Position in lines of the oldest line still held
+        self.total_bytes = 0
+        self.first_index = 0  # Absolute index of the oldest line still held
+        self._spill_file = None
+
+    def __len__(self) -> int:
+        return len(self.lines) - self.start
+
+    def __getitem__(self, index: int) -> StyledLine:
+        position = self.start + index if index >= 0 else len(self.lines) + index
+        if position < self.start:
+            raise IndexError("scrollback index out of range")
+        return self.lines[position]
+
+    def append(self, lines: Iterable[StyledLine]) -> int:
+        """Add lines and return how many of the oldest lines were evicted"""
+        self.extend(lines)
+        return self.evict(self.excess())
+
+    def extend(self, lines: Iterable[StyledLine]) -> None:
+        """Add lines without enforcing the limits yet"""
+        for line in lines:
+            self.lines.append(line)
+            self.total_bytes += len(line.text) + 1
+
+    def excess(self) -> int:
+        """Number of oldest lines that must go to get back within the limits"""
+        count = max(0, len(self) - self.max_lines) if self.max_lines else 0
+        if not self.max_bytes or self.total_bytes <= self.max_bytes:
+            return count
+
+        remaining = self.total_bytes
+        for index, line in enumerate(islice(self.lines, self.start, None)):
+            if index >= count and remaining <= self.max_bytes:
+                return index
+            remaining -= len(line.text) + 1
+        return len(self)
+
+    def evict(self, count: int) -> int:
+        """Drop the oldest lines, spilling them to disk if enabled"""
+        end = self.start + min(count, len(self))
+        evicted = self.lines[self.start : end]
+        self.start = end
+        if self.start > len(self.lines) // 2:
+            # Drop the evicted head once it outweighs the live lines
+            del self.lines[: self.start]
+            self.start = 0
+        if evicted:
+            self.total_bytes -= sum(len(line.text) + 1 for line in evicted)
+            self.first_index += len(evicted)
+            self._spill(evicted)
+        return len(evicted)
+
+    def clear(self) -> None:
+        """Drop all lines without spilling them"""
+        self.first_index += len(self)
+        self.lines = []
+        self.start = 0
+        self.total_bytes = 0
+
+    def close(self) -> None:
+        """Close the spill file if one was opened"""
+        if self._spill_file:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def _spill(self, lines) -> None:
+        """Append evicted lines to the spill file so nothing is lost"""
+        if not self.spill_path:
+            return
+
+        try:
+            if self._spill_file is None:
+                os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+                self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+            self._spill_file.write("".join(line.text + "\n" for line in lines))
+        except OSError as e:
+            logging.error(f"Error spilling scrollback to {self.spill_path}: {str(e)}")
+            self.spill_path = None
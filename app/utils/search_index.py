@@ -0,0 +1,324 @@
+import logging
+import queue
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from collections import deque
+from itertools import accumulate
+from typing import (
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Pattern,
+    Set,
+    Tuple,
+)
+
+CHUNK_CHARS = 1 << 18  # Text per chunk, the unit the trigram sets describe
+MAX_CHUNK_TERMS = 1 << 15  # Chunks with more distinct trigrams are always scanned
+DEFAULT_MAX_MB = 256
+MAX_MATCHES = 1000
+
+# Digits are folded together so counters and ids add few distinct trigrams
+FOLD = str.maketrans("0123456789", "0000000000")
+VERBOSE_FLAG = re.compile(r"\(\?[aiLmsu]*x")
+
+
+def trigrams(text: str) -> Set[tuple]:
+    """Return the trigrams inside the whitespace-separated words of a text.
+
+    Text is lowercased and digit-folded first, so the same terms serve case
+    sensitive and insensitive queries. Any three characters of a query that
+    contain no whitespace lie inside one word of every line they match.
+    """
+    terms = set()
+    for word in set(text.lower().translate(FOLD).split()):
+        terms.update(zip(word, word[1:], word[2:]))
+    return terms
+
+
+def regex_literals(pattern: str) -> List[str]:
+    """Return strings that every match of a regex must contain.
+
+    Only literal characters outside groups are considered, and nothing at
+    all for patterns with alternatives, which keeps the answer conservative.
+    """
+    if VERBOSE_FLAG.search(pattern):
+        return []
+    runs, run = [], ""
+    i, depth, length = 0, 0, len(pattern)
+    while i < length:
+        char = pattern[i]
+        i += 1
+        literal = None
+        if char == "\\":
+            escaped = pattern[i : i + 1]
+            i += 1
+            if escaped.isalnum():
+                # Classes, anchors and character codes such as \d, \b or \x41
+                if escaped in "xuU":
+                    i += {"x": 2, "u": 4, "U": 8}[escaped]
+                elif escaped == "N":
+                    i = pattern.find("}", i) + 1 or length
+                elif escaped.isdigit():
+                    while i < length and pattern[i].isdigit():
+                        i += 1
+            else:
+                literal = escaped
+        elif char == "[":
+            i = skip_class(pattern, i)
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|":
+            return []
+        elif char not in ".^$*+?{}":
+            literal = char
+        if depth:
+            literal = None  # Groups may be optional or repeated
+
+        # A quantifier makes the atom optional or repeats it, ending the run
+        quantifier = pattern[i : i + 1]
+        if quantifier and quantifier in "*+?{":
+            if quantifier == "{":
+                i = pattern.find("}", i) + 1 or length
+            else:
+                i += 1
+            if pattern[i : i + 1] in ("?", "+"):
+                i += 1  # Lazy or possessive
+            if quantifier == "+" and literal is not None:
+                run += literal
+            literal = None
+        elif literal is not None:
+            run += literal
+            continue
+        if run:
+            runs.append(run)
+        run = ""
+    if run:
+        runs.append(run)
+    return runs
+
+
+def skip_class(pattern: str, i: int) -> int:
+    """Return the index just past a character class whose [ is before i"""
+    if pattern[i : i + 1] == "^":
+        i += 1
+    if pattern[i : i + 1] == "]":
+        i += 1
+    while i < len(pattern) and pattern[i] != "]":
+        i += 2 if pattern[i] == "\\" else 1
+    return i + 1
+
+
+def query_terms(pattern: str, regex: bool) -> Set[tuple]:
+    """Return the trigrams a chunk must have to hold a match"""
+    terms = set()
+    for literal in regex_literals(pattern) if regex else [pattern]:
+        terms |= trigrams(literal)
+    return terms
+
+
+def line_matches(compiled: Pattern, text: str) -> Iterator[Tuple[int, int]]:
+    """Yield the non-empty matches in newline-terminated text, line by line.
+
+    The text is scanned as a whole, and only a line whose match runs on
+    into the next one is searched again on its own.
+    """
+    position = 0
+    while True:
+        for match in compiled.finditer(text, position):
+            start, end = match.span()
+            if start == end:
+                continue
+            line_end = text.index("\n", start)
+            if end <= line_end:
+                yield start, end
+                continue
+            for match in compiled.finditer(text, start, line_end):
+                if match.end() > match.start():
+                    yield match.span()
+            position = line_end + 1
+            break
+        else:
+            return
+
+
+class SearchMatch(NamedTuple):
+    """One match, with the line number as counted by the stream's scrollback"""
+
+    stream: Hashable
+    line: int
+    start: int
+    end: int
+    text: str
+
+
+class Chunk:
+    """A sealed run of lines, joined into one string to be scanned at once"""
+
+    __slots__ = ("first_line", "text", "starts", "terms")
+
+    def __init__(self, first_line: int, lines: List[str], index: bool = True):
+        self.first_line = first_line
+        self.text = "".join(f"{line}\n" for line in lines)
+        self.starts = array(
+            "q", accumulate((len(line) + 1 for line in lines[:-1]), initial=0)
+        )
+        # Without terms the chunk is scanned by every query
+        self.terms = None
+        if index:
+            terms = trigrams(self.text)
+            if len(terms) <= MAX_CHUNK_TERMS:
+                self.terms = frozenset(terms)
+
+    def matches(self, terms: Set[tuple]) -> bool:
+        return self.terms is None or terms <= self.terms
+
+
+class _Stream:
+    __slots__ = ("chunks", "pending", "pending_chars", "next_line")
+
+    def __init__(self):
+        self.chunks: deque = deque()
+        self.pending: List[str] = []  # Lines not sealed into a chunk yet
+        self.pending_chars = 0
+        self.next_line = 0
+
+
+class OutputIndex:
+    """Searchable copy of the output of every console.
+
+    Output is handed over by the I/O thread and indexed on a thread of its
+    own. Lines are grouped into chunks of about 256 KB, each holding its
+    text, the offsets where lines start and the set of trigrams in it. A
+    query extracts the trigrams that any match must contain and only scans
+    the chunks that have all of them. Once the chunks exceed the size
+    limit the oldest ones are dropped, whichever console they belong to.
+    """
+
+    def __init__(self, max_chars: int = DEFAULT_MAX_MB << 20):
+        self.max_chars = max_chars
+        self.chars = 0
+        self._streams: Dict[Hashable, _Stream] = {}
+        self._sealed: deque = deque()  # (stream, chunk) in the order sealed
+        self._lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="tasker-search", daemon=True
+        )
+        self._thread.start()
+
+    def add(self, stream: Hashable, texts: Iterable[str]) -> None:
+        """Queue complete lines of a stream, numbered from 0 in arrival order"""
+        if self.max_chars:
+            self._queue.put(("add", stream, list(texts)))
+
+    def forget(self, stream: Hashable) -> None:
+        self._queue.put(("forget", stream))
+
+    def sync(self) -> None:
+        """Wait until everything queued so far is searchable"""
+        done = threading.Event()
+        self._queue.put(("sync", done))
+        done.wait()
+
+    def search(
+        self,
+        pattern: str,
+        regex: bool = False,
+        ignore_case: bool = True,
+        limit: int = MAX_MATCHES,
+    ) -> List[SearchMatch]:
+        """Find up to limit matches of a substring or regex in every stream.
+
+        Raises re.error for an invalid regex.
+        """
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        compiled = re.compile(pattern if regex else re.escape(pattern), flags)
+        terms = query_terms(pattern, regex)
+
+        with self._lock:
+            snapshot = [
+                (stream, list(state.chunks), state.next_line, list(state.pending))
+                for stream, state in self._streams.items()
+            ]
+
+        matches: List[SearchMatch] = []
+        for stream, chunks, next_line, pending in snapshot:
+            if pending:
+                chunks.append(Chunk(next_line - len(pending), pending, index=False))
+            for chunk in chunks:
+                if chunk.matches(terms):
+                    self._scan(stream, chunk, compiled, matches, limit)
+                    if len(matches) >= limit:
+                        return matches
+        return matches
+
+    def _scan(self, stream, chunk: Chunk, compiled, matches: list, limit: int):
+        text, starts = chunk.text, chunk.starts
+        for start, end in line_matches(compiled, text):
+            row = bisect_right(starts, start) - 1
+            line_start = starts[row]
+            matches.append(
+                SearchMatch(
+                    stream,
+                    chunk.first_line + row,
+                    start - line_start,
+                    end - line_start,
+                    text[line_start : text.index("\n", start)],
+                )
+            )
+            if len(matches) >= limit:
+                return
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item[0] == "add":
+                    self._add(*item[1:])
+                elif item[0] == "forget":
+                    self._forget(item[1])
+                else:
+                    item[1].set()
+            except Exception as e:
+                logging.error(f"Error indexing output: {str(e)}")
+
+    def _add(self, stream: Hashable, texts: List[str]) -> None:
+        with self._lock:
+            state = self._streams.get(stream)
+            if state is None:
+                state = self._streams[stream] = _Stream()
+            state.pending.extend(texts)
+            state.next_line += len(texts)
+            state.pending_chars += sum(len(text) + 1 for text in texts)
+            if state.pending_chars < CHUNK_CHARS:
+                return
+            first_line = state.next_line - len(state.pending)
+
+        # Only this thread changes streams, so searches can go on meanwhile
+        chunk = Chunk(first_line, state.pending)
+        with self._lock:
+            state.pending = []
+            state.pending_chars = 0
+            state.chunks.append(chunk)
+            self._sealed.append((stream, chunk))
+            self.chars += len(chunk.text)
+            while self.chars > self.max_chars and self._sealed:
+                old_stream, old_chunk = self._sealed.popleft()
+                self._streams[old_stream].chunks.popleft()
+                self.chars -= len(old_chunk.text)
+
+    def _forget(self, stream: Hashable) -> None:
+        with self._lock:
+            state = self._streams.pop(stream, None)
+            if state is None:
+                return
+            self.chars -= sum(len(chunk.text) for chunk in state.chunks)
+            self._sealed = deque(entry for entry in self._sealed if entry[0] != stream)
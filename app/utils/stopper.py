@@ -0,0 +1,149 @@
+import logging
+import os
+import signal
+import subprocess
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from typing import Dict, Iterable, List
+
+import psutil
+
+DEFAULT_GRACE_PERIOD = 2.0  # Seconds a process tree gets to exit after SIGTERM
+KILL_WAIT = 1.0  # Seconds to wait for killed processes to go away
+
+
+def descendants(pids: Iterable[int]) -> Dict[int, List[psutil.Process]]:
+    """Return the descendants of each pid from a single scan of the process table"""
+    children: Dict[int, List[psutil.Process]] = {}
+    for proc in psutil.process_iter(["ppid"]):
+        if proc.info["ppid"] != proc.pid:
+            children.setdefault(proc.info["ppid"], []).append(proc)
+
+    trees = {}
+    for pid in pids:
+        tree, stack, seen = [], list(children.get(pid, [])), {pid}
+        while stack:
+            proc = stack.pop()
+            if proc.pid not in seen:
+                seen.add(proc.pid)
+                tree.append(proc)
+                stack.extend(children.get(proc.pid, []))
+        trees[pid] = tree
+    return trees
+
+
+def leads_group(pid: int) -> bool:
+    """True if the process leads its own process group, as launched tasks do"""
+    if not hasattr(os, "killpg"):
+        return False
+    try:
+        return os.getpgid(pid) == pid
+    except OSError:
+        return False
+
+
+def signal_tree(handle, tree: List[psutil.Process], kill: bool) -> None:
+    """Send SIGTERM or SIGKILL to a task and its descendants"""
+    grouped = leads_group(handle.pid)
+    if grouped:
+        # One signal reaches every process that stayed in the task's group
+        with suppress(OSError):
+            os.killpg(handle.pid, signal.SIGKILL if kill else signal.SIGTERM)
+    else:
+        with suppress(Exception):
+            if kill:
+                handle.kill()
+            else:
+                handle.terminate()
+
+    for proc in tree:
+        with suppress(psutil.Error, OSError):
+            if grouped and os.getpgid(proc.pid) == handle.pid:
+                continue
+            if kill:
+                proc.kill()
+            else:
+                proc.terminate()
+
+
+def is_running(proc: psutil.Process) -> bool:
+    try:
+        return proc.status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+def wait_procs(procs: List[psutil.Process], timeout: float) -> List[psutil.Process]:
+    """Like psutil.wait_procs, but a zombie counts as gone; return the live ones.
+
+    Orphaned descendants are reaped by init, which may take a while to do so.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    alive = [proc for proc in procs if is_running(proc)]
+    while alive and time.monotonic() < deadline:
+        time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(delay * 2, 0.1)
+        alive = [proc for proc in alive if is_running(proc)]
+    return alive
+
+
+def wait_handle(handle, deadline: float) -> bool:
+    try:
+        handle.wait(max(0.0, deadline - time.monotonic()))
+        return True
+    except subprocess.TimeoutExpired:
+        return False
+
+
+def stop_processes(handles: list, grace_period: float) -> None:
+    """Terminate process trees together, killing whatever outlives the grace period.
+
+    Task processes are waited on through their handles, since the I/O engine
+    reaps them; only their descendants are polled by psutil.
+    """
+    trees = descendants(handle.pid for handle in handles)
+    for handle in handles:
+        signal_tree(handle, trees[handle.pid], kill=False)
+
+    deadline = time.monotonic() + grace_period
+    alive = wait_procs([proc for tree in trees.values() for proc in tree], grace_period)
+    survivors = [handle for handle in handles if not wait_handle(handle, deadline)]
+    if not (alive or survivors):
+        return
+
+    logging.warning(
+        f"Killing {len(survivors)} tasks and {len(alive)} child processes "
+        f"that ignored SIGTERM for {grace_period:.1f}s"
+    )
+    for handle in survivors:
+        signal_tree(handle, [], kill=True)
+    for proc in alive:
+        with suppress(psutil.Error):
+            proc.kill()
+
+    deadline = time.monotonic() + KILL_WAIT
+    wait_procs(alive, KILL_WAIT)
+    for handle in survivors:
+        wait_handle(handle, deadline)
+
+
+class ProcessStopper:
+    """Stops process trees on worker threads so the caller never blocks.
+
+    Every tree in a batch is signalled first and then waited on together, so
+    stopping many tasks takes about one grace period in total.
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(thread_name_prefix="tasker-stop")
+
+    def stop(self, handles: list, grace_period: float = DEFAULT_GRACE_PERIOD) -> Future:
+        return self.executor.submit(self._stop, handles, grace_period)
+
+    def _stop(self, handles: list, grace_period: float) -> None:
+        try:
+            stop_processes(handles, grace_period)
+        except Exception as e:
+            logging.error(f"Error stopping processes: {str(e)}")
@@ -0,0 +1,311 @@
+import json
+import logging
+import os
+import sqlite3
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.models.task import Task
+from app.utils.persistence import DebouncedWriter
+
+JSON_PATH = "commands.json"
+SQLITE_PATH = "tasker.db"
+
+Groups = Dict[str, List[Task]]
+
+
+def load_json(path: str) -> Tuple[List[Task], Groups]:
+    """Read tasks and groups from a commands.json file"""
+    with open(path, "r") as f:
+        config = json.load(f)
+
+    tasks = [Task(**task_data) for task_data in config.get("tasks", [])]
+    groups = {
+        name: [Task(**task_data) for task_data in tasks]
+        for name, tasks in config.get("groups", {}).items()
+    }
+    return tasks, groups
+
+
+class JsonTaskStore:
+    """Keeps the whole configuration in commands.json.
+
+    Every change rewrites the file from a snapshot of the current state, but
+    the debounced writer collapses bursts of changes into a single write.
+    """
+
+    def __init__(self, snapshot: Callable[[], dict], path: str = JSON_PATH):
+        self.snapshot = snapshot
+        self.path = path
+        self.writer = DebouncedWriter(path)
+
+    def load(self) -> Tuple[List[Task], Groups]:
+        return load_json(self.path)
+
+    def save_all(self, tasks: List[Task], groups: Groups) -> None:
+        self.writer.submit(self.snapshot())
+
+    def add_task(self, task: Task) -> None:
+        self.writer.submit(self.snapshot())
+
+    def update_task(self, task: Task) -> None:
+        self.writer.submit(self.snapshot())
+
+    def delete_task(self, task: Task, group_name: Optional[str] = None) -> None:
+        self.writer.submit(self.snapshot())
+
+    def create_group(self, name: str, tasks: List[Task]) -> None:
+        self.writer.submit(self.snapshot())
+
+    def rename_group(self, old_name: str, new_name: str) -> None:
+        self.writer.submit(self.snapshot())
+
+    def delete_group(self, name: str) -> None:
+        self.writer.submit(self.snapshot())
+
+    def add_to_group(self, name: str, task: Task) -> None:
+        self.writer.submit(self.snapshot())
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class SqliteTaskStore:
+    """Keeps tasks, groups and group membership in indexed SQLite tables.
+
+    Each change is written as a small transaction touching only the affected
+    rows. An empty database is seeded from commands.json the first time it
+    is opened.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            path TEXT NOT NULL,
+            cmd TEXT NOT NULL,
+            max_lines INTEGER,
+            position INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS groups (
+            name TEXT PRIMARY KEY,
+            position INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS group_tasks (
+            group_name TEXT NOT NULL
+                REFERENCES groups (name) ON UPDATE CASCADE ON DELETE CASCADE,
+            task_id TEXT NOT NULL
+                REFERENCES tasks (id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            PRIMARY KEY (group_name, task_id)
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE INDEX IF NOT EXISTS tasks_position ON tasks (position);
+        CREATE INDEX IF NOT EXISTS tasks_path ON tasks (path);
+        CREATE INDEX IF NOT EXISTS group_tasks_task ON group_tasks (task_id);
+        CREATE INDEX IF NOT EXISTS group_tasks_position
+            ON group_tasks (group_name, position);
+    """
+    # Columns added to the tasks table after its first release
+    ADDED_COLUMNS = {
+        "depends_on": "TEXT NOT NULL DEFAULT '[]'",
+        "ready_when": "TEXT",
+        "output_stages": "TEXT NOT NULL DEFAULT '[]'",
+    }
+    TASK_FIELDS = (
+        "id, title, path, cmd, max_lines, depends_on, ready_when, output_stages"
+    )
+    TASK_COLUMNS = ", ".join(f"t.{name}" for name in TASK_FIELDS.split(", "))
+
+    def __init__(self, path: str = SQLITE_PATH, json_path: str = JSON_PATH):
+        self.path = path
+        self.json_path = json_path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(self.SCHEMA)
+        self.upgrade_schema()
+
+    def upgrade_schema(self) -> None:
+        """Add the columns that a database created by an older version lacks"""
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(tasks)")}
+        with self.db:
+            for name, definition in self.ADDED_COLUMNS.items():
+                if name not in columns:
+                    self.db.execute(f"ALTER TABLE tasks ADD COLUMN {name} {definition}")
+
+    def load(self) -> Tuple[List[Task], Groups]:
+        self.migrate_json()
+        tasks = [
+            self._task(row)
+            for row in self.db.execute(
+                f"SELECT {self.TASK_COLUMNS} FROM tasks t"
+                " WHERE NOT EXISTS"
+                " (SELECT 1 FROM group_tasks g WHERE g.task_id = t.id)"
+                " ORDER BY t.position"
+            )
+        ]
+        groups: Groups = {
+            name: []
+            for name, in self.db.execute("SELECT name FROM groups ORDER BY position")
+        }
+        for row in self.db.execute(
+            f"SELECT g.group_name, {self.TASK_COLUMNS} FROM group_tasks g"
+            " JOIN tasks t ON t.id = g.task_id"
+            " ORDER BY g.group_name, g.position"
+        ):
+            groups[row[0]].append(self._task(row[1:]))
+        return tasks, groups
+
+    def migrate_json(self) -> None:
+        """Import commands.json into a database that has never been seeded"""
+        if self.db.execute("SELECT 1 FROM meta WHERE key = 'seeded'").fetchone():
+            return
+
+        if os.path.exists(self.json_path):
+            tasks, groups = load_json(self.json_path)
+            self.save_all(tasks, groups)
+            logging.info(
+                f"Migrated {len(tasks)} tasks and {len(groups)} groups "
+                f"from {self.json_path} to {self.path}"
+            )
+        with self.db:
+            self.db.execute("INSERT INTO meta VALUES ('seeded', '1')")
+
+    def save_all(self, tasks: List[Task], groups: Groups) -> None:
+        with self.db:
+            self.db.execute("DELETE FROM group_tasks")
+            self.db.execute("DELETE FROM groups")
+            self.db.execute("DELETE FROM tasks")
+            all_tasks = tasks + [
+                task for members in groups.values() for task in members
+            ]
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO tasks ({self.TASK_FIELDS}, position)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._task_row(task) + (position,)
+                    for position, task in enumerate(all_tasks)
+                ),
+            )
+            self.db.executemany(
+                "INSERT INTO groups VALUES (?, ?)",
+                ((name, position) for position, name in enumerate(groups)),
+            )
+            self.db.executemany(
+                "INSERT OR IGNORE INTO group_tasks VALUES (?, ?, ?)",
+                (
+                    (name, task.id, position)
+                    for name, members in groups.items()
+                    for position, task in enumerate(members)
+                ),
+            )
+
+    def add_task(self, task: Task) -> None:
+        with self.db:
+            self.db.execute(
+                f"INSERT INTO tasks ({self.TASK_FIELDS}, position)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?,"
+                " (SELECT COALESCE(MAX(position), -1) + 1 FROM tasks))",
+                self._task_row(task),
+            )
+
+    def update_task(self, task: Task) -> None:
+        with self.db:
+            self.db.execute(
+                "UPDATE tasks SET title = ?, path = ?, cmd = ?, max_lines = ?,"
+                " depends_on = ?, ready_when = ?, output_stages = ? WHERE id = ?",
+                self._task_row(task)[1:] + (task.id,),
+            )
+
+    def delete_task(self, task: Task, group_name: Optional[str] = None) -> None:
+        """Delete an ungrouped task, or a task from the group it is listed in.
+
+        The task itself is only dropped once no other group lists it.
+        """
+        with self.db:
+            if group_name is not None:
+                self.db.execute(
+                    "DELETE FROM group_tasks WHERE group_name = ? AND task_id = ?",
+                    (group_name, task.id),
+                )
+            self.db.execute(
+                "DELETE FROM tasks WHERE id = ? AND NOT EXISTS"
+                " (SELECT 1 FROM group_tasks WHERE task_id = ?)",
+                (task.id, task.id),
+            )
+
+    def create_group(self, name: str, tasks: List[Task]) -> None:
+        with self.db:
+            self.db.execute(
+                "INSERT INTO groups VALUES"
+                " (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM groups))",
+                (name,),
+            )
+            self.db.executemany(
+                "INSERT INTO group_tasks VALUES (?, ?, ?)",
+                ((name, task.id, position) for position, task in enumerate(tasks)),
+            )
+
+    def rename_group(self, old_name: str, new_name: str) -> None:
+        with self.db:
+            # Membership rows follow through ON UPDATE CASCADE
+            self.db.execute(
+                "UPDATE groups SET name = ? WHERE name = ?", (new_name, old_name)
+            )
+
+    def delete_group(self, name: str) -> None:
+        with self.db:
+            # Members go back to the end of the ungrouped tasks, in group order
+            (end,) = self.db.execute(
+                "SELECT COALESCE(MAX(position), -1) + 1 FROM tasks"
+            ).fetchone()
+            self.db.execute(
+                "UPDATE tasks SET position = ? + (SELECT g.position FROM group_tasks g"
+                " WHERE g.group_name = ? AND g.task_id = tasks.id)"
+                " WHERE id IN (SELECT task_id FROM group_tasks WHERE group_name = ?)",
+                (end, name, name),
+            )
+            self.db.execute("DELETE FROM groups WHERE name = ?", (name,))
+
+    def add_to_group(self, name: str, task: Task) -> None:
+        with self.db:
+            # Other groups listing the task keep it
+            self.db.execute(
+                "INSERT OR IGNORE INTO group_tasks VALUES (?, ?, (SELECT COALESCE(MAX(position),"
+                " -1) + 1 FROM group_tasks WHERE group_name = ?))",
+                (name, task.id, name),
+            )
+
+    def close(self) -> None:
+        self.db.close()
+
+    @staticmethod
+    def _task(row: tuple) -> Task:
+        task_id, title, path, cmd, max_lines, depends_on, ready_when, stages = row
+        return Task(
+            id=task_id,
+            title=title,
+            path=path,
+            cmd=cmd,
+            max_lines=max_lines,
+            depends_on=json.loads(depends_on),
+            ready_when=ready_when,
+            output_stages=json.loads(stages),
+        )
+
+    @staticmethod
+    def _task_row(task: Task) -> tuple:
+        return (
+            task.id,
+            task.title,
+            task.path,
+            task.cmd,
+            task.max_lines,
+            json.dumps(task.depends_on),
+            task.ready_when,
+            json.dumps(task.output_stages),
+        )
@@ -0,0 +1,188 @@
+import logging
+import threading
+import time
+from array import array
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import psutil
+
+from app.utils.stopper import descendants
+
+SAMPLE_INTERVAL_MS = 1000
+RING_SIZE = 120  # Samples kept per task, two minutes at the default interval
+
+
+class Sample(NamedTuple):
+    """Resource usage of a task's whole process tree at one point in time"""
+
+    time: float
+    cpu_percent: float  # 100 per fully used core
+    rss: int
+    read_bytes: int  # Totals since each process started
+    write_bytes: int
+    threads: int
+    children: int
+
+
+class TelemetryRing:
+    """Fixed-size history of samples, stored column-wise in typed arrays"""
+
+    TYPECODES = ("d", "f", "q", "q", "q", "l", "l")
+
+    def __init__(self, capacity: int = RING_SIZE):
+        self.capacity = capacity
+        self.columns = [array(code, [0]) * capacity for code in self.TYPECODES]
+        self.start = 0  # Index of the oldest sample
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, sample: Sample) -> None:
+        if self.count < self.capacity:
+            index = (self.start + self.count) % self.capacity
+            self.count += 1
+        else:
+            index = self.start
+            self.start = (self.start + 1) % self.capacity
+        for column, value in zip(self.columns, sample):
+            column[index] = value
+
+    def latest(self, back: int = 0) -> Optional[Sample]:
+        """Return the newest sample, or the one ``back`` samples before it"""
+        if back >= self.count:
+            return None
+        index = (self.start + self.count - 1 - back) % self.capacity
+        return Sample(*(column[index] for column in self.columns))
+
+    def series(self, field: str) -> List[float]:
+        """Return one field of every sample, oldest first"""
+        column = self.columns[Sample._fields.index(field)]
+        end = self.start + self.count
+        if end <= self.capacity:
+            return column[self.start : end].tolist()
+        return column[self.start :].tolist() + column[: end - self.capacity].tolist()
+
+    def io_rates(self) -> Tuple[float, float]:
+        """Return the read and write bytes per second between the last two samples"""
+        current, previous = self.latest(), self.latest(1)
+        if previous is None or current.time <= previous.time:
+            return 0.0, 0.0
+        elapsed = current.time - previous.time
+        return (
+            max(0, current.read_bytes - previous.read_bytes) / elapsed,
+            max(0, current.write_bytes - previous.write_bytes) / elapsed,
+        )
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def describe(ring: TelemetryRing) -> str:
+    """Return a one-line summary of the latest sample"""
+    sample = ring.latest()
+    if sample is None:
+        return ""
+    read_rate, write_rate = ring.io_rates()
+    return (
+        f"CPU {sample.cpu_percent:.0f}%  RSS {format_bytes(sample.rss)}  "
+        f"I/O {format_bytes(read_rate)}/s in, {format_bytes(write_rate)}/s out  "
+        f"{sample.threads} threads  {sample.children} children"
+    )
+
+
+class TelemetrySampler:
+    """Samples the process trees of running tasks on a worker thread.
+
+    ``request`` hands over the pid of each task and returns at once. The
+    worker scans the process table a single time per pass and reports a
+    Sample per task through ``on_samples``. A request made while a pass is
+    still running replaces any older pending one, so a busy machine skips
+    samples instead of queueing them.
+    """
+
+    def __init__(self, on_samples: Callable[[Dict[str, Sample]], None]):
+        self.on_samples = on_samples
+        self._pending: Optional[Dict[str, int]] = None
+        self._wakeup = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._roots: Dict[int, psutil.Process] = {}
+        # Task ID -> (pid, time, CPU seconds) of the previous pass
+        self._cpu: Dict[str, Tuple[int, float, float]] = {}
+
+    def request(self, pids: Dict[str, int]) -> None:
+        with self._wakeup:
+            self._pending = pids
+            self._wakeup.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="tasker-telemetry", daemon=True
+            )
+            self._thread.start()
+
+    def sample(self, pids: Dict[str, int]) -> Dict[str, Sample]:
+        """Measure every task tree in one pass over the process table"""
+        trees = descendants(pids.values())
+        now = time.monotonic()
+        samples = {}
+        for task_id, pid in pids.items():
+            root = self._root(pid)
+            if root is None:
+                continue
+            cpu, sample = self._measure([root] + trees[pid], now)
+            previous = self._cpu.get(task_id)
+            if previous is not None and previous[0] == pid and now > previous[1]:
+                # Exited children take their CPU time with them, hence the floor
+                percent = max(0.0, (cpu - previous[2]) / (now - previous[1]) * 100)
+                sample = sample._replace(cpu_percent=percent)
+            self._cpu[task_id] = (pid, now, cpu)
+            samples[task_id] = sample
+
+        for task_id in self._cpu.keys() - pids.keys():
+            del self._cpu[task_id]
+        for pid in self._roots.keys() - set(pids.values()):
+            del self._roots[pid]
+        return samples
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                while self._pending is None:
+                    self._wakeup.wait()
+                pids, self._pending = self._pending, None
+            try:
+                self.on_samples(self.sample(pids))
+            except Exception as e:
+                logging.error(f"Error sampling task telemetry: {str(e)}")
+
+    def _root(self, pid: int) -> Optional[psutil.Process]:
+        root = self._roots.get(pid)
+        if root is None:
+            try:
+                root = self._roots[pid] = psutil.Process(pid)
+            except psutil.Error:
+                return None
+        return root
+
+    def _measure(self, procs: List[psutil.Process], now: float) -> Tuple[float, Sample]:
+        cpu = 0.0
+        rss = read_bytes = write_bytes = threads = 0
+        for proc in procs:
+            try:
+                with proc.oneshot():
+                    times = proc.cpu_times()
+                    cpu += times.user + times.system
+                    rss += proc.memory_info().rss
+                    threads += proc.num_threads()
+                    if hasattr(proc, "io_counters"):  # Not available on macOS
+                        io = proc.io_counters()
+                        read_bytes += io.read_bytes
+                        write_bytes += io.write_bytes
+            except psutil.Error:
+                continue
+        sample = Sample(now, 0.0, rss, read_bytes, write_bytes, threads, len(procs) - 1)
+        return cpu, sample
@@ -0,0 +1,56 @@
+"""Compare the ANSI SGR parser against ansi2html on synthetic build output.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ansi
+"""
+
+import random
+import time
+
+from ansi2html import Ansi2HTMLConverter
+
+from app.utils.ansi import AnsiParser
+
+LINE_COUNT = 100_000
+
+
+def make_lines(count: int) -> list:
+    """Build a mix of plain, colored and 256-color log lines"""
+    rng = random.Random(0)
+    templates = [
+        "   Compiling tasker-core v0.{n}.0 (/home/dev/tasker)",
+        "\x1b[32m\x1b[1m   Compiling\x1b[0m serde v1.0.{n}",
+        "\x1b[33mwarning\x1b[0m: unused variable `x{n}`",
+        "\x1b[1;31merror[E0{n}]\x1b[0m: mismatched types",
+        "\x1b[38;5;{n}mINFO\x1b[0m request served in {n} ms",
+        "\x1b[2m{n}:{n}:{n}\x1b[22m GET /api/tasks 200",
+    ]
+    return [rng.choice(templates).format(n=rng.randint(1, 255)) for _ in range(count)]
+
+
+def bench(name: str, function, lines: list) -> float:
+    start = time.perf_counter()
+    for line in lines:
+        function(line)
+    elapsed = time.perf_counter() - start
+    megabytes = sum(len(line) for line in lines) / 1e6
+    print(f"{name:<12} {elapsed:7.3f} s  {megabytes / elapsed:7.1f} MB/s")
+    return elapsed
+
+
+def main():
+    lines = make_lines(LINE_COUNT)
+    print(f"{LINE_COUNT} lines, {sum(map(len, lines)) / 1e6:.1f} MB")
+
+    converter = Ansi2HTMLConverter(inline=True)
+    baseline = bench(
+        "ansi2html", lambda line: converter.convert(line, full=False), lines
+    )
+    parser = AnsiParser()
+    elapsed = bench("AnsiParser", parser.parse_line, lines)
+    print(f"speedup      {baseline / elapsed:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
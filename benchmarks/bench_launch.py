@@ -0,0 +1,68 @@
+"""Measure how long it takes to launch a task and see it exit.
+
+Compares the launcher backends available on this platform. Run from the
+repository root:
+
+    python -m benchmarks.bench_launch [launch count]
+"""
+
+import statistics
+import sys
+import threading
+import time
+
+from app.utils.io_engine import IOEngine
+from app.utils.launcher import PosixLauncher, WindowsLauncher
+
+LAUNCH_COUNT = 200
+COMMAND = "cmd /c exit 0" if sys.platform == "win32" else "true"
+
+
+def launchers() -> dict:
+    if sys.platform == "win32":
+        return {"cmd /c": WindowsLauncher()}
+    return {
+        "shell": PosixLauncher(),
+        "direct exec": PosixLauncher(direct_exec=True),
+    }
+
+
+def bench(name: str, launcher, count: int) -> None:
+    exited = threading.Event()
+    engine = IOEngine(
+        lambda task_id, pid, lines, partial: None,
+        lambda task_id, pid: None,
+        lambda task_id, pid, returncode: exited.set(),
+        parse_ansi=False,
+    )
+    spawn_times, round_trips = [], []
+    try:
+        for index in range(count):
+            exited.clear()
+            args, options = launcher.spec(COMMAND)
+            start = time.perf_counter()
+            engine.start(str(index), args, cwd=".", **options)
+            spawned = time.perf_counter()
+            exited.wait()
+            done = time.perf_counter()
+            spawn_times.append(spawned - start)
+            round_trips.append(done - start)
+    finally:
+        engine.shutdown()
+
+    print(
+        f"{name:<12} spawn p50 {statistics.median(spawn_times) * 1000:6.2f} ms"
+        f"  start to exit p50 {statistics.median(round_trips) * 1000:6.2f} ms"
+        f"  p95 {statistics.quantiles(round_trips, n=20)[-1] * 1000:6.2f} ms"
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else LAUNCH_COUNT
+    print(f"{count} launches of {COMMAND!r}")
+    for name, launcher in launchers().items():
+        bench(name, launcher, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Measure indexing throughput and query time of the output search index.
+
+Generates log-like output for a number of consoles, indexes it and times a
+few typical queries. Run from the repository root:
+
+    python -m benchmarks.bench_search [megabytes of output]
+"""
+
+import random
+import sys
+import time
+
+from app.utils.search_index import OutputIndex
+
+OUTPUT_MB = 256
+STREAMS = 8
+BATCH_LINES = 500
+WORDS = (
+    "GET POST /api/v1/users /api/v1/orders request took ms cache miss hit user "
+    "session connect db pool worker started finished INFO DEBUG WARN"
+).split()
+QUERIES = [
+    ("NullPointerException", False),
+    ("cache miss", False),
+    (r"took \d{4} ms", True),
+    (r"Traceback.*line 4\d", True),
+]
+
+
+def generate_lines(count: int, rng: random.Random) -> list:
+    lines = []
+    for _ in range(count):
+        words = " ".join(rng.choice(WORDS) for _ in range(8))
+        lines.append(f"2024-05-01 12:{rng.randrange(60):02d} {words} {rng.random()}")
+    return lines
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else OUTPUT_MB
+    rng = random.Random(1)
+    index = OutputIndex(max_chars=size_mb << 21)
+    batch = generate_lines(BATCH_LINES, rng)
+    batch_chars = sum(len(line) + 1 for line in batch)
+    batches = (size_mb << 20) // batch_chars
+
+    start = time.perf_counter()
+    for number in range(batches):
+        lines = list(batch)
+        if number % 1000 == 999:
+            lines[-1] = "Traceback (most recent call last): line 42 NullPointerException"
+        index.add(number % STREAMS, lines)
+    index.sync()
+    elapsed = time.perf_counter() - start
+    print(f"Indexed {index.chars / (1 << 20):.0f} MB in {elapsed:.1f} s")
+
+    for pattern, regex in QUERIES:
+        start = time.perf_counter()
+        matches = index.search(pattern, regex=regex)
+        elapsed = time.perf_counter() - start
+        print(f"{pattern!r:<28} {len(matches):5} matches in {elapsed * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Measure cold start to first paint of the main window with a large config.
+
+Run from the repository root (add QT_QPA_PLATFORM=offscreen when headless):
+
+    python -m benchmarks.bench_startup [task count] [group count]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+from PyQt6.QtWidgets import QApplication
+
+from app.ui.main_window import MainWindow
+
+TASK_COUNT = 10_000
+GROUP_COUNT = 200
+TASKS_PER_GROUP = 5
+
+
+def make_task(index: int) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "title": f"task {index}",
+        "path": ".",
+        "cmd": f"echo {index}",
+    }
+
+
+def write_config(path: str, task_count: int, group_count: int) -> None:
+    config = {
+        "tasks": [make_task(index) for index in range(task_count)],
+        "groups": {
+            f"group {group}": [
+                make_task(group * TASKS_PER_GROUP + index)
+                for index in range(TASKS_PER_GROUP)
+            ]
+            for group in range(group_count)
+        },
+    }
+    with open(os.path.join(path, "commands.json"), "w") as f:
+        json.dump(config, f)
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else TASK_COUNT
+    group_count = int(sys.argv[2]) if len(sys.argv) > 2 else GROUP_COUNT
+    app = QApplication(sys.argv[:1])
+
+    with tempfile.TemporaryDirectory() as path:
+        write_config(path, task_count, group_count)
+        os.chdir(path)
+
+        start = time.perf_counter()
+        window = MainWindow()
+        constructed = time.perf_counter()
+        window.show()
+        while not window.first_paint_logged:
+            app.processEvents()
+        painted = time.perf_counter()
+
+        window.tabs.setCurrentWidget(window.group_tab)
+        app.processEvents()
+        groups_shown = time.perf_counter()
+
+    print(f"{task_count} tasks, {group_count} groups")
+    print(f"construct    {(constructed - start) * 1000:7.1f} ms")
+    print(f"first paint  {(painted - start) * 1000:7.1f} ms")
+    print(f"groups tab   {(groups_shown - painted) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
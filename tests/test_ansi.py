@@ -0,0 +1,54 @@
+from app.utils.ansi import BOLD, AnsiParser, StyledLine
+
+RED = (1, None, 0)
+
+
+def test_plain_text_has_no_spans():
+    assert AnsiParser().parse_line("hello") == StyledLine("hello")
+
+
+def test_style_carries_over_lines():
+    parser = AnsiParser()
+    assert parser.parse_line("a \x1b[31mred") == StyledLine("a red", ((2, 3, RED),))
+    assert parser.parse_line("still red") == StyledLine("still red", ((0, 9, RED),))
+    assert parser.parse_line("\x1b[0mplain") == StyledLine("plain")
+
+
+def test_combined_parameters():
+    line = AnsiParser().parse_line("\x1b[1;31mbold red\x1b[22m red")
+    assert line == StyledLine("bold red red", ((0, 8, (1, None, BOLD)), (8, 4, RED)))
+
+
+def test_cut_off_csi_carries_over():
+    parser = AnsiParser()
+    assert parser.parse_line("before\x1b[3") == StyledLine("before")
+    assert parser.parse_line("1mafter") == StyledLine("after", ((0, 5, RED),))
+
+
+def test_peek_does_not_commit():
+    parser = AnsiParser()
+    assert parser.peek_line("\x1b[31mred") == StyledLine("red", ((0, 3, RED),))
+    assert parser.parse_line("plain") == StyledLine("plain")
+
+
+def test_osc_strings_are_hidden():
+    parser = AnsiParser()
+    assert parser.parse_line("\x1b]0;title\x07text") == StyledLine("text")
+    assert parser.parse_line("\x1b]8;;http://x\x1b\\link") == StyledLine("link")
+
+
+def test_unterminated_osc_ends_with_its_line():
+    parser = AnsiParser()
+    parser.parse_line("a\x1b]0;title")
+
+    assert parser.parse_line("next") == StyledLine("next")
+    assert parser.parse_line("more") == StyledLine("more")
+
+
+def test_charset_designation_is_hidden():
+    parser = AnsiParser()
+    assert parser.parse_line("x\x1b(By") == StyledLine("xy")
+    # tput sgr0 as ncurses emits it
+    assert parser.parse_line("\x1b[31mred\x1b(B\x1b[m plain") == StyledLine(
+        "red plain", ((0, 3, RED),)
+    )
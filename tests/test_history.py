@@ -0,0 +1,34 @@
+from app.utils.history import COMPACT_RATIO, CommandHistory
+
+
+def counts(history: CommandHistory) -> dict:
+    return {command: entry.count for command, entry in history.entries.items()}
+
+
+def test_ranks_by_use_and_reloads(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    history = CommandHistory(path)
+    history.seed(["never used"])
+    for number in range(30):
+        history.record("make" if number % 3 else "make test")
+
+    assert history.ranked() == ["make", "make test", "never used"]
+    assert counts(CommandHistory(path)) == {"make": 20, "make test": 10}
+
+
+def test_blank_commands_are_not_recorded(tmp_path):
+    history = CommandHistory(str(tmp_path / "history.jsonl"))
+    history.record("   ")
+
+    assert history.entries == {}
+
+
+def test_seeded_commands_do_not_delay_compaction(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    history = CommandHistory(path)
+    history.seed(f"seeded {number}" for number in range(1000))
+    for number in range(150):
+        history.record("make" if number % 3 else "make test")
+
+    assert history.records < COMPACT_RATIO * 2 + 100
+    assert counts(CommandHistory(path)) == {"make": 100, "make test": 50}
@@ -0,0 +1,26 @@
+import os
+
+from app.utils.launcher import PosixLauncher
+
+
+def test_relative_command_is_found_from_the_task_directory(tmp_path):
+    script = tmp_path / "run.sh"
+    script.write_text("#!/bin/sh\necho hi\n")
+    script.chmod(0o755)
+    launcher = PosixLauncher(direct_exec=True)
+
+    assert launcher.spec("./run.sh --fast", str(tmp_path)).args == [
+        "./run.sh",
+        "--fast",
+    ]
+    # Elsewhere there is no such program, so the shell reports it
+    other = tmp_path / "other"
+    other.mkdir()
+    assert launcher.spec("./run.sh", str(other)).args[1:] == ["-c", "./run.sh"]
+
+
+def test_commands_on_path_run_directly(tmp_path):
+    launcher = PosixLauncher(direct_exec=True)
+    assert launcher.spec("sh --version", str(tmp_path)).args == ["sh", "--version"]
+    assert launcher.spec("cd /", str(tmp_path)).args[1:] == ["-c", "cd /"]
+    assert os.path.basename(launcher.spec("a | b").args[0]) == "sh"
@@ -0,0 +1,44 @@
+from app.utils.line_decoder import LineDecoder, collapse_carriage_returns
+
+
+def test_lines_and_partial():
+    decoder = LineDecoder()
+    assert decoder.feed(b"one\ntw") == (["one"], "tw")
+    assert decoder.feed(b"o\nthree\n") == (["two", "three"], "")
+
+
+def test_split_multibyte_character():
+    decoder = LineDecoder()
+    data = "héllo\n".encode()
+    assert decoder.feed(data[:2]) == ([], "h")
+    assert decoder.feed(data[2:]) == (["héllo"], "")
+
+
+def test_invalid_bytes_are_replaced():
+    assert LineDecoder().feed(b"a\xffb\n") == (["a�b"], "")
+
+
+def test_carriage_return_progress():
+    decoder = LineDecoder()
+    assert decoder.feed(b" 10%\r") == ([], " 10%")
+    assert decoder.feed(b" 50%") == ([], " 50%")
+    assert decoder.feed(b"\r100%\n") == (["100%"], "")
+
+
+def test_final_flushes_partial():
+    decoder = LineDecoder()
+    decoder.feed(b"last")
+    assert decoder.feed(b"", final=True) == (["last"], "")
+
+
+def test_collapse_carriage_returns():
+    assert collapse_carriage_returns("a\rb") == "b"
+    assert collapse_carriage_returns("abc\r") == "abc"
+    assert collapse_carriage_returns("plain") == "plain"
+
+
+def test_long_partial_is_emitted_as_a_line():
+    decoder = LineDecoder(max_partial=8)
+    assert decoder.feed(b"12345") == ([], "12345")
+    assert decoder.feed(b"6789") == (["123456789"], "")
+    assert decoder.feed(b"ab\n") == (["ab"], "")
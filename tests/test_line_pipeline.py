@@ -0,0 +1,88 @@
+import pytest
+
+from app.utils.ansi import EMPTY_LINE, StyledLine
+from app.utils.line_pipeline import ERROR_STYLE, WARNING_STYLE, LinePipeline
+
+
+def lines(*texts):
+    return [StyledLine(text) for text in texts]
+
+
+def texts(styled):
+    return [line.text for line in styled]
+
+
+def test_no_stages_builds_nothing():
+    assert LinePipeline.build([]) is None
+
+
+@pytest.mark.parametrize(
+    "config",
+    [[{"stage": "sort"}], [{"stage": "include", "pattern": "("}], [{}]],
+)
+def test_invalid_config(config):
+    with pytest.raises(ValueError):
+        LinePipeline.build(config)
+
+
+def test_filters():
+    pipeline = LinePipeline.build(
+        [
+            {"stage": "include", "pattern": "GET|POST"},
+            {"stage": "exclude", "pattern": "/health"},
+        ]
+    )
+    out, partial = pipeline.process(
+        lines("GET /users", "POST /health", "DEBUG x", "POST /orders"),
+        StyledLine("DEBUG"),
+    )
+    assert texts(out) == ["GET /users", "POST /orders"]
+    assert partial == EMPTY_LINE
+
+
+def test_dedup_counts_repeats_across_batches():
+    pipeline = LinePipeline.build([{"stage": "dedup"}])
+    out, partial = pipeline.process(lines("a", "a", "a"), EMPTY_LINE)
+    assert texts(out) == ["a"]
+    assert partial.text == "  (repeated 2 more times)"
+
+    out, _ = pipeline.process(lines("a", "b", "b"), EMPTY_LINE)
+    assert texts(out) == ["  (repeated 3 more times)", "b"]
+    assert texts(pipeline.finish()) == ["  (repeated 1 more time)"]
+    assert pipeline.finish() == []
+
+
+def test_finish_runs_through_later_stages():
+    pipeline = LinePipeline.build(
+        [{"stage": "dedup"}, {"stage": "exclude", "pattern": "repeated"}]
+    )
+    pipeline.process(lines("x", "x"), EMPTY_LINE)
+
+    assert pipeline.finish() == []
+
+
+def test_levels():
+    pipeline = LinePipeline.build([{"stage": "levels"}])
+    out, _ = pipeline.process(
+        lines("error: boom", "ValueError: bad", "warning: x", "terror", "ok"),
+        EMPTY_LINE,
+    )
+    assert [line.spans[0][2] if line.spans else None for line in out] == [
+        ERROR_STYLE,
+        ERROR_STYLE,
+        WARNING_STYLE,
+        None,
+        None,
+    ]
+
+
+def test_timestamps_shift_spans():
+    pipeline = LinePipeline.build([{"stage": "timestamps"}])
+    style = (1, None, 0)
+    (line,), partial = pipeline.process(
+        [StyledLine("red", ((0, 3, style),))], EMPTY_LINE
+    )
+    prefix = len(line.text) - 3
+    assert line.text.endswith(" red")
+    assert line.spans[1] == (prefix, 3, style)
+    assert partial == EMPTY_LINE
@@ -0,0 +1,36 @@
+import json
+import os
+import sys
+
+import pytest
+
+from app.utils.persistence import DebouncedWriter, write_atomic
+
+
+def test_write_atomic_replaces_file(tmp_path):
+    path = tmp_path / "config.json"
+    write_atomic(str(path), {"a": 1})
+    write_atomic(str(path), {"a": 2})
+
+    assert json.loads(path.read_text()) == {"a": 2}
+    assert os.listdir(tmp_path) == ["config.json"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+def test_write_atomic_keeps_mode(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text("{}")
+    os.chmod(path, 0o640)
+    write_atomic(str(path), {})
+
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+def test_debounced_writer_writes_latest(tmp_path):
+    path = tmp_path / "config.json"
+    writer = DebouncedWriter(str(path), delay=10)
+    writer.submit({"n": 1})
+    writer.submit({"n": 2})
+    writer.close()
+
+    assert json.loads(path.read_text()) == {"n": 2}
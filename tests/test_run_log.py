@@ -0,0 +1,43 @@
+import gzip
+
+from app.utils.run_log import RunLogWriter, list_runs
+
+
+def read(path: str) -> bytes:
+    if path.endswith(".gz"):
+        with gzip.open(path) as f:
+            return f.read()
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_runs_of_a_task_keep_their_own_logs(tmp_path):
+    writer = RunLogWriter(str(tmp_path))
+    first, second = object(), object()
+    writer.open("task", first)
+    writer.write(first, ["first"])
+    writer.open("task", second)
+    writer.write(second, ["second"])
+    # Children of the first run write after the task was started again
+    writer.write(first, ["late"])
+    writer.close(first)
+    writer.write(first, ["dropped"])
+    writer.close(second)
+    writer.shutdown()
+
+    runs = list_runs("task", str(tmp_path))
+    assert len(runs) == 2
+    newest, oldest = ([read(path) for path in paths] for paths in runs.values())
+    assert newest == [b"second\n"]
+    assert oldest == [b"first\nlate\n"]
+
+
+def test_task_id_is_the_default_key(tmp_path):
+    writer = RunLogWriter(str(tmp_path))
+    writer.open("task")
+    writer.write("task", ["line"])
+    writer.close("task")
+    writer.shutdown()
+
+    (paths,) = list_runs("task", str(tmp_path)).values()
+    assert [read(path) for path in paths] == [b"line\n"]
@@ -0,0 +1,181 @@
+import pytest
+
+from app.models.task import Task
+from app.utils.scheduler import (
+    GroupScheduler,
+    ReadinessWatcher,
+    ReadyCondition,
+    TaskState,
+)
+
+
+def make_task(task_id: str, depends_on=(), ready_when=None) -> Task:
+    return Task(
+        id=task_id,
+        title=task_id,
+        path=".",
+        cmd="true",
+        depends_on=list(depends_on),
+        ready_when=ready_when,
+    )
+
+
+class Launches:
+    """Launch callback that records the order tasks are started in"""
+
+    def __init__(self, failing=()):
+        self.started = []
+        self.failing = set(failing)
+
+    def __call__(self, task, condition):
+        self.started.append(task.id)
+        return task.id not in self.failing
+
+
+def test_cycle_raises():
+    tasks = [
+        make_task("a", ["c"]),
+        make_task("b", ["a"]),
+        make_task("c", ["b"]),
+        make_task("d"),
+    ]
+    with pytest.raises(ValueError, match="cycle"):
+        GroupScheduler(tasks, Launches())
+
+
+def test_self_and_outside_dependencies_are_ignored():
+    launches = Launches()
+    scheduler = GroupScheduler(
+        [make_task("a", ["a", "elsewhere"]), make_task("b", ["a", "a"])], launches
+    )
+    scheduler.start()
+
+    assert launches.started == ["a", "b"]
+    assert scheduler.finished
+
+
+def test_dependents_wait_for_readiness():
+    launches = Launches()
+    tasks = [
+        make_task("db", ready_when="port:5432"),
+        make_task("api", ["db"], ready_when="output:listening"),
+        make_task("web", ["api"]),
+    ]
+    scheduler = GroupScheduler(tasks, launches)
+    scheduler.start()
+    assert launches.started == ["db"]
+    assert scheduler.state["db"] is TaskState.RUNNING
+
+    scheduler.task_ready("db")
+    assert launches.started == ["db", "api"]
+    scheduler.task_ready("api")
+    assert launches.started == ["db", "api", "web"]
+    assert scheduler.state["web"] is TaskState.READY
+
+
+def test_clean_exit_counts_as_ready():
+    launches = Launches()
+    scheduler = GroupScheduler(
+        [make_task("build", ready_when="exit"), make_task("run", ["build"])], launches
+    )
+    scheduler.start()
+    scheduler.task_exited("build", 0)
+
+    assert scheduler.state["build"] is TaskState.DONE
+    assert launches.started == ["build", "run"]
+
+
+def test_failure_skips_dependents():
+    launches = Launches()
+    tasks = [
+        make_task("build", ready_when="exit"),
+        make_task("test", ["build"]),
+        make_task("deploy", ["test"]),
+        make_task("lint"),
+    ]
+    scheduler = GroupScheduler(tasks, launches)
+    scheduler.start()
+    scheduler.task_exited("build", 1)
+
+    assert scheduler.state["build"] is TaskState.FAILED
+    assert scheduler.state["test"] is TaskState.SKIPPED
+    assert scheduler.state["deploy"] is TaskState.SKIPPED
+    assert launches.started == ["build", "lint"]
+
+
+def test_failed_launch_skips_dependents():
+    launches = Launches(failing=["a"])
+    scheduler = GroupScheduler([make_task("a"), make_task("b", ["a"])], launches)
+    scheduler.start()
+
+    assert scheduler.state == {"a": TaskState.FAILED, "b": TaskState.SKIPPED}
+    assert scheduler.finished
+
+
+def test_max_parallel():
+    launches = Launches()
+    tasks = [make_task(name, ready_when="exit") for name in "abc"]
+    scheduler = GroupScheduler(tasks, launches, max_parallel=2)
+    scheduler.start()
+    assert launches.started == ["a", "b"]
+
+    scheduler.task_exited("a", 0)
+    assert launches.started == ["a", "b", "c"]
+
+
+def test_running_tasks_count_as_ready():
+    launches = Launches()
+    scheduler = GroupScheduler(
+        [make_task("db"), make_task("api", ["db"])], launches, running=["db"]
+    )
+    scheduler.start()
+
+    assert launches.started == ["api"]
+
+
+@pytest.mark.parametrize(
+    "spec, kind",
+    [(None, "started"), ("", "started"), ("started", "started"), ("exit", "exit")],
+)
+def test_parse_simple_conditions(spec, kind):
+    assert ReadyCondition.parse(spec).kind == kind
+
+
+def test_parse_output_and_port():
+    assert ReadyCondition.parse("output:ready on \\d+").pattern.search("ready on 80")
+    condition = ReadyCondition.parse("port:db.local:5432")
+    assert (condition.kind, condition.host, condition.port) == (
+        "port",
+        "db.local",
+        5432,
+    )
+    assert ReadyCondition.parse("port:8080").host == "127.0.0.1"
+
+
+@pytest.mark.parametrize("spec", ["output:", "output:(", "port:0", "port:x", "soon"])
+def test_parse_invalid(spec):
+    with pytest.raises(ValueError):
+        ReadyCondition.parse(spec)
+
+
+def test_watcher_reports_output_once():
+    ready = []
+    watcher = ReadinessWatcher(ready.append)
+    watcher.watch("api", ReadyCondition.parse("output:listening"))
+    watcher.feed("api", ["starting"])
+    watcher.feed("other", ["listening"])
+    assert ready == []
+
+    watcher.feed("api", ["now listening on :80"])
+    watcher.feed("api", ["listening"])
+    assert ready == ["api"]
+
+
+def test_watcher_cancel():
+    ready = []
+    watcher = ReadinessWatcher(ready.append)
+    watcher.watch("api", ReadyCondition.parse("output:listening"))
+    watcher.cancel("api")
+    watcher.feed("api", ["listening"])
+
+    assert ready == []
@@ -0,0 +1,60 @@
+import pytest
+
+from app.utils.ansi import StyledLine
+from app.utils.scrollback import ScrollbackBuffer
+
+
+def lines(*texts):
+    return [StyledLine(text) for text in texts]
+
+
+def held(buffer: ScrollbackBuffer) -> list:
+    return [buffer[row].text for row in range(len(buffer))]
+
+
+def test_evicts_oldest_lines_and_keeps_indexing():
+    buffer = ScrollbackBuffer(max_lines=3)
+    assert buffer.append(lines("a", "b")) == 0
+    assert buffer.append(lines("c", "d", "e")) == 2
+
+    assert held(buffer) == ["c", "d", "e"]
+    assert buffer.first_index == 2
+    assert buffer[-1].text == "e"
+    with pytest.raises(IndexError):
+        buffer[3]
+
+
+def test_many_evictions_stay_consistent():
+    buffer = ScrollbackBuffer(max_lines=10)
+    for number in range(1000):
+        buffer.append(lines(str(number)))
+
+    assert held(buffer) == [str(number) for number in range(990, 1000)]
+    assert buffer.first_index == 990
+    assert buffer.total_bytes == sum(len(text) + 1 for text in held(buffer))
+
+
+def test_byte_limit():
+    buffer = ScrollbackBuffer(max_lines=0, max_bytes=10)
+    buffer.append(lines("aaaa", "bbbb", "cccc"))
+
+    assert held(buffer) == ["bbbb", "cccc"]
+
+
+def test_evicted_lines_are_spilled(tmp_path):
+    path = tmp_path / "spill.log"
+    buffer = ScrollbackBuffer(max_lines=1, spill_path=str(path))
+    buffer.append(lines("a", "b", "c"))
+    buffer.close()
+
+    assert path.read_text() == "a\nb\n"
+
+
+def test_clear():
+    buffer = ScrollbackBuffer()
+    buffer.append(lines("a", "b"))
+    buffer.clear()
+    buffer.append(lines("c"))
+
+    assert held(buffer) == ["c"]
+    assert buffer.first_index == 2
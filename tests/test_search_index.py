@@ -0,0 +1,140 @@
+import random
+import re
+
+import pytest
+
+from app.utils import search_index
+from app.utils.search_index import OutputIndex, query_terms, regex_literals
+
+WORDS = "GET POST /api/users took ms cache miss hit ERROR warn Traceback 42 7".split()
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(search_index, "CHUNK_CHARS", 200)
+
+
+def make_lines(count: int, rng: random.Random) -> list:
+    return [" ".join(rng.choice(WORDS) for _ in range(6)) for _ in range(count)]
+
+
+def expected_matches(lines: list, pattern: str, regex: bool, ignore_case: bool):
+    flags = re.IGNORECASE if ignore_case else 0
+    compiled = re.compile(pattern if regex else re.escape(pattern), flags)
+    return [
+        (number, match.start(), match.end())
+        for number, line in enumerate(lines)
+        for match in compiled.finditer(line)
+        if match.end() > match.start()
+    ]
+
+
+@pytest.mark.parametrize(
+    "pattern, regex, ignore_case",
+    [
+        ("cache miss", False, True),
+        ("ERROR", False, False),
+        ("error", False, True),
+        (r"took \d+", True, True),
+        (r"GET /api/\w+", True, False),
+        (r"miss|hit", True, True),
+        (r"(?:POST )+took", True, True),
+        (r"ms$", True, True),
+    ],
+)
+def test_search_matches_line_by_line_regex(small_chunks, pattern, regex, ignore_case):
+    rng = random.Random(pattern)
+    lines = make_lines(500, rng)
+    index = OutputIndex()
+    for start in range(0, len(lines), 37):
+        index.add("console", lines[start : start + 37])
+    index.sync()
+
+    matches = index.search(pattern, regex, ignore_case, limit=100000)
+
+    found = sorted((match.line, match.start, match.end) for match in matches)
+    assert found == expected_matches(lines, pattern, regex, ignore_case)
+    for match in matches:
+        assert match.text == lines[match.line]
+
+
+def test_search_covers_pending_lines_and_streams():
+    index = OutputIndex()
+    index.add("a", ["first build started"])
+    index.add("b", ["second build failed"])
+    index.sync()
+
+    matches = index.search("build")
+
+    assert sorted(match.stream for match in matches) == ["a", "b"]
+    assert index.search("failed")[0].start == 13
+
+
+def test_search_limit():
+    index = OutputIndex()
+    index.add("console", ["x"] * 50)
+    index.sync()
+
+    assert len(index.search("x", limit=10)) == 10
+
+
+def test_invalid_regex_raises():
+    with pytest.raises(re.error):
+        OutputIndex().search("(unclosed", regex=True)
+
+
+def test_eviction_drops_oldest_chunks(small_chunks):
+    index = OutputIndex(max_chars=1000)
+    for number in range(100):
+        index.add("console", [f"line {number:03d} " + "x" * 40])
+    index.sync()
+
+    assert index.chars <= 1000
+    assert not index.search("line 000")
+    match = index.search("line 099")[0]
+    assert match.line == 99
+
+
+def test_forget_drops_stream(small_chunks):
+    index = OutputIndex()
+    index.add("gone", ["needle " * 40] * 10)
+    index.add("kept", ["needle"])
+    index.forget("gone")
+    index.sync()
+
+    assert [match.stream for match in index.search("needle")] == ["kept"]
+    assert index.chars == 0
+
+
+def test_disabled_index_stores_nothing():
+    index = OutputIndex(max_chars=0)
+    index.add("console", ["needle"])
+    index.sync()
+
+    assert index.search("needle") == []
+
+
+@pytest.mark.parametrize(
+    "pattern, literals",
+    [
+        ("hello", ["hello"]),
+        (r"took \d+ ms", ["took ", " ms"]),
+        (r"a\.b", ["a.b"]),
+        (r"colou?r", ["colo", "r"]),
+        (r"ab+c", ["ab", "c"]),
+        (r"[xyz]foo", ["foo"]),
+        (r"(group)after", ["after"]),
+        (r"one|two", []),
+        (r"(?x) spaced", []),
+    ],
+)
+def test_regex_literals(pattern, literals):
+    assert regex_literals(pattern) == literals
+
+
+def test_query_terms_fold_case_and_digits():
+    assert query_terms("Port 8080", regex=False) == {
+        ("p", "o", "r"),
+        ("o", "r", "t"),
+        ("0", "0", "0"),
+    }
@@ -0,0 +1,99 @@
+import json
+import sqlite3
+
+from app.models.task import Task
+from app.utils.storage import SqliteTaskStore
+
+OLD_SCHEMA = """
+    CREATE TABLE tasks (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        path TEXT NOT NULL,
+        cmd TEXT NOT NULL,
+        max_lines INTEGER,
+        position INTEGER NOT NULL
+    );
+    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+    INSERT INTO meta VALUES ('seeded', '1');
+    INSERT INTO tasks VALUES ('t1', 'Build', '/src', 'make', 500, 0);
+"""
+
+
+def test_upgrade_adds_missing_columns(tmp_path):
+    path = str(tmp_path / "tasker.db")
+    with sqlite3.connect(path) as db:
+        db.executescript(OLD_SCHEMA)
+
+    store = SqliteTaskStore(path, str(tmp_path / "missing.json"))
+    tasks, groups = store.load()
+
+    assert groups == {}
+    assert tasks == [
+        Task(id="t1", title="Build", path="/src", cmd="make", max_lines=500)
+    ]
+    columns = {row[1] for row in store.db.execute("PRAGMA table_info(tasks)")}
+    assert set(SqliteTaskStore.ADDED_COLUMNS) <= columns
+
+    task = tasks[0]
+    task.depends_on = ["t0"]
+    task.ready_when = "exit"
+    task.output_stages = [{"stage": "dedup"}]
+    store.update_task(task)
+    store.close()
+
+    # Opening an upgraded database again leaves it as it is
+    store = SqliteTaskStore(path, str(tmp_path / "missing.json"))
+    assert store.load()[0] == [task]
+    store.close()
+
+
+def test_migrates_json_once(tmp_path):
+    json_path = tmp_path / "commands.json"
+    task = Task(id="t1", title="Serve", path="/app", cmd="serve", depends_on=["t2"])
+    other = Task(id="t2", title="DB", path="/app", cmd="db", ready_when="port:5432")
+    json_path.write_text(
+        json.dumps({"tasks": [task.to_dict()], "groups": {"dev": [other.to_dict()]}})
+    )
+    path = str(tmp_path / "tasker.db")
+
+    store = SqliteTaskStore(path, str(json_path))
+    assert store.load() == ([task], {"dev": [other]})
+    store.delete_task(task)
+    store.close()
+
+    store = SqliteTaskStore(path, str(json_path))
+    assert store.load() == ([], {"dev": [other]})
+    store.close()
+
+
+def test_groups(tmp_path):
+    store = SqliteTaskStore(str(tmp_path / "tasker.db"), str(tmp_path / "none.json"))
+    store.load()
+    task = Task(id="t1", title="Build", path="/src", cmd="make")
+    store.add_task(task)
+    store.create_group("ci", [])
+    store.add_to_group("ci", task)
+    store.rename_group("ci", "build")
+
+    assert store.load() == ([], {"build": [task]})
+    store.delete_group("build")
+    assert store.load() == ([task], {})
+    store.close()
+
+
+def test_task_listed_in_two_groups(tmp_path):
+    store = SqliteTaskStore(str(tmp_path / "tasker.db"), str(tmp_path / "none.json"))
+    store.load()
+    task = Task(id="t1", title="Build", path="/src", cmd="make")
+    store.add_task(task)
+    store.create_group("ci", [task])
+    store.create_group("release", [])
+    store.add_to_group("release", task)
+    assert store.load() == ([], {"ci": [task], "release": [task]})
+
+    # Deleting it from one group leaves it in the other
+    store.delete_task(task, "ci")
+    assert store.load() == ([], {"ci": [], "release": [task]})
+    store.delete_task(task, "release")
+    assert store.load() == ([], {"ci": [], "release": []})
+    store.close()